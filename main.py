@@ -2,12 +2,17 @@ import os
 import sys
 import json
 from datetime import date
-from jinja2 import Environment, FileSystemLoader
 from scripts.db.fetch_subscribers import process_subscribers_data
 from scripts.db.fetch_queries import fetch_all_data
+from scripts.db.weather_latest import index_weather_by_location, lookup_weather
+from scripts.db import article_store
+from scripts.utils.interest_ranking import rank_articles
 from scripts.utils.logger_config import get_logger
 from scripts.utils.send_email import send_html_email 
-from scripts.utils.db_connection import get_db_connection, close_connection
+from scripts.db.bookkeeping import update_used_in_newsletter
+from scripts.utils.query_profiler import log_query_summary
+from scripts.utils.asset_mirror import rewrite_html
+from scripts.utils.variant_renderer import get_renderer
 import pandas as pd
 import re
 import html
@@ -17,6 +22,13 @@ import pytz
 # Initialize logger
 logger = get_logger('main')
 
+# Placeholder until quotes carry their own author picture; mirrored like every other template image
+AUTHOR_PIC_URL = "https://planetsignshop.com/cdn/shop/products/COMING-SOON-10IN-ROUND-RIDER-RED.gif?v=1656448869"
+
+# Fallback rows older than this are hidden instead of being shown as stale
+WEATHER_MAX_AGE_DAYS = int(os.getenv('WEATHER_MAX_AGE_DAYS', 2))
+EXCHANGE_RATE_MAX_AGE_DAYS = int(os.getenv('EXCHANGE_RATE_MAX_AGE_DAYS', 3))
+
 # HELPER FUNCTIONS
 
 def clean_and_format_text(text):
@@ -71,6 +83,13 @@ def to_int(value):
     except (ValueError, TypeError):
         return value  # Return the original value if it can't be converted to int
 
+# Days between a row's date and the run date; None when the date is missing or unreadable
+def days_old(value, run_date):
+    try:
+        return (run_date - pd.Timestamp(value).date()).days
+    except (ValueError, TypeError, AttributeError):
+        return None
+
 
 def get_weather_code_description(code):
     weather_code = {
@@ -124,7 +143,7 @@ def map_to_weather_code_day(weather_codes_data, description):
     
     return "Unknown"
 
-def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_data, weather_codes_data, exchange_rate_data, quotes_data, fun_facts_data, word_of_the_day_data, english_tips_data, historical_events_data, daily_challenges_data):
+def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_data, weather_codes_data, exchange_rate_data, quotes_data, fun_facts_data, word_of_the_day_data, english_tips_data, historical_events_data, daily_challenges_data, news_by_subscriber=None):
     
     subscriber_content = {}
     used_ids = {
@@ -160,14 +179,18 @@ def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_da
     # Prepare weather data
     subscriber_city = subscriber['city']
     subscriber_timezone = subscriber['timezone']
-    city_weather = weather_data[weather_data['location.name'].str.contains(subscriber_city, case=False, na=False)]
 
-    if not city_weather.empty:
-        city_weather_dict = city_weather.iloc[0].to_dict()
-        
-        # Extract the daily weather data for today (first item in the timelines list)
-        today_weather = city_weather_dict['timelines.daily'][0]['values']
+    # weather_data is indexed by location, so this is a dict lookup
+    today_weather = lookup_weather(weather_data, subscriber_city, subscriber.get('country'))
+    run_date = date.fromisoformat(formatted_date)
+
+    # weather_latest keeps the last good forecast when a refresh fails; hide it once it is too old
+    weather_age = days_old(today_weather.get('forecast_date'), run_date) if today_weather else None
+    if weather_age is not None and weather_age > WEATHER_MAX_AGE_DAYS:
+        logger.warning(f"Hiding weather for {subscriber_city}: forecast is {weather_age} days old")
+        today_weather = None
 
+    if today_weather:
         weather_data_nested = {
             "uvIndex": to_int(today_weather.get("uvIndexMax", "N/A")),
             "dewPoint": to_int(today_weather.get("dewPointAvg", "N/A")),
@@ -192,7 +215,7 @@ def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_da
         }
 
         # Get weather description
-        weather_code_max = today_weather.get("weatherCodeMax", "N/A")
+        weather_code_max = to_int(today_weather.get("weatherCodeMax", "N/A"))
         weather_code_description = get_weather_code_description(weather_code_max)
 
         # Map to weather_code_day
@@ -231,15 +254,30 @@ def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_da
             "coming_soon": "Coming soon"
         })
 
+        if weather_age and weather_age > 0:
+            weather_data_nested.update({
+                "stale": True,
+                "stale_note": f"Forecast from {pd.Timestamp(today_weather['forecast_date']).date()}; today's forecast was unavailable"
+            })
+
         subscriber_content['weather'] = weather_data_nested
     else:
         subscriber_content['weather'] = {}
 
     # Prepare simplified exchange rates content
+    record = None
     if not exchange_rate_data.empty:
         record = exchange_rate_data.iloc[0].to_dict()  # Assuming one row of exchange rates
         record = convert_timestamps(record)
 
+    # The latest stored rates are reused when today's call failed; hide them once they are too old
+    rates_age = days_old(record.get('created'), run_date) if record else None
+    if rates_age is not None and rates_age > EXCHANGE_RATE_MAX_AGE_DAYS:
+        logger.warning(f"Hiding exchange rates: latest rates are {rates_age} days old")
+        record = None
+
+    if record:
+
         # Simplified exchange rates data structure
         exchange_rates_data = {
             "header_en": "Today's Exchange Rates",
@@ -252,6 +290,12 @@ def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_da
             "usd_cad_change": str(record.get("USD_to_CAD.percentage_difference", "N/A"))
         }
 
+        if rates_age and rates_age > 0:
+            exchange_rates_data.update({
+                "stale": True,
+                "stale_note": f"Rates from {pd.Timestamp(record['created']).date()}; today's rates were unavailable"
+            })
+
         subscriber_content['exchange_rates'] = exchange_rates_data
     else:
         subscriber_content['exchange_rates'] = {}
@@ -269,7 +313,7 @@ def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_da
         if 'quote_pt' in quote_of_the_day:
             quote_of_the_day['quote_pt'] = clean_escape_sequences(quote_of_the_day['quote_pt'])
 
-        quote_of_the_day['author_pic'] = "https://planetsignshop.com/cdn/shop/products/COMING-SOON-10IN-ROUND-RIDER-RED.gif?v=1656448869"
+        quote_of_the_day['author_pic'] = AUTHOR_PIC_URL
 
         # Store in subscriber_content
         subscriber_content['quote_of_the_day'] = convert_timestamps(quote_of_the_day)
@@ -301,7 +345,16 @@ def prepare_subscriber_content(subscriber, long_date, formatted_date, weather_da
         used_ids['english_tips'].append(english_tip.get('id'))
     
     
-    subscriber_content['news'] = {"message": "News not implemented yet"}
+    # News was ranked for all subscribers up front; this is a dict lookup
+    articles = (news_by_subscriber or {}).get(subscriber['id'], [])
+    subscriber_content['news'] = {
+        "header_en": "Top News",
+        "header_pt": "Principais Notícias",
+        "articles": [
+            {key: article.get(key) for key in ('title', 'description', 'url', 'image_url', 'source', 'published_at')}
+            for article in articles
+        ]
+    }
 
 
     # Historical Events
@@ -370,7 +423,8 @@ def render_and_save_newsletter(subscriber, content, date, template, path):
                 content['word_of_the_day']['related_words'] = content['word_of_the_day']['related_words'].strip()
             logger.debug("Related Words:", content['word_of_the_day'].get('related_words'))
 
-        rendered_html = template.render(content)
+        # Point images at our mirrored, resized copies (no-op without ASSET_BASE_URL)
+        rendered_html = rewrite_html(template.render(content))
         file_name = f"{subscriber['nickname']}_{date}.html"
         file_path = os.path.join(path, file_name)
 
@@ -406,37 +460,8 @@ def send_newsletter_email(subscriber, long_date, file_path):
         logger.error(f"Error sending email to {subscriber['nickname']}: {e}")
         raise
 
-def update_used_in_newsletter(used_ids, subscriber_ids):
-    conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-
-        # Update used_in_newsletter for content tables
-        for table, ids in used_ids.items():
-            if ids:
-                query = f"UPDATE {table} SET used_in_newsletter = 1 WHERE id IN ({','.join(map(str, ids))})"
-                cursor.execute(query)
-                logger.info(f"Updated {cursor.rowcount} rows in {table}")
-
-        # Update days_receiving_newsletter for subscribers
-        if subscriber_ids:
-            query = "UPDATE subscribers SET days_receiving_newsletter = days_receiving_newsletter + 1 WHERE id IN ({})".format(','.join(map(str, subscriber_ids)))
-            cursor.execute(query)
-            logger.info(f"Updated {cursor.rowcount} subscribers")
-
-        conn.commit()
-        logger.info("All updates completed successfully")
-
-    except Exception as e:
-        logger.error(f"Error updating used_in_newsletter: {e}")
-        if conn:
-            conn.rollback()
-    finally:
-        if conn:
-            close_connection(conn)
-
 def main():
+    article_conn = None
     try:
         # Select today's date
         today = date.today()
@@ -461,7 +486,7 @@ def main():
         queries_data = fetch_all_data()
 
         # Prepare common section data
-        weather_data = queries_data['weather_data']
+        weather_data = index_weather_by_location(queries_data['weather_data'])
         exchange_rate_data = queries_data['exchange_rate_data']
         quotes_data = queries_data['quotes_data']
         fun_fact_data = queries_data['fun_fact_data']
@@ -471,9 +496,17 @@ def main():
         daily_challenges_data = queries_data['daily_challenges_data']
         weather_codes = queries_data['weather_codes']
 
-        # Initialize Jinja2 environment
-        env = Environment(loader=FileSystemLoader(os.path.join('templates')))
-        template = env.get_template('template.html')
+        # Rank the local news index against every subscriber's interests in one pass
+        news_by_subscriber = {}
+        try:
+            article_conn = article_store.connect()
+            articles = article_store.recent_articles(article_conn)
+            news_by_subscriber = rank_articles(subscribers_df.to_dict('records'), articles, k=article_store.ARTICLES_PER_SUBSCRIBER)
+        except Exception as e:
+            logger.error(f"Error ranking news: {e}")
+
+        # Renders through per-language-combination fragment lists, compiled on first use
+        template = get_renderer('template.html')
 
         all_used_ids = {
             'quotes': [],
@@ -489,7 +522,7 @@ def main():
          # Prepare content for each subscriber
         for _, subscriber in subscribers_df.iterrows():
             try:
-                subscriber_content, used_ids = prepare_subscriber_content(subscriber, long_date, formatted_date, weather_data, weather_codes, exchange_rate_data, quotes_data, fun_fact_data, word_of_the_day_data, english_tips_data, historical_events_data, daily_challenges_data)
+                subscriber_content, used_ids = prepare_subscriber_content(subscriber, long_date, formatted_date, weather_data, weather_codes, exchange_rate_data, quotes_data, fun_fact_data, word_of_the_day_data, english_tips_data, historical_events_data, daily_challenges_data, news_by_subscriber)
                 
                 # Accumulate used IDs
                 for key in all_used_ids:
@@ -512,11 +545,15 @@ def main():
                 # Continue with the next subscriber if there's an error with the current one
                 continue
 
-        # Update used_in_newsletter status and subscriber counts
-        update_used_in_newsletter(all_used_ids, updated_subscriber_ids)
+        # Update used_in_newsletter status and record today's deliveries
+        update_used_in_newsletter(all_used_ids, updated_subscriber_ids, today)
 
     except Exception as e:
         logger.error(f"An unexpected error occurred in main: {e}")
+    finally:
+        if article_conn:
+            article_conn.close()
+        log_query_summary()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,10 +1,15 @@
 # path: news_fetcher.py
 import os
-import json
+import sys
 from newsapi import NewsApiClient
-from datetime import datetime
 from dotenv import load_dotenv
 
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils import result_sink
+
 # Load .env file containing the NEWSAPI_KEY
 load_dotenv()
 
@@ -46,24 +51,10 @@ def fetch_news(query, from_date=None, to_date=None, language='en', sort_by='publ
         print(f"An error occurred while fetching news: {e}")
         return None
 
-# Save news data to a JSON file with timestamp
+# Append news data to the fetched results store
 def save_news_to_json(data, query):
-    # Create the directory if it doesn't exist
-    folder_path = r"C:\Projects\luca_newsletter_official\data\fetched_results\everything_news"
-    os.makedirs(folder_path, exist_ok=True)
-
-    # Get the current timestamp for the filename
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-
-    # Create a filename with query and timestamp
-    file_name = f"news_{query}_{timestamp}.json"
-    file_path = os.path.join(folder_path, file_name)
-
-    # Save the data as a JSON file
-    with open(file_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=4)
-
-    print(f"News data saved to {file_path}")
+    segment, _ = result_sink.append('everything_news', data, key=query)
+    print(f"News data saved to {segment}")
 
 # Main function
 def main(query, from_date=None, to_date=None, language='en', sort_by='publishedAt'):
@@ -2,8 +2,8 @@
 
 import os
 import sys
-import json
 from datetime import datetime, timedelta
+import numpy as np
 import requests
 from dotenv import load_dotenv
 
@@ -12,7 +12,11 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
+from scripts.utils import http_client
+from scripts.db.exchange_rate_store import load_rates, save_rates
+from scripts.db.fetch_subscribers import fetch_subscriber_locations
 from scripts.utils.db_insert_api_calls import insert_api_response
+from scripts.utils import result_sink
 
 # Load environment variables
 load_dotenv()
@@ -25,85 +29,126 @@ BASE_URL_HISTORICAL = 'https://api.freecurrencyapi.com/v1/historical'
 BASE_URL_LATEST = 'https://api.freecurrencyapi.com/v1/latest'
 API_KEY = os.getenv('FREECURRENCYAPI_KEY')
 
+# Always shown, in this order; subscriber countries add to it
+DEFAULT_CURRENCIES = ['USD', 'CAD', 'BRL']
+
+# Subscriber country (casefolded) to currency code
+COUNTRY_CURRENCIES = {
+    'canada': 'CAD', 'brazil': 'BRL', 'brasil': 'BRL', 'united states': 'USD', 'usa': 'USD',
+    'united kingdom': 'GBP', 'uk': 'GBP', 'portugal': 'EUR', 'spain': 'EUR', 'france': 'EUR',
+    'germany': 'EUR', 'italy': 'EUR', 'ireland': 'EUR', 'netherlands': 'EUR', 'mexico': 'MXN',
+    'japan': 'JPY', 'china': 'CNY', 'india': 'INR', 'australia': 'AUD', 'new zealand': 'NZD',
+    'switzerland': 'CHF', 'sweden': 'SEK', 'norway': 'NOK', 'denmark': 'DKK', 'poland': 'PLN',
+    'south africa': 'ZAR', 'south korea': 'KRW', 'turkey': 'TRY', 'indonesia': 'IDR',
+    'philippines': 'PHP', 'singapore': 'SGD', 'hong kong': 'HKD', 'israel': 'ILS',
+    'czech republic': 'CZK', 'hungary': 'HUF', 'romania': 'RON', 'bulgaria': 'BGN',
+    'croatia': 'EUR', 'iceland': 'ISK', 'malaysia': 'MYR', 'thailand': 'THB', 'russia': 'RUB'
+}
+
 def remove_api_key_from_params(params):
     return {k: v for k, v in params.items() if k != 'apikey'}
 
 def fetch_currency_data(url, params):
+    """
+    Returns (data, stale); stale data is the last cached response, served while the API is down.
+    """
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
-        return response.json()
+        if response.stale:
+            logger.warning(f"freecurrencyapi unavailable, using the last known rates from {url}")
+        return response.json(), response.stale
     except requests.RequestException as e:
         logger.error(f"API request failed: {e}")
         raise
 
-def calculate_rate(from_currency, to_currency, data):
-    if from_currency == 'USD':
-        return data[to_currency]
-    elif to_currency == 'USD':
-        return 1 / data[from_currency]
-    else:
-        return data[to_currency] / data[from_currency]
+def subscriber_currencies():
+    """
+    Currencies shown in the newsletter: the defaults plus one per subscriber country.
+    """
+    currencies = list(DEFAULT_CURRENCIES)
+    try:
+        for location in fetch_subscriber_locations():
+            currency = COUNTRY_CURRENCIES.get(location['country'].casefold())
+            if currency and currency not in currencies:
+                currencies.append(currency)
+    except Exception as e:
+        logger.warning(f"Could not read subscriber countries, using default currencies: {e}")
+    return currencies
+
+def get_usd_rates(rate_date, url, params):
+    """
+    USD-based rates for a date: from the local store when present, otherwise one
+    API call for every currency the provider has, which is then stored.
+    """
+    rates = load_rates(rate_date)
+    if rates:
+        logger.info(f"Using stored USD rates for {rate_date}")
+        return rates, None
+    # A stale copy of a historical response is still that date's rates, so it is stored too
+    data = fetch_currency_data(url, params)[0]['data']
+    rates = data.get(rate_date, data)  # The historical endpoint nests rates under the date
+    save_rates(rate_date, rates)
+    return rates, params
+
+def cross_rate_matrix(usd_rates, currencies):
+    """
+    N x N matrix where [i, j] is the units of currencies[j] per unit of currencies[i].
+    """
+    usd = np.array([1.0 if c == 'USD' else usd_rates[c] for c in currencies], dtype=float)
+    return usd[np.newaxis, :] / usd[:, np.newaxis]
+
+def exchange_rate_table(yesterday_rates, today_rates, currencies):
+    """
+    Every cross rate and its day-over-day change, computed in one vectorized step.
+    """
+    currencies = [c for c in currencies if c == 'USD' or (c in yesterday_rates and c in today_rates)]
+    yesterday_matrix = cross_rate_matrix(yesterday_rates, currencies)
+    today_matrix = cross_rate_matrix(today_rates, currencies)
+    change = (today_matrix / yesterday_matrix - 1.0) * 100
 
-def calculate_percentage_difference(yesterday_rate, today_rate):
-    return ((today_rate - yesterday_rate) / yesterday_rate) * 100
+    output = {}
+    for i, j in zip(*np.nonzero(~np.eye(len(currencies), dtype=bool))):
+        output[f"{currencies[i]}_to_{currencies[j]}"] = {
+            'yesterday': round(float(yesterday_matrix[i, j]), 4),
+            'today': round(float(today_matrix[i, j]), 4),
+            'percentage_difference': round(float(change[i, j]), 2)
+        }
+    return output
 
-def process_exchange_rates():
+def process_exchange_rates(currencies=None):
     today = datetime.now().strftime('%Y-%m-%d')
     yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    currencies = currencies or subscriber_currencies()
 
-    # Fetch yesterday's data
+    # All currencies are requested, so new subscriber countries cost no extra calls
     params_yesterday = {
         'apikey': API_KEY,
         'date': yesterday,
-        'base_currency': 'USD',
-        'currencies': 'CAD,BRL'
+        'base_currency': 'USD'
     }
-    yesterday_data = fetch_currency_data(BASE_URL_HISTORICAL, params_yesterday)['data'][yesterday]
+    yesterday_data, yesterday_params = get_usd_rates(yesterday, BASE_URL_HISTORICAL, params_yesterday)
 
-    # Fetch today's data
     params_today = {
         'apikey': API_KEY,
-        'base_currency': 'USD',
-        'currencies': 'CAD,BRL'
+        'base_currency': 'USD'
     }
-    today_data = fetch_currency_data(BASE_URL_LATEST, params_today)['data']
-
-    # Calculate rates and differences
-    currency_pairs = [('USD', 'BRL'), ('CAD', 'BRL'), ('USD', 'CAD')]
-    output = {}
+    today_response, stale = fetch_currency_data(BASE_URL_LATEST, params_today)
+    today_data = today_response['data']
+    if not stale:
+        # Stale latest rates are from an earlier day and would corrupt the history
+        save_rates(today, today_data)
 
-    for from_currency, to_currency in currency_pairs:
-        pair_key = f"{from_currency}_to_{to_currency}"
-        yesterday_rate = calculate_rate(from_currency, to_currency, yesterday_data)
-        today_rate = calculate_rate(from_currency, to_currency, today_data)
-        diff = calculate_percentage_difference(yesterday_rate, today_rate)
-
-        output[pair_key] = {
-            'yesterday': round(yesterday_rate, 4),
-            'today': round(today_rate, 4),
-            'percentage_difference': round(diff, 2)
-        }
-
-    return output, {'yesterday': params_yesterday, 'today': params_today}
-
-def save_output(output):
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f'exchange_rates_{timestamp}.json'
-    file_path = os.path.join(project_root, 'data', 'fetched_results', 'exchange_rates', filename)
-
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-
-    with open(file_path, 'w') as f:
-        json.dump(output, f, indent=4)
-
-    logger.info(f"Output saved to {file_path}")
-    return file_path
+    output = exchange_rate_table(yesterday_data, today_data, currencies)
+    return output, {'yesterday': yesterday_params or {'date': yesterday, 'source': 'local_store'}, 'today': params_today}, stale
 
 def main():
     try:
-        output, combined_params = process_exchange_rates()
-        output_file_path = save_output(output)
+        output, combined_params, stale = process_exchange_rates()
+        if stale:
+            logger.warning("Latest rates unavailable; keeping the last stored exchange rate table")
+            return
+        result_sink.append('exchange_rates', output)
 
         # Remove API key from combined_params
         combined_params['yesterday'] = remove_api_key_from_params(combined_params['yesterday'])
@@ -111,10 +156,7 @@ def main():
 
         # Log the combined API call with the final output
         script_path = os.path.abspath(__file__)
-        with open(output_file_path, 'r') as f:
-            final_output = json.load(f)
-        
-        insert_api_response(script_path, combined_params, final_output)
+        insert_api_response(script_path, combined_params, output)
         
         logger.info("Exchange rates processed and saved successfully")
     except Exception as e:
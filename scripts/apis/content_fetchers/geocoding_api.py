@@ -0,0 +1,151 @@
+# scripts/apis/content_fetchers/geocoding_api.py
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+from scripts.utils import http_client
+from scripts.utils.db_connection import get_db_connection, close_connection, WRITE
+from scripts.utils.query_profiler import QueryProfile
+from scripts.utils.rate_limiter import TokenBucket
+from scripts.db.weather_latest import make_location_key
+
+# Initialize logger
+logger = get_logger('geocoding_api')
+
+# Open-Meteo geocoding needs no API key
+GEOCODING_URL = 'https://geocoding-api.open-meteo.com/v1/search'
+GEOCODING_RATE_PER_SECOND = float(os.getenv('GEOCODING_RATE_PER_SECOND', 5))
+GEOCODING_MAX_WORKERS = int(os.getenv('GEOCODING_MAX_WORKERS', 4))
+# Cities that could not be resolved are not looked up again for this many days
+GEOCODING_MISS_TTL_DAYS = int(os.getenv('GEOCODING_MISS_TTL_DAYS', 7))
+
+create_geocoding_cache_query = '''
+CREATE TABLE IF NOT EXISTS geocoding_cache (
+    location_key VARCHAR(255) NOT NULL PRIMARY KEY,
+    city VARCHAR(128) NOT NULL,
+    country VARCHAR(128) NOT NULL DEFAULT '',
+    latitude DOUBLE NULL,
+    longitude DOUBLE NULL,
+    resolved_name VARCHAR(255) NULL,
+    updated TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+'''
+
+upsert_geocoding_query = '''
+INSERT INTO geocoding_cache (location_key, city, country, latitude, longitude, resolved_name)
+VALUES (%s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE latitude = VALUES(latitude), longitude = VALUES(longitude),
+    resolved_name = VALUES(resolved_name), updated = CURRENT_TIMESTAMP
+'''
+
+# Resolved locations, plus misses recent enough to trust
+cached_coordinates_query = '''
+SELECT location_key, latitude, longitude
+FROM geocoding_cache
+WHERE latitude IS NOT NULL OR updated >= NOW() - INTERVAL %s DAY
+'''
+
+def fetch_coordinates(city, country=None):
+    """
+    Looks a city up and returns (latitude, longitude, resolved_name), or None.
+    Prefers a result in the given country when there is one.
+    """
+    response = http_client.get(GEOCODING_URL, params={'name': city, 'count': 10, 'language': 'en', 'format': 'json'})
+    response.raise_for_status()
+    results = response.json().get('results') or []
+    if not results:
+        return None
+    if country:
+        in_country = [r for r in results if (r.get('country') or '').casefold() == country.casefold()]
+        results = in_country or results
+    best = results[0]
+    resolved_name = ', '.join(part for part in (best.get('name'), best.get('admin1'), best.get('country')) if part)
+    return best['latitude'], best['longitude'], resolved_name
+
+def load_cached_coordinates(conn):
+    """
+    Returns {location_key: (latitude, longitude)} for every geocoded location.
+    Known misses younger than GEOCODING_MISS_TTL_DAYS map to (None, None).
+    """
+    params = (GEOCODING_MISS_TTL_DAYS,)
+    with QueryProfile('load_cached_coordinates', cached_coordinates_query, params) as profile:
+        cursor = conn.cursor(dictionary=True)
+        try:
+            cursor.execute(cached_coordinates_query, params)
+            rows = cursor.fetchall()
+            profile.set_result(rows=rows)
+        finally:
+            cursor.close()
+    return {row['location_key']: (row['latitude'], row['longitude']) for row in rows}
+
+def fetch_with_limit(limiter, city, country):
+    limiter.acquire()
+    return fetch_coordinates(city, country)
+
+def geocode_locations(locations):
+    """
+    Adds latitude/longitude to each location dict (city, country, ...), using the
+    geocoding_cache table and only calling the API for cities not seen recently.
+    Lookups for new cities run concurrently under a rate limit. Locations that
+    cannot be resolved are returned without coordinates.
+    """
+    conn = None
+    try:
+        conn = get_db_connection(WRITE)
+        cursor = conn.cursor()
+        cursor.execute(create_geocoding_cache_query)
+        conn.commit()
+        cursor.close()
+        cached = load_cached_coordinates(conn)
+
+        misses = {}
+        for location in locations:
+            key = make_location_key(location['city'], location.get('country'))
+            if key not in cached:
+                misses.setdefault(key, []).append(location)
+            elif cached[key][0] is not None:
+                location['latitude'], location['longitude'] = cached[key]
+
+        rows = []
+        if misses:
+            limiter = TokenBucket(GEOCODING_RATE_PER_SECOND)
+            with ThreadPoolExecutor(max_workers=GEOCODING_MAX_WORKERS) as executor:
+                futures = {
+                    executor.submit(fetch_with_limit, limiter, group[0]['city'], group[0].get('country')): key
+                    for key, group in misses.items()
+                }
+                for future in as_completed(futures):
+                    key = futures[future]
+                    first = misses[key][0]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # Errors are not cached; the city is tried again next run
+                        logger.error(f"Geocoding failed for {first['city']}: {e}")
+                        continue
+                    latitude, longitude, resolved_name = result or (None, None, None)
+                    if result:
+                        for location in misses[key]:
+                            location['latitude'], location['longitude'] = latitude, longitude
+                    else:
+                        logger.warning(f"No geocoding result for {first['city']}; not retrying for {GEOCODING_MISS_TTL_DAYS} days")
+                    rows.append((key, first['city'], first.get('country') or '', latitude, longitude, resolved_name))
+
+        if rows:
+            cursor = conn.cursor()
+            cursor.executemany(upsert_geocoding_query, rows)
+            conn.commit()
+            cursor.close()
+            logger.info(f"Geocoded {len(rows)} new locations ({sum(1 for row in rows if row[3] is None)} unresolved)")
+    except Exception as e:
+        logger.error(f"Error geocoding locations: {e}")
+    finally:
+        if conn:
+            close_connection(conn)
+    return locations
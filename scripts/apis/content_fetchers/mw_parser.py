@@ -0,0 +1,121 @@
+# scripts/apis/content_fetchers/mw_parser.py
+
+import re
+from typing import List, Dict, Any
+
+MW_AUDIO_BASE_URL = 'https://media.merriam-webster.com/audio/prons/en/us/mp3'
+
+# Compiled once; these run for every definition string and example
+_bc_split = re.compile(r'\s*\{bc\}\s*')
+_it_tag = re.compile(r'\{/?it\}')
+
+def audio_url(audio_file: str) -> str:
+    """Merriam-Webster audio URL; the subdirectory is the first letter, or 'number'."""
+    subdir = audio_file[0] if audio_file[0].isalpha() else 'number'
+    return f"{MW_AUDIO_BASE_URL}/{subdir}/{audio_file}.mp3"
+
+def parse_short_definitions(shortdef: List[str]) -> List[str]:
+    """Parse short definitions, splitting by {bc} and removing extra whitespace."""
+    definitions = []
+    for def_string in shortdef:
+        definitions.extend(part.strip() for part in _bc_split.split(def_string) if part.strip())
+    return definitions
+
+def iter_senses(def_blocks: List[Any]):
+    """Yield every sense dict under def -> sseq -> sense sequence."""
+    for def_block in def_blocks:
+        if isinstance(def_block, dict) and 'sseq' in def_block:
+            for sense_seq in def_block['sseq']:
+                for sense in sense_seq:
+                    if isinstance(sense, list) and len(sense) > 1 and isinstance(sense[1], dict):
+                        yield sense[1]
+
+def visit_dt(dt: List[Any], examples: List[str], texts: List[str] = None):
+    """Collect examples (and, if texts is given, definition text) from one dt list."""
+    for item in dt:
+        if not isinstance(item, list) or not item:
+            continue
+        if item[0] == 'vis':
+            for vis in item[1]:
+                if 't' in vis:
+                    examples.append(_it_tag.sub('', vis['t']).strip())
+        elif item[0] == 'text' and texts is not None:
+            texts.append(item[1])
+
+def parse_pronunciations(prs: List[Dict[str, Any]]) -> Dict[str, str]:
+    """US and UK IPA plus audio URLs; the last match of each wins."""
+    result = {'pronunciation_us': '', 'pronunciation_uk': '', 'audio_url_us': '', 'audio_url_uk': ''}
+    for pr in prs:
+        if 'ipa' not in pr:
+            continue
+        region = 'uk' if pr.get('l') == 'British' else 'us'
+        result[f'pronunciation_{region}'] = pr['ipa']
+        audio = pr.get('sound', {}).get('audio')
+        if audio:
+            result[f'audio_url_{region}'] = audio_url(audio)
+    return result
+
+def parse_related_word(uro: Dict[str, Any]) -> Dict[str, Any]:
+    related = {
+        'word': uro.get('ure', ''),
+        'part_of_speech': uro.get('fl', ''),
+        'pronunciation': '',
+        'audio_file': '',
+        'grammatical_note': uro.get('gram', '')
+    }
+    for pr in uro.get('prs', []):
+        if not related['pronunciation'] and 'ipa' in pr:
+            related['pronunciation'] = pr['ipa']
+        if not related['audio_file'] and 'sound' in pr and 'audio' in pr['sound']:
+            related['audio_file'] = audio_url(pr['sound']['audio'])
+    return related
+
+def parse_phrase(dro: Dict[str, Any]) -> Dict[str, Any]:
+    phrase = {'phrase': dro.get('drp'), 'definition': '', 'examples': []}
+    for sense_data in iter_senses(dro.get('def', [])):
+        if 'dt' in sense_data:
+            texts = []
+            visit_dt(sense_data['dt'], phrase['examples'], texts)
+            phrase['definition'] += ' '.join(texts)
+    return phrase
+
+def parse_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract everything word_of_the_day stores from one dictionary entry.
+    The sense tree under `def` is walked once, collecting grammar notes and examples
+    together; phrases and related words are visited once each in their own subtrees.
+    """
+    meta = entry.get('meta', {})
+    hwi = entry.get('hwi', {})
+    target = meta.get('target', {})
+
+    additional_gram = []
+    examples = []
+    for sense_data in iter_senses(entry.get('def', [])):
+        if 'gram' in sense_data:
+            additional_gram.append(sense_data['gram'])
+        if 'dt' in sense_data:
+            visit_dt(sense_data['dt'], examples)
+
+    grammatical_info = {'main_gram': entry.get('gram'), 'additional_info': additional_gram}
+
+    parsed = {
+        'meta_id': meta.get('id', ''),
+        'meta_uuid': meta.get('uuid', ''),
+        'meta_src': meta.get('src', ''),
+        'meta_section': meta.get('section', ''),
+        'meta_target_tuuid': target.get('tuuid', ''),
+        'meta_target_tsrc': target.get('tsrc', ''),
+        'meta_stems': meta.get('stems', []),
+        'meta_offensive': bool(meta.get('offensive', False)),
+        'headword': hwi.get('hw', ''),
+        'part_of_speech': entry.get('fl', ''),
+        'grammatical_note': entry.get('gram', ''),
+        'grammatical_info': grammatical_info,
+        'short_definitions': parse_short_definitions(meta.get('app-shortdef', {}).get('def', [])),
+        'examples': examples,
+        'related_words': [parse_related_word(uro) for uro in entry.get('uros', [])],
+        'phrases_idioms': [parse_phrase(dro) for dro in entry.get('dros', [])],
+    }
+    parsed.update(parse_pronunciations(hwi.get('prs', [])))
+    return parsed
@@ -4,14 +4,18 @@ import json
 from datetime import datetime, timedelta
 import requests
 from dotenv import load_dotenv
-import time
 
 # Add the project root to the Python path
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..'))
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
+from scripts.utils import http_client
 from scripts.utils.db_insert_api_calls import insert_api_response
+from scripts.utils import result_sink
+from scripts.utils.fetch_orchestrator import FetchJob, run_jobs
+from scripts.utils.news_dedup import merge_articles
+from scripts.db.article_store import ingest_articles
 
 # Initialize logger
 logger = get_logger('news_api')
@@ -19,26 +23,30 @@ logger = get_logger('news_api')
 # Load environment variables
 load_dotenv()
 
-def fetch_news(url, params, api_name, max_retries=3):
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            data = response.json()
+# All providers are queried at once; the slowest one may hold the batch at most this long
+NEWS_DEADLINE = float(os.getenv('NEWS_DEADLINE', 20))
+# Send a duplicate request to a provider that has not answered after this many seconds (0 disables)
+NEWS_HEDGE_AFTER = float(os.getenv('NEWS_HEDGE_AFTER', 4))
 
-            # Log the API call
-            script_path = os.path.abspath(__file__)
-            insert_api_response(script_path, params, data)
-
-            logger.info(f"Successfully fetched data from {api_name}")
+def fetch_news(url, params, api_name, hedge_after=NEWS_HEDGE_AFTER):
+    # Retries with backoff happen in http_client; a slow provider gets one hedged request
+    try:
+        response = http_client.hedged_get(url, params=params, hedge_after=hedge_after)
+        response.raise_for_status()
+        data = response.json()
+        if response.stale:
+            logger.warning(f"{api_name} unavailable, using its last successful response")
             return data
-        except requests.RequestException as e:
-            logger.error(f"Attempt {attempt + 1} failed for {api_name}: {str(e)}")
-            logger.error(f"Request URL: {response.url}")  # Log the full URL for debugging
-            if attempt == max_retries - 1:
-                logger.error(f"Max retries reached for {api_name}. Giving up.")
-                return None
-            time.sleep(2 ** attempt)  # Exponential backoff
+    except (requests.RequestException, ValueError) as e:
+        logger.error(f"Request to {api_name} failed: {str(e)}")
+        return None
+
+    # Log the API call
+    script_path = os.path.abspath(__file__)
+    insert_api_response(script_path, params, data)
+
+    logger.info(f"Successfully fetched data from {api_name}")
+    return data
 
 def fetch_newsdata(q, country=None, language=None, category=None, from_date=None, to_date=None):
     url = "https://newsdata.io/api/1/archive"
@@ -112,22 +120,15 @@ def fetch_currents(keywords, language=None, country=None, start_date=None, end_d
     params = {k: v for k, v in params.items() if v is not None}
     return fetch_news(url, params, 'currents')
 
-def save_news_data(news_data):
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    folder_path = os.path.join(project_root, 'data', 'fetched_results', 'news', timestamp)
-    os.makedirs(folder_path, exist_ok=True)
-    
-    for api_name, api_data in news_data.items():
-        filename = f'{api_name}_data.json'
-        file_path = os.path.join(folder_path, filename)
-        
-        with open(file_path, 'w') as f:
-            json.dump(api_data, f, indent=4)
-        
-        logger.info(f"{api_name} data saved to {file_path}")
-
-def run_apis(apis_to_fetch, **kwargs):
-    news_data = {}
+def save_news_data(articles):
+    # Raw provider responses are already logged by insert_api_response; only the merged articles are kept
+    result_sink.append('news_articles', articles)
+
+def run_apis(apis_to_fetch, deadline=NEWS_DEADLINE, **kwargs):
+    """
+    Queries all requested providers in parallel and returns {api: response or None}.
+    Providers that have not answered by the deadline are left out as None.
+    """
     api_functions = {
         'newsdata': fetch_newsdata,
         'newsapi': fetch_newsapi,
@@ -136,14 +137,15 @@ def run_apis(apis_to_fetch, **kwargs):
         'currents': fetch_currents
     }
 
+    jobs = []
     for api in apis_to_fetch:
         if api in api_functions:
-            api_params = kwargs.get(api, {})
-            news_data[api] = api_functions[api](**api_params)
+            jobs.append(FetchJob(api, api_functions[api], kwargs=kwargs.get(api, {})))
         else:
             logger.warning(f"Skipping unknown API: {api}")
 
-    return news_data
+    results = run_jobs(jobs, deadline=deadline, job_timeout=deadline, max_workers=max(1, len(jobs)))
+    return {r['name']: r['result'] for r in results}
 
 def main(apis_to_fetch=None, **kwargs):
     try:
@@ -153,9 +155,14 @@ def main(apis_to_fetch=None, **kwargs):
             apis_to_fetch = [apis_to_fetch]
 
         news_data = run_apis(apis_to_fetch, **kwargs)
-        save_news_data(news_data)
-        logger.info("News data fetched and saved successfully")
-        return news_data
+        articles, duplicates = merge_articles(news_data)
+        save_news_data(articles)
+        ingest_articles(articles)
+        logger.info(f"News data fetched and saved successfully: {len(articles)} articles, {duplicates} duplicates dropped")
+        return {
+            'articles': articles,
+            'providers': {api: data is not None for api, data in news_data.items()}
+        }
     except Exception as e:
         logger.error(f"An error occurred in main: {str(e)}")
         return None
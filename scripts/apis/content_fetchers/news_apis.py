@@ -3,7 +3,6 @@
 import os
 import sys
 import json
-from datetime import datetime
 import requests
 from dotenv import load_dotenv
 
@@ -12,7 +11,9 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
+from scripts.utils import http_client
 from scripts.utils.db_insert_api_calls import insert_api_response
+from scripts.utils import result_sink
 
 # Initialize logger
 logger = get_logger('news_api')
@@ -60,9 +61,12 @@ def fetch_news(api_name, **kwargs):
     params[config.get('key_param', 'apikey')] = config['key']
 
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()
         data = response.json()
+        if response.stale:
+            logger.warning(f"{api_name} unavailable, using its last successful response")
+            return data
 
         # Log the API call
         script_path = os.path.abspath(__file__)
@@ -75,16 +79,7 @@ def fetch_news(api_name, **kwargs):
         return None
 
 def save_news_data(news_data):
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f'news_data_{timestamp}.json'
-    file_path = os.path.join(project_root, 'data', 'fetched_results', 'news', filename)
-    
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
-    
-    with open(file_path, 'w') as f:
-        json.dump(news_data, f, indent=4)
-    
-    logger.info(f"News data saved to {file_path}")
+    result_sink.append('news', news_data)
 
 def main(apis_to_fetch=None, **kwargs):
     try:
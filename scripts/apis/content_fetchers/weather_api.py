@@ -4,7 +4,6 @@ import sys
 import os
 import json
 import requests
-from datetime import datetime
 from dotenv import load_dotenv
 
 # Add the project root to the Python path
@@ -12,7 +11,10 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
+from scripts.utils import http_client
 from scripts.utils.db_insert_api_calls import insert_api_response
+from scripts.utils import result_sink
+from scripts.db.weather_latest import split_location, upsert_weather_latest
 
 # Load environment variables from .env file
 load_dotenv()
@@ -30,7 +32,10 @@ def get_api_key():
     return api_key
 
 def fetch_weather_data(api_key, location):
-    """Fetch daily weather forecast data from the Tomorrow.io API."""
+    """
+    Fetch daily weather forecast data from the Tomorrow.io API.
+    Returns (data, stale); stale data is the last cached forecast, served while the API is down.
+    """
     url = 'https://api.tomorrow.io/v4/weather/forecast'
     params = {
         'apikey': api_key,
@@ -41,25 +46,11 @@ def fetch_weather_data(api_key, location):
     }
     
     logger.info(f"Fetching daily weather forecast for location: {location}...")
-    response = requests.get(url, params=params)
+    response = http_client.get(url, params=params)
     response.raise_for_status()
-    return response.json()
-
-def save_json_response(data, location):
-    """Save the entire JSON response to a file."""
-
-    data_dir = os.path.join(project_root, 'data', 'fetched_results', 'weather_api')
-    os.makedirs(data_dir, exist_ok=True)
-    
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"{location.replace(' ', '_')}_{timestamp}.json"
-    file_path = os.path.join(data_dir, filename)
-    
-    with open(file_path, 'w') as f:
-        json.dump(data, f, indent=2)
-    
-    logger.info(f"Saved entire JSON response to {file_path}")
-    return timestamp
+    if response.stale:
+        logger.warning(f"Tomorrow.io unavailable, using the last known forecast for {location}")
+    return response.json(), response.stale
 
 def process_weather_data(weather_data, location):
     """Process and log the weather data."""
@@ -74,18 +65,30 @@ def process_weather_data(weather_data, location):
         logger.warning(f"Response received for {location}, but no valid data found.")
     logger.debug(f"Full response: {json.dumps(weather_data, indent=2)}")
 
-def main(location):
+def main(location, cities=None):
+    """
+    Fetches the forecast for a location and stores it as the latest weather of
+    every city in `cities` ((city, country) pairs), or of the location itself.
+    """
     try:
         api_key = get_api_key()
-        weather_data = fetch_weather_data(api_key, location)
+        weather_data, stale = fetch_weather_data(api_key, location)
         process_weather_data(weather_data, location)
-        save_json_response(weather_data, location)
+        if stale:
+            # The stored latest weather already holds this forecast; re-saving it would date it today
+            logger.warning(f"Not storing the stale forecast for {location}")
+            return
+        result_sink.append('weather_api', weather_data, key=location)
         
         # Insert into api_calls table
         script_path = os.path.abspath(__file__)
         payload = {'location': location, 'units': 'metric'}
         custom_params = f"location={location}&units=metric"
         insert_api_response(script_path, payload, weather_data, custom_params)
+
+        # Keep the parsed forecast as the current weather of every city it covers
+        for city, country in cities or [split_location(location)]:
+            upsert_weather_latest(city, country, weather_data)
         
     except requests.exceptions.HTTPError as http_err:
         logger.error(f"HTTP error occurred for {location}: {http_err}")
@@ -3,12 +3,11 @@
 import os
 import sys
 import json
-import requests
-import time
-from datetime import datetime
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
 from dotenv import load_dotenv
 from requests.exceptions import RequestException, HTTPError
-import re
 from typing import List, Dict, Any
 
 # Add the project root to the Python path
@@ -16,9 +15,16 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
+from scripts.utils import http_client
 from scripts.db.fetch_queries import execute_query
-from scripts.utils.db_insert_api_calls import insert_api_response
-from scripts.utils.db_connection import get_db_connection, close_connection
+from scripts.utils.db_insert_api_calls import insert_api_responses
+from scripts.utils.db_connection import get_db_connection, close_connection, WRITE
+from scripts.utils.rate_limiter import TokenBucket
+from scripts.utils.query_profiler import QueryProfile, log_query_summary
+from scripts.utils import result_sink
+from scripts.db import dictionary_cache
+from scripts.apis.content_fetchers.mw_parser import parse_entry
+from scripts.utils.lexicon import filter_words
 
 # Load environment variables
 load_dotenv()
@@ -29,36 +35,64 @@ logger = get_logger('word_of_the_day')
 # API settings
 MW_API_KEY = os.getenv('MERRIAM_WEBSTER_KEY')
 MW_BASE_URL = 'https://www.dictionaryapi.com/api/v3/references/learners/json'
-MW_AUDIO_BASE_URL = 'https://media.merriam-webster.com/audio/prons/en/us/mp3'
 
-query = '''
-SELECT id, category, word, sentence, used_in_newsletter, created, updated
-FROM word_of_the_day
-WHERE meta_id IS NULL;
+# Enrichment settings
+MW_RATE_PER_SECOND = float(os.getenv('MW_RATE_PER_SECOND', 4))
+MW_BURST = int(os.getenv('MW_BURST', 4))
+MW_MAX_WORKERS = int(os.getenv('MW_MAX_WORKERS', 4))
+MW_BATCH_SIZE = int(os.getenv('MW_BATCH_SIZE', 50))
+CHECKPOINT_PATH = os.path.join(project_root, 'data', 'checkpoints', 'word_of_the_day.json')
+FAILURES_PATH = os.path.join(project_root, 'data', 'checkpoints', 'word_of_the_day_failures.json')
+# A failed word waits MW_RETRY_BASE_HOURS before its next attempt, doubling per failure up to MW_RETRY_MAX_HOURS
+MW_RETRY_BASE_HOURS = float(os.getenv('MW_RETRY_BASE_HOURS', 6))
+MW_RETRY_MAX_HOURS = float(os.getenv('MW_RETRY_MAX_HOURS', 168))
+
+# Words the lexicon pre-filter rejected; they stay out of the pending query until the
+# word is edited or its row here is deleted
+create_rejections_query = '''
+CREATE TABLE IF NOT EXISTS word_of_the_day_rejections (
+    word_id INT NOT NULL PRIMARY KEY,
+    word VARCHAR(255) NOT NULL,
+    reason VARCHAR(32) NOT NULL,
+    rejected_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
 '''
 
-def save_output(output, word):
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f'word_of_the_day_{word}_{timestamp}.json'
-    file_path = os.path.join(project_root, 'data', 'fetched_results', 'word_of_the_day', filename)
+insert_rejection_query = '''
+INSERT INTO word_of_the_day_rejections (word_id, word, reason)
+VALUES (%s, %s, %s)
+ON DUPLICATE KEY UPDATE word = VALUES(word), reason = VALUES(reason), rejected_at = CURRENT_TIMESTAMP
+'''
 
-    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+query = '''
+SELECT w.id, w.category, w.word, w.sentence, w.used_in_newsletter, w.created, w.updated
+FROM word_of_the_day w
+LEFT JOIN word_of_the_day_rejections r ON r.word_id = w.id AND r.word = w.word
+WHERE w.meta_id IS NULL
+AND r.word_id IS NULL;
+'''
 
-    with open(file_path, 'w') as f:
-        json.dump(output, f, indent=4)
+# Every word, for prefetching or re-parsing the whole table
+all_words_query = '''
+SELECT id, word
+FROM word_of_the_day;
+'''
 
-    logger.info(f"Output saved to {file_path}")
-    return file_path
+def save_output(output, word):
+    return result_sink.append('word_of_the_day', output, key=word)
 
 def fetch_word_definition(word):
-    """Fetch word details from Merriam-Webster API"""
+    """Fetch word details from Merriam-Webster API and keep the raw response in the dictionary cache"""
     url = f"{MW_BASE_URL}/{word}"
     params = {'key': MW_API_KEY}
     
     try:
-        response = requests.get(url, params=params)
+        response = http_client.get(url, params=params)
         response.raise_for_status()  # Check for HTTP errors
-        return response.json()
+        data = response.json()
+        if data and not response.stale:
+            dictionary_cache.put(word, data)
+        return data
     except HTTPError as e:
         logger.error(f"HTTP error while fetching definition for {word}: {e}")
     except RequestException as e:
@@ -66,272 +100,339 @@ def fetch_word_definition(word):
     return None
 
 
-def parse_short_definitions(shortdef: List[str]) -> List[str]:
-    """Parse short definitions, splitting by {bc} and removing extra whitespace."""
-    all_definitions = []
-    for def_string in shortdef:
-        split_defs = re.split(r'\s*\{bc\}\s*', def_string)
-        all_definitions.extend([def_.strip() for def_ in split_defs if def_.strip()])
-    return all_definitions
-
-def extract_examples(dt: List[Any]) -> List[str]:
-    """Extract examples from the definition text (dt) structure."""
-    examples = []
-    for item in dt:
-        if isinstance(item, list) and item[0] == 'vis':
-            for vis in item[1]:
-                if 't' in vis:
-                    # Remove italics tags and trim whitespace
-                    example = re.sub(r'\{/?it\}', '', vis['t']).strip()
-                    examples.append(example)
-    return examples
-
-def extract_grammatical_info(word_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Extract detailed grammatical information."""
-    gram_info = {
-        'main_gram': word_data.get('gram'),
-        'additional_info': []
+update_word_query = """
+UPDATE word_of_the_day
+SET meta_id = %s, meta_uuid = %s, meta_src = %s, 
+    meta_section = %s, meta_target_tuuid = %s, 
+    meta_target_tsrc = %s, meta_offensive = %s, 
+    headword = %s, part_of_speech = %s, 
+    pronunciation_us = %s, pronunciation_uk = %s, 
+    audio_file_us = %s, audio_file_uk = %s, 
+    grammatical_note = %s, grammatical_info = %s,
+    shortdef_1 = %s, shortdef_2 = %s, shortdef_3 = %s,
+    short_definitions = %s, example_1 = %s, example_2 = %s,
+    examples = %s, related_words = %s, phrases_idioms = %s
+WHERE id = %s
+"""
+
+def build_word_update_params(word_id: int, word_data: List[Dict[str, Any]]) -> tuple:
+    """Parse an API response into the parameter tuple for update_word_query."""
+    # Extract relevant data from the API response
+    if not word_data or not isinstance(word_data[0], dict):
+        raise ValueError("Invalid word data structure")
+
+    parsed = parse_entry(word_data[0])
+
+    grammatical_info_str = '; '.join([f"{k}: {v}" for k, v in parsed['grammatical_info'].items() if v])
+
+    short_definitions = parsed['short_definitions']
+    shortdef_1 = short_definitions[0] if len(short_definitions) > 0 else None
+    shortdef_2 = short_definitions[1] if len(short_definitions) > 1 else None
+    shortdef_3 = short_definitions[2] if len(short_definitions) > 2 else None
+    short_definitions_str = '; '.join(short_definitions)
+
+    examples = parsed['examples']
+    example_1 = examples[0] if len(examples) > 0 else None
+    example_2 = examples[1] if len(examples) > 1 else None
+    examples_str = '; '.join(examples)
+
+    related_words_str = '; '.join([f"{rw['word']} ({rw['part_of_speech']})" for rw in parsed['related_words']])
+    phrases_idioms_str = '; '.join([f"{pi['phrase']}: {pi['definition']}" for pi in parsed['phrases_idioms']])
+
+    return (
+        parsed['meta_id'], parsed['meta_uuid'], parsed['meta_src'],
+        parsed['meta_section'], parsed['meta_target_tuuid'],
+        parsed['meta_target_tsrc'], parsed['meta_offensive'],
+        parsed['headword'], parsed['part_of_speech'],
+        parsed['pronunciation_us'], parsed['pronunciation_uk'],
+        parsed['audio_url_us'], parsed['audio_url_uk'],
+        parsed['grammatical_note'], grammatical_info_str,
+        shortdef_1, shortdef_2, shortdef_3,
+        short_definitions_str, example_1, example_2,
+        examples_str, related_words_str, phrases_idioms_str,
+        word_id
+    )
+
+def _load_json(path, default):
+    if os.path.exists(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read {path}, starting fresh: {e}")
+    return default
+
+def _save_json(data, path):
+    """Atomically write a JSON file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+def load_checkpoint(mode, path=CHECKPOINT_PATH):
+    """
+    Progress of an interrupted run of the same mode, so it can resume; otherwise a fresh checkpoint.
+    The checkpoint only lives for one run: finish_checkpoint removes it.
+    """
+    checkpoint = _load_json(path, None)
+    if checkpoint and checkpoint.get('mode') == mode:
+        logger.info(f"Resuming interrupted {mode} run from {checkpoint.get('started')}")
+        checkpoint.setdefault('completed', [])
+        return checkpoint
+    return {'mode': mode, 'started': datetime.now().isoformat(), 'completed': []}
+
+def save_checkpoint(checkpoint, path=CHECKPOINT_PATH):
+    checkpoint['updated'] = datetime.now().isoformat()
+    _save_json(checkpoint, path)
+
+def finish_checkpoint(path=CHECKPOINT_PATH):
+    if os.path.exists(path):
+        os.remove(path)
+
+def load_failures(path=FAILURES_PATH):
+    """Words that failed recently: {word_id: {word, error, attempts, retry_after}}."""
+    return _load_json(path, {})
+
+def record_failure(failures, word_id, word, error):
+    entry = failures.get(str(word_id), {'attempts': 0})
+    attempts = entry['attempts'] + 1
+    delay = min(MW_RETRY_MAX_HOURS, MW_RETRY_BASE_HOURS * 2 ** (attempts - 1))
+    failures[str(word_id)] = {
+        'word': word,
+        'error': error,
+        'attempts': attempts,
+        'retry_after': (datetime.now() + timedelta(hours=delay)).isoformat(timespec='seconds'),
     }
-    
-    # Check for additional grammatical information in the definition structure
-    if 'def' in word_data:
-        for def_block in word_data['def']:
-            if 'sseq' in def_block:
-                for sense_seq in def_block['sseq']:
-                    for sense in sense_seq:
-                        if isinstance(sense, list) and len(sense) > 1:
-                            sense_data = sense[1]
-                            if 'gram' in sense_data:
-                                gram_info['additional_info'].append(sense_data['gram'])
-    
-    return gram_info
-
-def extract_phrases_idioms(word_data: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Extract phrases and idioms related to the word."""
-    phrases_idioms = []
-    if 'dros' in word_data:
-        for dro in word_data['dros']:
-            phrase = {
-                'phrase': dro.get('drp'),
-                'definition': '',
-                'examples': []
-            }
-            if 'def' in dro:
-                for def_block in dro['def']:
-                    if 'sseq' in def_block:
-                        for sense_seq in def_block['sseq']:
-                            for sense in sense_seq:
-                                if isinstance(sense, list) and len(sense) > 1:
-                                    sense_data = sense[1]
-                                    if 'dt' in sense_data:
-                                        phrase['definition'] += ' '.join([item[1] for item in sense_data['dt'] if isinstance(item, list) and item[0] == 'text'])
-                                        phrase['examples'].extend(extract_examples(sense_data['dt']))
-            phrases_idioms.append(phrase)
-    return phrases_idioms
-
-def update_word_of_the_day(conn, word_id: int, word_data: List[Dict[str, Any]]):
-    cursor = conn.cursor()
 
+def cooling_down(failures, retry_failed=False):
+    """IDs of failed words still waiting for their next attempt."""
+    if retry_failed:
+        return set()
+    now = datetime.now().isoformat(timespec='seconds')
+    return {int(word_id) for word_id, entry in failures.items() if entry.get('retry_after', '') > now}
+
+def ensure_rejections_table():
+    conn = get_db_connection(WRITE)
     try:
-        # Disable autocommit
-        conn.autocommit = False
+        cursor = conn.cursor()
+        cursor.execute(create_rejections_query)
+        conn.commit()
+        cursor.close()
+    finally:
+        close_connection(conn)
+
+def record_rejections(rejected):
+    """Stores (word_id, word, reason) for words the lexicon rejected, so later runs skip them."""
+    if not rejected:
+        return
+    conn = get_db_connection(WRITE)
+    try:
+        cursor = conn.cursor()
+        with QueryProfile('record_rejections', insert_rejection_query, rejected) as profile:
+            cursor.executemany(insert_rejection_query, rejected)
+            profile.set_result(rowcount=cursor.rowcount)
+        conn.commit()
+        cursor.close()
+        logger.info(f"Recorded {len(rejected)} rejected words in word_of_the_day_rejections")
+    finally:
+        close_connection(conn)
 
-        # Extract relevant data from the API response
-        if not word_data or not isinstance(word_data[0], dict):
-            raise ValueError("Invalid word data structure")
+def fetch_with_limit(limiter, word):
+    """
+    Return (definition, from_cache). Cached words are served locally without
+    using a rate limiter token; others wait for one and are fetched.
+    """
+    cached = dictionary_cache.get(word)
+    if cached:
+        return cached, True
+    limiter.acquire()
+    return fetch_word_definition(word), False
 
-        entry = word_data[0]
-        meta = entry.get('meta', {})
-        hwi = entry.get('hwi', {})
-        
-        meta_id = meta.get('id', '')
-        meta_uuid = meta.get('uuid', '')
-        meta_src = meta.get('src', '')
-        meta_section = meta.get('section', '')
-        
-        target = meta.get('target', {})
-        meta_target_tuuid = target.get('tuuid', '')
-        meta_target_tsrc = target.get('tsrc', '')
-        
-        meta_stems = ', '.join(meta.get('stems', []))
-        meta_offensive = bool(meta.get('offensive', False))
-        
-        headword = hwi.get('hw', '')
-        part_of_speech = entry.get('fl', '')
-        
-        pronunciations = hwi.get('prs', [])
-        pronunciation_us = ''
-        pronunciation_uk = ''
-        audio_url_us = ''
-        audio_url_uk = ''
-        
-        for pr in pronunciations:
-            if 'ipa' in pr:
-                if 'l' not in pr or pr.get('l') != 'British':
-                    pronunciation_us = pr['ipa']
-                    if 'sound' in pr and 'audio' in pr['sound']:
-                        audio_file = pr['sound']['audio']
-                        audio_subdir = audio_file[0] if audio_file[0].isalpha() else 'number'
-                        audio_url_us = f"{MW_AUDIO_BASE_URL}/{audio_subdir}/{audio_file}.mp3"
-                elif pr.get('l') == 'British':
-                    pronunciation_uk = pr['ipa']
-                    if 'sound' in pr and 'audio' in pr['sound']:
-                        audio_file = pr['sound']['audio']
-                        audio_subdir = audio_file[0] if audio_file[0].isalpha() else 'number'
-                        audio_url_uk = f"{MW_AUDIO_BASE_URL}/{audio_subdir}/{audio_file}.mp3"
-        
-        grammatical_note = entry.get('gram', '')
-        grammatical_info = extract_grammatical_info(entry)
-        grammatical_info_str = '; '.join([f"{k}: {v}" for k, v in grammatical_info.items() if v])
-        
-        # Handle short definitions
-        app_shortdef = meta.get('app-shortdef', {})
-        shortdef = app_shortdef.get('def', [])
-        short_definitions = parse_short_definitions(shortdef)
-        shortdef_1 = short_definitions[0] if len(short_definitions) > 0 else None
-        shortdef_2 = short_definitions[1] if len(short_definitions) > 1 else None
-        shortdef_3 = short_definitions[2] if len(short_definitions) > 2 else None
-        short_definitions_str = '; '.join(short_definitions)
-        
-        # Handle examples
-        examples = []
-        if 'def' in entry:
-            for def_block in entry['def']:
-                if isinstance(def_block, dict) and 'sseq' in def_block:
-                    for sense_seq in def_block['sseq']:
-                        for sense in sense_seq:
-                            if isinstance(sense, list) and len(sense) > 1:
-                                sense_data = sense[1]
-                                if 'dt' in sense_data:
-                                    examples.extend(extract_examples(sense_data['dt']))
-        example_1 = examples[0] if len(examples) > 0 else None
-        example_2 = examples[1] if len(examples) > 1 else None
-        examples_str = '; '.join(examples)
-        
-        # Handle related words
-        related_words = []
-        if 'uros' in entry:
-            for uro in entry['uros']:
-                related_word = {
-                    'word': uro.get('ure', ''),
-                    'part_of_speech': uro.get('fl', ''),
-                    'pronunciation': next((pr['ipa'] for pr in uro.get('prs', []) if 'ipa' in pr), ''),
-                    'audio_file': '',
-                    'grammatical_note': uro.get('gram', '')
-                }
-                if 'prs' in uro:
-                    for pr in uro['prs']:
-                        if 'sound' in pr and 'audio' in pr['sound']:
-                            related_audio = pr['sound']['audio']
-                            related_subdir = related_audio[0] if related_audio[0].isalpha() else 'number'
-                            related_word['audio_file'] = f"{MW_AUDIO_BASE_URL}/{related_subdir}/{related_audio}.mp3"
-                            break
-                related_words.append(related_word)
-        related_words_str = '; '.join([f"{rw['word']} ({rw['part_of_speech']})" for rw in related_words])
-        
-        # Extract phrases and idioms
-        phrases_idioms = extract_phrases_idioms(entry)
-        phrases_idioms_str = '; '.join([f"{pi['phrase']}: {pi['definition']}" for pi in phrases_idioms])
-
-        # Update the word_of_the_day table
-        update_query = """
-        UPDATE word_of_the_day
-        SET meta_id = %s, meta_uuid = %s, meta_src = %s, 
-            meta_section = %s, meta_target_tuuid = %s, 
-            meta_target_tsrc = %s, meta_offensive = %s, 
-            headword = %s, part_of_speech = %s, 
-            pronunciation_us = %s, pronunciation_uk = %s, 
-            audio_file_us = %s, audio_file_uk = %s, 
-            grammatical_note = %s, grammatical_info = %s,
-            shortdef_1 = %s, shortdef_2 = %s, shortdef_3 = %s,
-            short_definitions = %s, example_1 = %s, example_2 = %s,
-            examples = %s, related_words = %s, phrases_idioms = %s
-        WHERE id = %s
-        """
-        cursor.execute(update_query, (
-            meta_id, meta_uuid, meta_src,
-            meta_section, meta_target_tuuid,
-            meta_target_tsrc, meta_offensive,
-            headword, part_of_speech,
-            pronunciation_us, pronunciation_uk,
-            audio_url_us, audio_url_uk,
-            grammatical_note, grammatical_info_str,
-            shortdef_1, shortdef_2, shortdef_3,
-            short_definitions_str, example_1, example_2,
-            examples_str, related_words_str, phrases_idioms_str,
-            word_id
-        ))
-        
-        # If we've made it this far, commit the transaction
+def flush_word_updates(conn, updates, api_rows):
+    """Write a batch of api_calls rows and word updates in one transaction."""
+    cursor = conn.cursor()
+    try:
+        conn.autocommit = False
+        insert_api_responses(api_rows, conn)
+        with QueryProfile('update_word_of_the_day', update_word_query, updates) as profile:
+            cursor.executemany(update_word_query, updates)
+            profile.set_result(rowcount=cursor.rowcount)
         conn.commit()
-        logger.info(f"Updated word_of_the_day table for word ID: {word_id}")
-        return True
-    except Exception as e:
-        # If any error occurs, roll back the transaction
+        logger.info(f"Updated {len(updates)} words in word_of_the_day")
+    except Exception:
         conn.rollback()
-        logger.error(f"Error processing word ID {word_id}: {str(e)}")
-        return False
+        raise
     finally:
         cursor.close()
-        # Re-enable autocommit
         conn.autocommit = True
 
-def main():
-    # Fetch all words from the database
-    result = execute_query(query)
+def enrich_words(words, rate=MW_RATE_PER_SECOND, burst=MW_BURST, max_workers=MW_MAX_WORKERS,
+                 batch_size=MW_BATCH_SIZE, checkpoint_path=CHECKPOINT_PATH, failures_path=FAILURES_PATH,
+                 retry_failed=False, mode='pending'):
+    """
+    Fetch and store dictionary data for (word_id, word) pairs.
+
+    Requests run concurrently under a token-bucket rate limit, updates are written
+    in batches with executemany, and progress is checkpointed after every batch so
+    an interrupted run of the same mode resumes where it stopped. Failed words are
+    retried on later runs after a growing cooldown (immediately with retry_failed).
+    """
+    checkpoint = load_checkpoint(mode, checkpoint_path)
+    failures = load_failures(failures_path)
+    resumed_ids = set(checkpoint['completed'])
+    waiting_ids = cooling_down(failures, retry_failed)
+    pending = [(word_id, word) for word_id, word in words if word_id not in resumed_ids and word_id not in waiting_ids]
+    stats = {'updated': 0, 'failed': 0, 'skipped': len(words) - len(pending)}
+    logger.info(f"Enriching {len(pending)} words ({len(resumed_ids)} done earlier in this run, "
+                f"{len(waiting_ids)} failed recently and waiting to retry)")
+    if not pending:
+        finish_checkpoint(checkpoint_path)
+        return stats
+
+    limiter = TokenBucket(rate, burst)
+    script_path = os.path.abspath(__file__)
+    updates, api_rows, batch_ids = [], [], []
+
+    def flush():
+        if not updates:
+            return
+        flush_word_updates(conn, updates, api_rows)
+        checkpoint['completed'].extend(batch_ids)
+        for word_id in batch_ids:
+            failures.pop(str(word_id), None)
+        save_checkpoint(checkpoint, checkpoint_path)
+        _save_json(failures, failures_path)
+        stats['updated'] += len(updates)
+        updates.clear()
+        api_rows.clear()
+        batch_ids.clear()
+
+    conn = get_db_connection(WRITE)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = {executor.submit(fetch_with_limit, limiter, word): (word_id, word) for word_id, word in pending}
+        for future in as_completed(futures):
+            word_id, word = futures[future]
+            try:
+                word_definition, from_cache = future.result()
+                if not word_definition:
+                    raise ValueError("No definition returned")
+                updates.append(build_word_update_params(word_id, word_definition))
+                batch_ids.append(word_id)
+                if not from_cache:
+                    combined_params = {
+                        'word_id': word_id,
+                        'word': word,
+                        'api_url': f"{MW_BASE_URL}/{word}"
+                    }
+                    api_rows.append((script_path, combined_params, word_definition, None))
+                    save_output(word_definition, word)
+            except Exception as e:
+                logger.error(f"Error processing word {word} (ID: {word_id}): {e}")
+                record_failure(failures, word_id, word, str(e))
+                stats['failed'] += 1
+
+            if len(updates) >= batch_size:
+                flush()
+        flush()
+        # The run is complete; the next one starts from what the table says is pending
+        finish_checkpoint(checkpoint_path)
+    except BaseException:
+        executor.shutdown(wait=False, cancel_futures=True)
+        save_checkpoint(checkpoint, checkpoint_path)
+        raise
+    finally:
+        executor.shutdown(wait=True)
+        _save_json(failures, failures_path)
+        close_connection(conn)
+
+    logger.info(f"Enrichment finished: {stats['updated']} updated, {stats['failed']} failed, {stats['skipped']} skipped")
+    return stats
+
+def prefetch_words(words, rate=MW_RATE_PER_SECOND, burst=MW_BURST, max_workers=MW_MAX_WORKERS):
+    """
+    Fill the dictionary cache for the given words under the rate limit, without
+    touching the database. Words already cached are skipped.
+    """
+    cached = dictionary_cache.cached_headwords()
+    pending = sorted({word for word in words if dictionary_cache.normalize_headword(word) not in cached})
+    stats = {'fetched': 0, 'failed': 0, 'skipped': len(set(words)) - len(pending)}
+    logger.info(f"Prefetching {len(pending)} words ({stats['skipped']} already cached)")
+
+    limiter = TokenBucket(rate, burst)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_with_limit, limiter, word): word for word in pending}
+        for future in as_completed(futures):
+            word_definition, _ = future.result()
+            if word_definition:
+                stats['fetched'] += 1
+            else:
+                stats['failed'] += 1
+
+    logger.info(f"Prefetch finished: {stats['fetched']} fetched, {stats['failed']} failed, {stats['skipped']} skipped")
+    return stats
+
+def reparse_from_cache(words, batch_size=MW_BATCH_SIZE):
+    """
+    Re-run parsing and the word_of_the_day updates for (word_id, word) pairs using
+    cached responses only. No API call is made; uncached words are skipped.
+    """
+    stats = {'updated': 0, 'failed': 0, 'missing': 0}
+    updates = []
+    conn = get_db_connection(WRITE)
+    try:
+        for word_id, word in words:
+            word_definition = dictionary_cache.get(word)
+            if not word_definition:
+                stats['missing'] += 1
+                continue
+            try:
+                updates.append(build_word_update_params(word_id, word_definition))
+            except Exception as e:
+                logger.error(f"Error parsing cached definition for {word} (ID: {word_id}): {e}")
+                stats['failed'] += 1
+            if len(updates) >= batch_size:
+                flush_word_updates(conn, updates, [])
+                stats['updated'] += len(updates)
+                updates.clear()
+        if updates:
+            flush_word_updates(conn, updates, [])
+            stats['updated'] += len(updates)
+    finally:
+        close_connection(conn)
+
+    logger.info(f"Offline re-parse finished: {stats['updated']} updated, {stats['failed']} failed, {stats['missing']} not cached")
+    return stats
+
+def main(retry_failed=False, prefetch=False, offline=False, all_words=False):
+    # Fetch the words from the database: only unenriched ones unless all_words is set
+    ensure_rejections_table()
+    result = execute_query(all_words_query if all_words else query)
     
     if not result.empty:
-        conn = get_db_connection()
-        try:
-            for index, row in result.iterrows():
-                word_id = int(row['id'])
-                word_of_the_day = row['word']
-                logger.info(f"Processing word: {word_of_the_day} (ID: {word_id})")
-                
-                try:
-                    # Fetch definition of the word from Merriam-Webster API
-                    word_definition = fetch_word_definition(word_of_the_day)
-                    
-                    if word_definition:
-                        logger.info(f"Definition fetched for {word_of_the_day}")
-                        
-                        output_file_path = save_output(word_definition, word_of_the_day)
-                        
-                        # Prepare combined_params
-                        combined_params = {
-                            'word_id': word_id,
-                            'word': word_of_the_day,
-                            'api_url': f"{MW_BASE_URL}/{word_of_the_day}",
-                            'api_key': MW_API_KEY  # Be cautious about logging API keys
-                        }
-                        
-                        # Log the combined API call with the final output
-                        script_path = os.path.abspath(__file__)
-                        with open(output_file_path, 'r') as f:
-                            final_output = json.load(f)
-                        
-                        insert_api_response(script_path, combined_params, final_output)
-                        
-                        # Update word_of_the_day table
-                        update_success = update_word_of_the_day(conn, word_id, word_definition)
-                        
-                        if update_success:
-                            logger.info(f"API response inserted into database and word_of_the_day updated for word: {word_of_the_day}")
-                        else:
-                            logger.warning(f"Failed to update word_of_the_day for word: {word_of_the_day}")
-                    else:
-                        logger.error(f"Failed to fetch definition for {word_of_the_day}")
-                
-                except Exception as e:
-                    logger.error(f"Error processing word {word_of_the_day}: {str(e)}")
-                
-                # Add a small delay to avoid hitting API rate limits
-                time.sleep(1)
-        finally:
-            close_connection(conn)
+        words = [(int(row['id']), row['word']) for _, row in result.iterrows()]
+        if not offline:
+            # Only plausible headwords are worth an API call
+            words, rejected = filter_words(words)
+            record_rejections(rejected)
+        if prefetch:
+            prefetch_words([word for _, word in words])
+        elif offline:
+            reparse_from_cache(words)
+        else:
+            enrich_words(words, retry_failed=retry_failed, mode='all' if all_words else 'pending')
     else:
         logger.info("No words fetched from the database")
+    log_query_summary()
         
         
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Enrich word_of_the_day with Merriam-Webster data")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--prefetch', action='store_true', help="only fill the local dictionary cache")
+    mode.add_argument('--offline', action='store_true', help="re-parse words from the dictionary cache without calling the API")
+    parser.add_argument('--all', dest='all_words', action='store_true', help="process every word, not just unenriched ones")
+    parser.add_argument('--retry-failed', action='store_true', help="retry failed words now instead of waiting for their cooldown")
+    args = parser.parse_args()
+    main(retry_failed=args.retry_failed, prefetch=args.prefetch, offline=args.offline, all_words=args.all_words)
\ No newline at end of file
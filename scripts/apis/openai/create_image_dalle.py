@@ -1,9 +1,15 @@
 import os
+import sys
 import openai
 from dotenv import load_dotenv
 from datetime import datetime
-import requests
-from utils import get_logger  # Assuming the logger_config.py is in your utils folder
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+from scripts.utils import http_client
 
 # Setup logger
 logger = get_logger('create_image_dalle')
@@ -47,7 +53,7 @@ def save_image_from_url(image_url, folder_path):
         if not os.path.exists(folder_path):
             os.makedirs(folder_path)
         
-        response = requests.get(image_url)
+        response = http_client.get(image_url)
         if response.status_code == 200:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             image_path = os.path.join(folder_path, f"dalle_image_{timestamp}.png")
@@ -10,44 +10,115 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
+from scripts.utils.fetch_orchestrator import FetchJob, run_jobs
+from scripts.utils.circuit_breaker import log_breaker_states
+from scripts.utils.geo_clustering import cluster_points
+from scripts.db.fetch_subscribers import fetch_subscriber_locations
+from scripts.apis.content_fetchers.geocoding_api import geocode_locations
 
 # Initialize logger
 logger = get_logger('apis_fetcher')
 
+WEATHER_SCRIPT = 'scripts.apis.content_fetchers.weather_api'
+
 # List of API scripts to be called
-# For the weather API, provide a tuple with the script and location
+# Weather jobs are added per subscriber location by build_api_scripts()
 api_scripts = [
-    ('scripts.apis.content_fetchers.weather_api', 'Calgary'),  # Weather for Calgary
-    ('scripts.apis.content_fetchers.weather_api', 'Belo Horizonte'),  # Weather for Belo Horizonte
     ('scripts.apis.content_fetchers.exchange_rates_api', None)  # GTG
     # ('scripts.apis.content_fetchers.news_api', None)  # GTG
 ]
 
+# Used only when no subscriber location can be read
+fallback_weather_locations = ['Calgary', 'Belo Horizonte']
+
+# Subscriber cities closer than this share one forecast; 0 disables clustering
+WEATHER_CLUSTER_RADIUS_KM = float(os.getenv('WEATHER_CLUSTER_RADIUS_KM', 15))
+
+def cluster_weather_locations(locations, radius_km=WEATHER_CLUSTER_RADIUS_KM):
+    """
+    Groups geocoded locations within radius_km and returns one weather job
+    parameter per group: the representative's coordinates plus every member city.
+    Locations without coordinates are fetched by name on their own.
+    """
+    located = [loc for loc in locations if loc.get('latitude') is not None]
+    params = [
+        {'location': loc['location'], 'cities': [(loc['city'], loc['country'])]}
+        for loc in locations if loc.get('latitude') is None
+    ]
+    clusters = cluster_points([loc['latitude'] for loc in located], [loc['longitude'] for loc in located], radius_km)
+    for representative, members in clusters:
+        rep = located[representative]
+        params.append({
+            'location': f"{rep['latitude']:.4f},{rep['longitude']:.4f}",
+            'cities': [(located[i]['city'], located[i]['country']) for i in members]
+        })
+    logger.info(f"Clustered {len(locations)} locations into {len(params)} weather fetches")
+    return params
+
+def build_weather_plan():
+    """
+    One weather job per cluster of nearby subscriber cities (or per city when
+    clustering is disabled), so each run stores exactly one forecast per city.
+    """
+    locations = fetch_subscriber_locations()
+    if not locations:
+        logger.warning("No subscriber locations found, using fallback weather locations")
+        return [(WEATHER_SCRIPT, location) for location in fallback_weather_locations]
+    if WEATHER_CLUSTER_RADIUS_KM <= 0:
+        return [(WEATHER_SCRIPT, loc['location']) for loc in locations]
+    return [(WEATHER_SCRIPT, param) for param in cluster_weather_locations(geocode_locations(locations))]
+
+def build_api_scripts():
+    return build_weather_plan() + api_scripts
+
+# Concurrency caps per provider module (Tomorrow.io allows 3 requests per second)
+provider_limits = {
+    'weather_api': 3,
+    'exchange_rates_api': 1
+}
+
 def run_api_script(script_module, param=None):
-    try:
-        module = importlib.import_module(script_module)
-        if hasattr(module, 'main'):
-            if param:
-                logger.info(f"Running {script_module} with parameter: {param}")
-                module.main(param)
-            else:
-                logger.info(f"Running {script_module}")
-                module.main()
+    module = importlib.import_module(script_module)
+    if hasattr(module, 'main'):
+        if isinstance(param, dict):
+            logger.info(f"Running {script_module} with parameters: {param}")
+            return module.main(**param)
+        elif param:
+            logger.info(f"Running {script_module} with parameter: {param}")
+            return module.main(param)
         else:
-            logger.warning(f"No main function found in {script_module}")
-    except Exception as e:
-        logger.error(f"Error running {script_module}: {str(e)}")
+            logger.info(f"Running {script_module}")
+            return module.main()
+    else:
+        logger.warning(f"No main function found in {script_module}")
 
-def fetch_all_apis():
+def build_fetch_jobs(scripts):
+    jobs = []
+    for script, param in scripts:
+        # Import up front so worker threads don't contend on the import lock
+        importlib.import_module(script)
+        provider = script.rsplit('.', 1)[-1]
+        label = param.get('location') if isinstance(param, dict) else param
+        name = f"{provider}:{label}" if label else provider
+        jobs.append(FetchJob(name, run_api_script, args=(script, param), provider=provider))
+    return jobs
+
+def fetch_all_apis(scripts=None):
     logger.info("Starting API fetching process")
     start_time = datetime.now()
 
-    for script, param in api_scripts:
-        run_api_script(script, param)
+    results = []
+    try:
+        jobs = build_fetch_jobs(scripts or build_api_scripts())
+        results = run_jobs(jobs, provider_limits=provider_limits)
+    except Exception as e:
+        logger.error(f"Error running API scripts: {str(e)}")
 
     end_time = datetime.now()
     duration = end_time - start_time
+    log_breaker_states()
     logger.info(f"API fetching process completed in {duration}")
+    return results
 
 if __name__ == "__main__":
     fetch_all_apis()
@@ -0,0 +1,82 @@
+# scripts/benchmarks/bench_mw_parser.py
+
+import os
+import sys
+import gzip
+import json
+import time
+import argparse
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.db.dictionary_cache import CACHE_DIR
+from scripts.apis.content_fetchers.word_of_the_day import build_word_update_params
+
+def load_fixtures(path):
+    """
+    Every saved Merriam-Webster response (*.json or *.json.gz) under path.
+    Suggestion lists (responses for unknown words) are left out.
+    """
+    fixtures = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            file_path = os.path.join(root, name)
+            if name.endswith('.json.gz'):
+                with gzip.open(file_path, 'rb') as f:
+                    data = json.loads(f.read())
+            elif name.endswith('.json'):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            else:
+                continue
+            if isinstance(data, list) and data and isinstance(data[0], dict):
+                fixtures.append((name, data))
+    return fixtures
+
+def run(fixtures, repeat):
+    """
+    Parses every fixture `repeat` times and returns (entries per second, failures).
+    """
+    failures = {}
+    for name, data in fixtures:
+        try:
+            build_word_update_params(0, data)
+        except Exception as e:
+            failures[name] = str(e)
+    parseable = [data for name, data in fixtures if name not in failures]
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for data in parseable:
+            build_word_update_params(0, data)
+    elapsed = time.perf_counter() - start
+    parsed = len(parseable) * repeat
+    return (parsed / elapsed if elapsed else 0.0), failures
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Merriam-Webster parser throughput over saved responses")
+    parser.add_argument('path', nargs='?', default=os.path.join(CACHE_DIR, 'objects'),
+                        help="directory of saved responses (default: the dictionary cache)")
+    parser.add_argument('--repeat', type=int, default=20, help="passes over the fixtures")
+    parser.add_argument('--min-rate', type=float, default=None,
+                        help="exit with status 1 when throughput falls below this many entries/s")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.path)
+    if not fixtures:
+        print(f"No saved responses found under {args.path}; run word_of_the_day.py --prefetch first")
+        return 1
+
+    rate, failures = run(fixtures, args.repeat)
+    print(f"{len(fixtures)} responses x {args.repeat}: {rate:,.0f} entries/s ({1e6 / rate if rate else 0:.1f} us/entry)")
+    for name, error in failures.items():
+        print(f"  failed to parse {name}: {error}")
+    if args.min_rate is not None and rate < args.min_rate:
+        print(f"Throughput below the {args.min_rate:,.0f} entries/s floor")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+# scripts/db/article_store.py
+
+import os
+import sys
+import re
+import json
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+
+# Initialize logger
+logger = get_logger('article_store')
+
+# Local full-text index of fetched news, queried at render time instead of the providers
+STORE_PATH = os.getenv('ARTICLE_STORE', os.path.join(project_root, 'data', 'articles', 'articles.db'))
+ARTICLE_RETENTION_DAYS = int(os.getenv('ARTICLE_RETENTION_DAYS', 30))
+ARTICLE_MAX_AGE_DAYS = int(os.getenv('ARTICLE_MAX_AGE_DAYS', 3))
+ARTICLES_PER_SUBSCRIBER = int(os.getenv('ARTICLES_PER_SUBSCRIBER', 3))
+
+create_articles_table = '''
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    canonical_url TEXT NOT NULL UNIQUE,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    image_url TEXT,
+    source TEXT,
+    language TEXT,
+    published_at TEXT NOT NULL,
+    providers TEXT,
+    ingested_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_at);
+CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, description,
+    content='articles', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, description) VALUES ('delete', old.id, old.title, old.description);
+END;
+'''
+
+insert_article_query = '''
+INSERT INTO articles (canonical_url, url, title, description, image_url, source, language, published_at, providers, ingested_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (canonical_url) DO NOTHING
+'''
+
+# Title matches weigh more than description matches
+top_articles_query = '''
+SELECT a.id, a.url, a.title, a.description, a.image_url, a.source, a.language, a.published_at,
+       bm25(articles_fts, 10.0, 1.0) AS score
+FROM articles_fts
+JOIN articles a ON a.id = articles_fts.rowid
+WHERE articles_fts MATCH ?
+AND a.published_at >= ?
+AND (a.url LIKE 'http://%' OR a.url LIKE 'https://%')
+{language_filter}
+ORDER BY score
+LIMIT ?
+'''
+
+recent_articles_query = '''
+SELECT id, url, title, description, image_url, source, language, published_at
+FROM articles
+WHERE published_at >= ?
+AND (url LIKE 'http://%' OR url LIKE 'https://%')
+ORDER BY published_at DESC
+LIMIT ?
+'''
+
+# Provider language names mapped to the codes subscribers use
+LANGUAGE_NAMES = {'english': 'en', 'portuguese': 'pt', 'spanish': 'es', 'french': 'fr', 'german': 'de', 'italian': 'it'}
+
+_token_re = re.compile(r'\w+', re.UNICODE)
+_lock = threading.Lock()
+
+def connect(path=STORE_PATH):
+    """
+    Opens the store, creating the schema on first use.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    fts_missing = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'").fetchone() is None
+    conn.executescript(create_articles_table)
+    if fts_missing:
+        # Stores whose index was dropped get it back from the articles table
+        conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+        conn.commit()
+    return conn
+
+def is_web_url(url):
+    """
+    True for http(s) links; anything else (javascript:, data:, relative) never reaches a newsletter.
+    """
+    return isinstance(url, str) and url.strip().lower().startswith(('http://', 'https://'))
+
+def normalize_language(language):
+    """
+    'English', 'en', 'en-US' and 'pt-br' become 'en', 'en', 'en' and 'pt'.
+    """
+    if not language:
+        return None
+    language = str(language).strip().lower()
+    language = LANGUAGE_NAMES.get(language, language)
+    return language.split('-')[0].split('_')[0] or None
+
+def normalize_published_at(value):
+    """
+    Parses the providers' date formats into a sortable UTC 'YYYY-MM-DD HH:MM:SS' string, or None.
+    """
+    if not value:
+        return None
+    text = str(value).strip()
+    parsed = None
+    try:
+        parsed = datetime.fromisoformat(text.replace('Z', '+00:00'))
+    except ValueError:
+        for fmt in ('%Y-%m-%d %H:%M:%S %z', '%a, %d %b %Y %H:%M:%S %z'):
+            try:
+                parsed = datetime.strptime(text, fmt)
+                break
+            except ValueError:
+                continue
+    if parsed is None:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+def ingest_articles(articles, path=STORE_PATH):
+    """
+    Adds merged articles (see news_dedup.merge_articles) to the index, skipping
+    URLs already stored, and drops articles older than ARTICLE_RETENTION_DAYS.
+    Returns the number of new articles.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    ingested_at = now.strftime('%Y-%m-%d %H:%M:%S')
+    rows = []
+    for article in articles:
+        if not article.get('title') or not article.get('canonical_url'):
+            continue
+        if not is_web_url(article.get('url')):
+            logger.warning(f"Skipping article with a non-http(s) link: {article.get('url')!r}")
+            continue
+        rows.append((
+            article['canonical_url'],
+            article['url'],
+            article['title'],
+            article.get('description'),
+            article.get('image_url'),
+            article.get('source'),
+            normalize_language(article.get('language')),
+            normalize_published_at(article.get('published_at')) or ingested_at,
+            json.dumps(article.get('providers') or []),
+            ingested_at
+        ))
+
+    cutoff = (now - timedelta(days=ARTICLE_RETENTION_DAYS)).strftime('%Y-%m-%d %H:%M:%S')
+    with _lock:
+        conn = connect(path)
+        try:
+            added = conn.executemany(insert_article_query, rows).rowcount if rows else 0
+            pruned = conn.execute('DELETE FROM articles WHERE published_at < ?', (cutoff,)).rowcount
+            conn.commit()
+        finally:
+            conn.close()
+    logger.info(f"Indexed {added} new articles ({len(rows) - added} already stored, {pruned} pruned)")
+    return added
+
+def recent_articles(conn, max_age_days=ARTICLE_MAX_AGE_DAYS, limit=5000):
+    """
+    Returns the articles published in the last max_age_days, newest first.
+    """
+    since = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+    return [dict(row) for row in conn.execute(recent_articles_query, (since, limit)).fetchall()]
+
+def match_expression(interest):
+    """
+    FTS5 query for an interest: any of its words, each quoted so user text can't inject syntax.
+    """
+    tokens = _token_re.findall(interest.casefold())
+    return ' OR '.join(f'"{token}"' for token in tokens)
+
+def parse_interests(interests):
+    """
+    Splits the subscribers.interests column (comma or semicolon separated) into a list.
+    """
+    if not isinstance(interests, str):
+        return []
+    return [interest.strip() for interest in re.split(r'[,;]', interests) if interest.strip()]
+
+def top_articles(conn, interest, k=ARTICLES_PER_SUBSCRIBER, languages=None, max_age_days=ARTICLE_MAX_AGE_DAYS):
+    """
+    Returns up to k recent articles best matching an interest, as dicts ordered by relevance.
+    """
+    expression = match_expression(interest)
+    if not expression:
+        return []
+    since = (datetime.now(timezone.utc) - timedelta(days=max_age_days)).strftime('%Y-%m-%d %H:%M:%S')
+    params = [expression, since]
+    language_filter = ''
+    codes = sorted({normalize_language(lang) for lang in languages or [] if normalize_language(lang)})
+    if codes:
+        language_filter = f"AND (a.language IS NULL OR a.language IN ({', '.join('?' for _ in codes)}))"
+        params.extend(codes)
+    params.append(k)
+    rows = conn.execute(top_articles_query.format(language_filter=language_filter), params).fetchall()
+    return [dict(row) for row in rows]
+
+def select_articles(conn, interests, languages=None, k=ARTICLES_PER_SUBSCRIBER, cache=None):
+    """
+    Picks k articles for a subscriber, taking the best remaining match of each
+    interest in turn so one interest doesn't crowd out the others.
+    Pass the same dict as cache for a whole run to query each interest once.
+    """
+    cache = {} if cache is None else cache
+    language_key = tuple(sorted(languages or []))
+    ranked = []
+    for interest in parse_interests(interests):
+        key = (interest.casefold(), language_key)
+        if key not in cache:
+            cache[key] = top_articles(conn, interest, k=k, languages=languages)
+        ranked.append((interest, cache[key]))
+
+    selected = []
+    seen = set()
+    for position in range(k):
+        for interest, articles in ranked:
+            if position < len(articles) and articles[position]['id'] not in seen:
+                seen.add(articles[position]['id'])
+                selected.append(dict(articles[position], interest=interest))
+                if len(selected) == k:
+                    return selected
+    return selected
@@ -0,0 +1,261 @@
+# scripts/db/async_db.py
+
+import os
+import sys
+import json
+import asyncio
+import sqlite3
+import threading
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+from scripts.utils.db_connection import get_db_connection, close_connection, READ, WRITE, POOL_SETTINGS
+from scripts.utils.db_insert_api_calls import insert_api_response
+from scripts.db.fetch_subscribers import subscribers_query
+from scripts.db.bookkeeping import chunked, update_used_in_newsletter, DELIVERY_CHUNK_SIZE
+from scripts.utils.query_profiler import QueryProfile
+
+# Initialize logger
+logger = get_logger('async_db')
+
+# Statements that only read; everything else goes to the writer and is committed
+READ_STATEMENTS = ('SELECT', 'WITH', 'SHOW', 'EXPLAIN', 'DESCRIBE')
+
+def is_read_query(query):
+    words = query.lstrip().split(None, 1)
+    return bool(words) and words[0].upper() in READ_STATEMENTS
+
+class AsyncDatabase:
+    """
+    Async interface over the operations the pipeline uses.
+
+    Every call runs the blocking driver on a dedicated thread pool, so awaiting a
+    query never stalls the event loop.
+    """
+
+    def __init__(self, max_workers):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=type(self).__name__)
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, func, *args)
+
+    async def execute_query(self, query, params=None):
+        """
+        Returns a DataFrame for reads and the affected row count for writes,
+        which are committed. Errors are raised, not turned into empty results.
+        """
+        return await self._run(self._execute_query, query, params)
+
+    async def fetch_subscribers(self):
+        """
+        Returns the subscribed rows as a DataFrame; errors are raised on every backend.
+        """
+        return await self._run(self._fetch_subscribers)
+
+    async def insert_api_response(self, script_path, payload, response, custom_params=None):
+        return await self._run(self._insert_api_response, script_path, payload, response, custom_params)
+
+    async def update_used_in_newsletter(self, used_ids, subscriber_ids, run_date=None):
+        return await self._run(self._update_used_in_newsletter, used_ids, subscriber_ids, run_date)
+
+    async def close(self):
+        await self._run(self._close)
+        self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _close(self):
+        pass
+
+class MySQLAsyncDatabase(AsyncDatabase):
+    """
+    MySQL backend delegating to the existing pooled helpers.
+    """
+
+    def __init__(self, max_workers=None):
+        # Never run more queries at once than the smaller pool has connections
+        if max_workers is None:
+            max_workers = min(settings['pool_size'] for settings in POOL_SETTINGS.values())
+        super().__init__(max_workers)
+
+    def _execute_query(self, query, params=None):
+        conn = None
+        read = is_read_query(query)
+        with QueryProfile('execute_query', query, params) as profile:
+            try:
+                conn = get_db_connection(READ if read else WRITE)
+                profile.connection_acquired()
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(query, params)
+                if read:
+                    data = cursor.fetchall()
+                    profile.set_result(rows=data)
+                    return pd.DataFrame(data)
+                conn.commit()
+                profile.set_result(rowcount=cursor.rowcount)
+                return cursor.rowcount
+            except Exception as e:
+                logger.error(f"Error executing query: {e}")
+                if conn and not read:
+                    conn.rollback()
+                raise
+            finally:
+                if conn:
+                    close_connection(conn)
+
+    def _fetch_subscribers(self):
+        # Through _execute_query, so errors are raised as on SQLite instead of becoming None
+        subscribers_df = self._execute_query(subscribers_query)
+        logger.info(f"Fetched and processed {len(subscribers_df)} subscribers")
+        return subscribers_df
+
+    def _insert_api_response(self, script_path, payload, response, custom_params=None):
+        insert_api_response(script_path, payload, response, custom_params)
+
+    def _update_used_in_newsletter(self, used_ids, subscriber_ids, run_date=None):
+        update_used_in_newsletter(used_ids, subscriber_ids, run_date)
+
+sqlite_schema = '''
+CREATE TABLE IF NOT EXISTS subscribers (
+    id INTEGER PRIMARY KEY,
+    full_name TEXT, email TEXT, nickname TEXT, interests TEXT, languages TEXT,
+    city TEXT, country TEXT, timezone TEXT,
+    days_receiving_newsletter INTEGER NOT NULL DEFAULT 0,
+    is_subscribed INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS api_calls (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    script_path TEXT, custom_params TEXT, payload TEXT, response TEXT,
+    used_in_newsletter INTEGER NOT NULL DEFAULT 0,
+    created TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS newsletter_deliveries (
+    run_date DATE NOT NULL,
+    subscriber_id INTEGER NOT NULL,
+    counted INTEGER NOT NULL DEFAULT 0,
+    delivered_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_date, subscriber_id)
+);
+'''
+
+# Content tables only need the columns the bookkeeping touches
+sqlite_content_tables = ['quotes', 'fun_facts', 'word_of_the_day', 'english_tips', 'historical_events', 'daily_challenges']
+
+class SQLiteAsyncDatabase(AsyncDatabase):
+    """
+    SQLite stand-in for local tests and benchmarks.
+
+    Accepts the same %s-style queries as the MySQL backend. A single connection
+    is shared and serialized, which matches SQLite's single-writer model.
+    """
+
+    def __init__(self, path=':memory:'):
+        super().__init__(max_workers=1)
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.create_schema()
+
+    def create_schema(self):
+        with self._lock:
+            self._conn.executescript(sqlite_schema)
+            for table in sqlite_content_tables:
+                self._conn.execute(
+                    f'CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, used_in_newsletter INTEGER NOT NULL DEFAULT 0)'
+                )
+            self._conn.commit()
+
+    @staticmethod
+    def _translate(query):
+        return query.replace('%s', '?')
+
+    def _execute_query(self, query, params=None):
+        with self._lock:
+            try:
+                cursor = self._conn.execute(self._translate(query), params or ())
+                if is_read_query(query):
+                    return pd.DataFrame([dict(row) for row in cursor.fetchall()])
+                self._conn.commit()
+                return cursor.rowcount
+            except sqlite3.Error as e:
+                logger.error(f"Error executing query: {e}")
+                self._conn.rollback()
+                raise
+
+    def _fetch_subscribers(self):
+        subscribers_df = self._execute_query(subscribers_query)
+        logger.info(f"Fetched and processed {len(subscribers_df)} subscribers")
+        return subscribers_df
+
+    def _insert_api_response(self, script_path, payload, response, custom_params=None):
+        with self._lock:
+            self._conn.execute(
+                'INSERT INTO api_calls (script_path, custom_params, payload, response) VALUES (?, ?, ?, ?)',
+                (script_path, custom_params, json.dumps(payload), json.dumps(response))
+            )
+            self._conn.commit()
+        logger.info(f"Successfully inserted data for API: {script_path}")
+
+    def _update_used_in_newsletter(self, used_ids, subscriber_ids, run_date=None):
+        run_date = (run_date or date.today()).isoformat()
+        with self._lock:
+            try:
+                for table, ids in used_ids.items():
+                    ids = sorted({int(i) for i in ids if i is not None})
+                    if ids:
+                        placeholders = ','.join(['?'] * len(ids))
+                        self._conn.execute(f'UPDATE {table} SET used_in_newsletter = 1 WHERE id IN ({placeholders})', ids)
+                self._conn.commit()
+
+                # Same chunked staging + set-based apply as scripts.db.bookkeeping
+                for chunk in chunked(sorted({int(i) for i in subscriber_ids}), DELIVERY_CHUNK_SIZE):
+                    self._conn.executemany(
+                        'INSERT OR IGNORE INTO newsletter_deliveries (run_date, subscriber_id) VALUES (?, ?)',
+                        [(run_date, sid) for sid in chunk]
+                    )
+                    pending = '''
+                    SELECT subscriber_id FROM newsletter_deliveries
+                    WHERE run_date = ? AND counted = 0 AND subscriber_id BETWEEN ? AND ?
+                    '''
+                    bounds = (run_date, chunk[0], chunk[-1])
+                    self._conn.execute(
+                        f'UPDATE subscribers SET days_receiving_newsletter = days_receiving_newsletter + 1 WHERE id IN ({pending})',
+                        bounds
+                    )
+                    self._conn.execute(
+                        'UPDATE newsletter_deliveries SET counted = 1 WHERE run_date = ? AND counted = 0 AND subscriber_id BETWEEN ? AND ?',
+                        bounds
+                    )
+                    self._conn.commit()
+                logger.info("All updates completed successfully")
+            except sqlite3.Error as e:
+                self._conn.rollback()
+                logger.error(f"Error updating used_in_newsletter: {e}")
+
+    def _close(self):
+        with self._lock:
+            self._conn.close()
+
+def get_async_database(backend=None):
+    """
+    Returns the async database for DB_BACKEND ('mysql' or 'sqlite').
+    """
+    backend = (backend or os.getenv('DB_BACKEND', 'mysql')).lower()
+    if backend == 'sqlite':
+        return SQLiteAsyncDatabase(os.getenv('SQLITE_DB_PATH', os.path.join(project_root, 'data', 'local.db')))
+    if backend == 'mysql':
+        return MySQLAsyncDatabase()
+    raise ValueError(f"Unknown DB_BACKEND: {backend}")
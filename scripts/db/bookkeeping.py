@@ -0,0 +1,164 @@
+# scripts/db/bookkeeping.py
+
+import os
+import sys
+from datetime import date
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+from scripts.utils.db_connection import get_db_connection, close_connection, READ, WRITE
+from scripts.utils.query_profiler import QueryProfile
+
+# Initialize logger
+logger = get_logger('bookkeeping')
+
+# Number of subscriber IDs written and applied per transaction
+DELIVERY_CHUNK_SIZE = int(os.getenv('DELIVERY_CHUNK_SIZE', 1000))
+
+create_delivery_log_query = '''
+CREATE TABLE IF NOT EXISTS newsletter_deliveries (
+    run_date DATE NOT NULL,
+    subscriber_id INT NOT NULL,
+    counted TINYINT(1) NOT NULL DEFAULT 0,
+    delivered_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (run_date, subscriber_id),
+    KEY idx_subscriber (subscriber_id)
+);
+'''
+
+insert_delivery_query = '''
+INSERT IGNORE INTO newsletter_deliveries (run_date, subscriber_id)
+VALUES (%s, %s)
+'''
+
+# Only rows not yet counted are applied, so re-running a chunk never double counts
+apply_delivery_query = '''
+UPDATE subscribers s
+INNER JOIN newsletter_deliveries d ON d.subscriber_id = s.id
+SET s.days_receiving_newsletter = s.days_receiving_newsletter + 1,
+    d.counted = 1
+WHERE d.run_date = %s
+AND d.counted = 0
+AND d.subscriber_id BETWEEN %s AND %s
+'''
+
+def chunked(items, size):
+    """
+    Yields successive lists of at most `size` items.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def ensure_delivery_log(conn):
+    """
+    Creates the newsletter_deliveries table if it does not exist yet.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute(create_delivery_log_query)
+        conn.commit()
+    finally:
+        cursor.close()
+
+def mark_content_used(conn, used_ids):
+    """
+    Flags the content rows used in today's newsletter.
+    """
+    cursor = conn.cursor()
+    try:
+        for table, ids in used_ids.items():
+            ids = sorted({int(i) for i in ids if i is not None})
+            if not ids:
+                continue
+            placeholders = ','.join(['%s'] * len(ids))
+            query = f"UPDATE {table} SET used_in_newsletter = 1 WHERE id IN ({placeholders})"
+            with QueryProfile('update_used_in_newsletter:content', query, ids) as profile:
+                cursor.execute(query, ids)
+                profile.set_result(rowcount=cursor.rowcount)
+            logger.info(f"Updated {cursor.rowcount} rows in {table}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+def record_deliveries(conn, subscriber_ids, run_date=None, chunk_size=DELIVERY_CHUNK_SIZE):
+    """
+    Bulk-loads delivered subscriber IDs into newsletter_deliveries and applies the
+    days_receiving_newsletter counters with a join, one bounded transaction per chunk.
+
+    Returns the number of subscribers whose counter was incremented.
+    """
+    run_date = run_date or date.today()
+    subscriber_ids = sorted({int(i) for i in subscriber_ids})
+    applied = 0
+
+    cursor = conn.cursor()
+    try:
+        for chunk in chunked(subscriber_ids, chunk_size):
+            try:
+                rows = [(run_date, sid) for sid in chunk]
+                with QueryProfile('update_used_in_newsletter:stage', insert_delivery_query, rows) as profile:
+                    cursor.executemany(insert_delivery_query, rows)
+                    profile.set_result(rowcount=cursor.rowcount)
+                with QueryProfile('update_used_in_newsletter:apply', apply_delivery_query) as profile:
+                    cursor.execute(apply_delivery_query, (run_date, chunk[0], chunk[-1]))
+                    profile.set_result(rowcount=cursor.rowcount)
+                applied += cursor.rowcount // 2  # Multi-table UPDATE counts both joined rows
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        logger.info(f"Recorded {len(subscriber_ids)} deliveries for {run_date}, incremented {applied} subscribers")
+        return applied
+    finally:
+        cursor.close()
+
+def update_used_in_newsletter(used_ids, subscriber_ids, run_date=None):
+    """
+    Marks used content and records today's deliveries.
+    """
+    conn = None
+    try:
+        conn = get_db_connection(WRITE)
+        ensure_delivery_log(conn)
+        mark_content_used(conn, used_ids)
+        if subscriber_ids:
+            record_deliveries(conn, subscriber_ids, run_date)
+        logger.info("All updates completed successfully")
+    except Exception as e:
+        logger.error(f"Error updating used_in_newsletter: {e}")
+    finally:
+        if conn:
+            close_connection(conn)
+
+def fetch_delivery_history(subscriber_id=None, run_date=None):
+    """
+    Returns per-run delivery rows, optionally filtered by subscriber and/or date.
+    """
+    query = 'SELECT run_date, subscriber_id, counted, delivered_at FROM newsletter_deliveries WHERE 1 = 1'
+    params = []
+    if subscriber_id is not None:
+        query += ' AND subscriber_id = %s'
+        params.append(subscriber_id)
+    if run_date is not None:
+        query += ' AND run_date = %s'
+        params.append(run_date)
+    query += ' ORDER BY run_date DESC, subscriber_id'
+
+    conn = None
+    try:
+        conn = get_db_connection(READ)
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    except Exception as e:
+        logger.error(f"Error fetching delivery history: {e}")
+        return []
+    finally:
+        if conn:
+            close_connection(conn)
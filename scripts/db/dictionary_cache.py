@@ -0,0 +1,106 @@
+# scripts/db/dictionary_cache.py
+
+import os
+import sys
+import gzip
+import json
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from datetime import datetime
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+
+# Initialize logger
+logger = get_logger('dictionary_cache')
+
+# Raw Merriam-Webster responses, kept forever so re-parsing never calls the API again
+CACHE_DIR = os.getenv('DICTIONARY_CACHE_DIR', os.path.join(project_root, 'data', 'dictionary_cache'))
+
+create_headwords_table = '''
+CREATE TABLE IF NOT EXISTS headwords (
+    headword TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    fetched_at TEXT NOT NULL
+);
+'''
+
+_lock = threading.Lock()
+
+def normalize_headword(word):
+    """
+    Cache key for a word: Unicode-normalized, casefolded, single-spaced.
+    """
+    return ' '.join(unicodedata.normalize('NFKC', str(word)).casefold().split())
+
+def _object_path(digest):
+    # Two-level fan-out keeps directories small
+    return os.path.join(CACHE_DIR, 'objects', digest[:2], f"{digest}.json.gz")
+
+def _connect():
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(CACHE_DIR, 'index.db'))
+    conn.execute(create_headwords_table)
+    return conn
+
+def put(word, data):
+    """
+    Stores a raw response under the word's headword. Responses are content-addressed,
+    so identical bodies (e.g. inflections resolving to one entry) are stored once.
+    Returns the content digest.
+    """
+    body = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    digest = hashlib.sha256(body).hexdigest()
+    path = _object_path(digest)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(gzip.compress(body))
+        os.replace(tmp_path, path)
+    with _lock:
+        conn = _connect()
+        try:
+            conn.execute('INSERT OR REPLACE INTO headwords (headword, digest, fetched_at) VALUES (?, ?, ?)',
+                         (normalize_headword(word), digest, datetime.now().isoformat(timespec='seconds')))
+            conn.commit()
+        finally:
+            conn.close()
+    return digest
+
+def get(word):
+    """
+    The cached raw response for a word, or None.
+    """
+    with _lock:
+        conn = _connect()
+        try:
+            row = conn.execute('SELECT digest FROM headwords WHERE headword = ?', (normalize_headword(word),)).fetchone()
+        finally:
+            conn.close()
+    if row is None:
+        return None
+    try:
+        with gzip.open(_object_path(row[0]), 'rb') as f:
+            return json.loads(f.read())
+    except (OSError, ValueError) as e:
+        logger.warning(f"Cached response for {word} is unreadable, it will be fetched again: {e}")
+        return None
+
+def cached_headwords():
+    """
+    Set of normalized headwords with a cached response.
+    """
+    if not os.path.exists(os.path.join(CACHE_DIR, 'index.db')):
+        return set()
+    with _lock:
+        conn = _connect()
+        try:
+            return {row[0] for row in conn.execute('SELECT headword FROM headwords')}
+        finally:
+            conn.close()
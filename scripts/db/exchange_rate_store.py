@@ -0,0 +1,77 @@
+# scripts/db/exchange_rate_store.py
+
+import os
+import sys
+import sqlite3
+import threading
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+
+# Initialize logger
+logger = get_logger('exchange_rate_store')
+
+# Local history of daily USD-based rates
+STORE_PATH = os.getenv('EXCHANGE_RATE_STORE', os.path.join(project_root, 'data', 'exchange_rates', 'rates.db'))
+
+create_rates_table = '''
+CREATE TABLE IF NOT EXISTS usd_rates (
+    rate_date TEXT NOT NULL,
+    currency TEXT NOT NULL,
+    rate REAL NOT NULL,
+    PRIMARY KEY (rate_date, currency)
+);
+'''
+
+_lock = threading.Lock()
+
+def _connect(path=STORE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(create_rates_table)
+    return conn
+
+def save_rates(rate_date, rates, path=STORE_PATH):
+    """
+    Stores USD-based rates ({currency: units per USD}) for a YYYY-MM-DD date, replacing any existing values.
+    """
+    rows = [(rate_date, currency, float(rate)) for currency, rate in rates.items() if rate is not None]
+    with _lock:
+        conn = _connect(path)
+        try:
+            conn.executemany('INSERT OR REPLACE INTO usd_rates (rate_date, currency, rate) VALUES (?, ?, ?)', rows)
+            conn.commit()
+        finally:
+            conn.close()
+    logger.info(f"Stored {len(rows)} USD rates for {rate_date}")
+
+def load_rates(rate_date, path=STORE_PATH):
+    """
+    Returns {currency: rate} stored for a date, or None when the date is missing.
+    """
+    if not os.path.exists(path):
+        return None
+    with _lock:
+        conn = _connect(path)
+        try:
+            rows = conn.execute('SELECT currency, rate FROM usd_rates WHERE rate_date = ?', (rate_date,)).fetchall()
+        finally:
+            conn.close()
+    return dict(rows) if rows else None
+
+def stored_dates(path=STORE_PATH):
+    """
+    Lists the dates with stored rates, newest first.
+    """
+    if not os.path.exists(path):
+        return []
+    with _lock:
+        conn = _connect(path)
+        try:
+            rows = conn.execute('SELECT DISTINCT rate_date FROM usd_rates ORDER BY rate_date DESC').fetchall()
+        finally:
+            conn.close()
+    return [row[0] for row in rows]
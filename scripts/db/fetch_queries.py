@@ -11,7 +11,9 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
-from scripts.utils.db_connection import get_db_connection, close_connection
+from scripts.utils.db_connection import get_db_connection, close_connection, READ
+from scripts.utils.query_profiler import QueryProfile
+from scripts.db.weather_latest import weather_latest_query
 
 # Initialize logger
 logger = get_logger('fetch_queries')
@@ -21,18 +23,21 @@ def execute_query(query):
     Executes a given SQL query and returns the result as a pandas DataFrame.
     """
     conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
-        cursor.execute(query)
-        data = cursor.fetchall()
-        return pd.DataFrame(data)
-    except Exception as e:
-        logger.error(f"Error executing query: {e}")
-        return pd.DataFrame()
-    finally:
-        if conn:
-            close_connection(conn)
+    with QueryProfile('execute_query', query) as profile:
+        try:
+            conn = get_db_connection(READ)
+            profile.connection_acquired()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(query)
+            data = cursor.fetchall()
+            profile.set_result(rows=data)
+            return pd.DataFrame(data)
+        except Exception as e:
+            logger.error(f"Error executing query: {e}")
+            return pd.DataFrame()
+        finally:
+            if conn:
+                close_connection(conn)
 
 def parse_json_columns(df, json_columns):
     """
@@ -77,18 +82,9 @@ def select_random_id(table):
 
 def fetch_weather_data():
     """
-    Fetches weather API calls from the database and parses JSON columns.
+    Fetches the latest parsed forecast for every city from weather_latest.
     """
-    weather_query = '''
-    SELECT DISTINCT id, script_path, custom_params, payload, response, used_in_newsletter, created
-    FROM api_calls
-    WHERE script_path LIKE '%weather_api.py'
-    AND used_in_newsletter = 0
-    ORDER BY id DESC
-    LIMIT 2;
-    '''
-    df = execute_query(weather_query)
-    return parse_json_columns(df, ['payload', 'response'])
+    return execute_query(weather_latest_query)
 
 def fetch_exchange_rate_data():
     """
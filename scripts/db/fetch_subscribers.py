@@ -9,7 +9,8 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger
-from scripts.utils.db_connection import get_db_connection, close_connection
+from scripts.utils.db_connection import get_db_connection, close_connection, READ
+from scripts.utils.query_profiler import QueryProfile
 
 # Initialize logger
 logger = get_logger('fetch_subscribers')
@@ -23,32 +24,95 @@ WHERE is_subscribed = 1
 '''
 # AND id IN (1, 12)
 
+# SQL query to fetch the distinct subscriber locations
+subscriber_locations_query = '''
+SELECT DISTINCT TRIM(city) AS city, TRIM(country) AS country
+FROM subscribers
+WHERE is_subscribed = 1
+AND city IS NOT NULL
+AND TRIM(city) <> ''
+;
+'''
+
 def fetch_subscribers():
     """
     Fetch subscribers data from the database and return as a DataFrame.
     """
     conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+    with QueryProfile('fetch_subscribers', subscribers_query) as profile:
+        try:
+            conn = get_db_connection(READ)
+            profile.connection_acquired()
+            cursor = conn.cursor(dictionary=True)
 
-        # Execute the SQL query
-        cursor.execute(subscribers_query)
-        subscribers = cursor.fetchall()  # Fetch all rows from the query result
+            # Execute the SQL query
+            cursor.execute(subscribers_query)
+            subscribers = cursor.fetchall()  # Fetch all rows from the query result
+            profile.set_result(rows=subscribers)
 
-        logger.info(f"Fetched and processed {len(subscribers)} subscribers")
+            logger.info(f"Fetched and processed {len(subscribers)} subscribers")
 
-        # Convert the result into a pandas DataFrame
-        subscribers_df = pd.DataFrame(subscribers)
-        return subscribers_df
+            # Convert the result into a pandas DataFrame
+            subscribers_df = pd.DataFrame(subscribers)
+            return subscribers_df
 
-    except Exception as e:
-        logger.error(f"Error fetching data: {e}")
-        return None
+        except Exception as e:
+            logger.error(f"Error fetching data: {e}")
+            return None
+
+        finally:
+            if conn:
+                close_connection(conn)
+
+def normalize_place_name(name):
+    """
+    Collapses whitespace and title-cases a city or country name.
+    """
+    if not isinstance(name, str):
+        return ''
+    return ' '.join(name.split()).title()
+
+def location_key(city, country=None):
+    """
+    Case- and whitespace-insensitive key identifying a subscriber location.
+    """
+    return (normalize_place_name(city).casefold(), normalize_place_name(country).casefold())
+
+def fetch_subscriber_locations():
+    """
+    Fetch the deduplicated, normalized city/country pairs of active subscribers.
+    Returns a list of dicts with city, country and the location string sent to the weather API.
+    """
+    conn = None
+    with QueryProfile('fetch_subscriber_locations', subscriber_locations_query) as profile:
+        try:
+            conn = get_db_connection(READ)
+            profile.connection_acquired()
+            cursor = conn.cursor(dictionary=True)
+            cursor.execute(subscriber_locations_query)
+            rows = cursor.fetchall()
+            profile.set_result(rows=rows)
+        except Exception as e:
+            logger.error(f"Error fetching subscriber locations: {e}")
+            return []
+        finally:
+            if conn:
+                close_connection(conn)
+
+    locations = {}
+    for row in rows:
+        city = normalize_place_name(row['city'])
+        country = normalize_place_name(row.get('country'))
+        key = location_key(city, country)
+        if key not in locations:
+            locations[key] = {
+                'city': city,
+                'country': country,
+                'location': f"{city}, {country}" if country else city
+            }
 
-    finally:
-        if conn:
-            close_connection(conn)
+    logger.info(f"Found {len(locations)} distinct subscriber locations")
+    return sorted(locations.values(), key=lambda loc: loc['location'])
 
 def process_subscribers_data():
     """
@@ -0,0 +1,141 @@
+# scripts/db/weather_latest.py
+
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger
+from scripts.utils.db_connection import get_db_connection, close_connection, WRITE
+from scripts.utils.query_profiler import QueryProfile
+from scripts.db.fetch_subscribers import location_key, normalize_place_name
+
+# Initialize logger
+logger = get_logger('weather_latest')
+
+# Daily values stored per city, named as in the Tomorrow.io daily timeline
+WEATHER_VALUE_COLUMNS = [
+    'temperatureAvg', 'temperatureApparentAvg', 'humidityAvg', 'dewPointAvg',
+    'windSpeedAvg', 'windGustAvg', 'windDirectionAvg', 'cloudBaseAvg', 'cloudCeilingAvg',
+    'cloudCoverAvg', 'visibilityAvg', 'pressureSurfaceLevelAvg', 'precipitationProbabilityAvg',
+    'rainIntensityAvg', 'snowIntensityAvg', 'sleetIntensityAvg', 'freezingRainIntensityAvg',
+    'uvIndexMax', 'uvHealthConcernMax', 'weatherCodeMax'
+]
+WEATHER_TIME_COLUMNS = ['sunriseTime', 'sunsetTime']
+
+create_weather_latest_query = f'''
+CREATE TABLE IF NOT EXISTS weather_latest (
+    location_key VARCHAR(255) NOT NULL PRIMARY KEY,
+    city VARCHAR(128) NOT NULL,
+    country VARCHAR(128) NOT NULL DEFAULT '',
+    location_name VARCHAR(255),
+    forecast_date DATE,
+    {', '.join(f'{col} DOUBLE NULL' for col in WEATHER_VALUE_COLUMNS)},
+    {', '.join(f'{col} VARCHAR(32) NULL' for col in WEATHER_TIME_COLUMNS)},
+    updated TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+'''
+
+_upsert_columns = ['location_key', 'city', 'country', 'location_name', 'forecast_date'] + WEATHER_VALUE_COLUMNS + WEATHER_TIME_COLUMNS
+
+upsert_weather_latest_query = f'''
+INSERT INTO weather_latest ({', '.join(_upsert_columns)})
+VALUES ({', '.join(['%s'] * len(_upsert_columns))})
+ON DUPLICATE KEY UPDATE {', '.join(f'{col} = VALUES({col})' for col in _upsert_columns[1:])}
+'''
+
+weather_latest_query = f'''
+SELECT location_key, city, country, location_name, forecast_date,
+       {', '.join(WEATHER_VALUE_COLUMNS + WEATHER_TIME_COLUMNS)}, updated
+FROM weather_latest;
+'''
+
+_table_ready = False
+
+def split_location(location):
+    """
+    Splits 'City, Country' into normalized (city, country); country may be empty.
+    """
+    city, _, country = location.rpartition(',') if ',' in location else (location, '', '')
+    return normalize_place_name(city), normalize_place_name(country)
+
+def make_location_key(city, country=None):
+    return '|'.join(location_key(city, country))
+
+def parse_daily_forecast(weather_data):
+    """
+    Extracts today's daily values from a Tomorrow.io forecast response.
+    """
+    daily = weather_data.get('timelines', {}).get('daily') or []
+    if not daily:
+        raise ValueError("Forecast response has no daily timeline")
+    today = daily[0]
+    values = today.get('values', {})
+    parsed = {col: values.get(col) for col in WEATHER_VALUE_COLUMNS + WEATHER_TIME_COLUMNS}
+    parsed['forecast_date'] = (today.get('time') or '')[:10] or None
+    parsed['location_name'] = weather_data.get('location', {}).get('name')
+    return parsed
+
+def ensure_weather_latest_table(conn):
+    global _table_ready
+    if _table_ready:
+        return
+    cursor = conn.cursor()
+    try:
+        cursor.execute(create_weather_latest_query)
+        conn.commit()
+        _table_ready = True
+    finally:
+        cursor.close()
+
+def upsert_weather_latest(city, country, weather_data):
+    """
+    Stores the parsed daily forecast as the current weather for a city.
+    """
+    parsed = parse_daily_forecast(weather_data)
+    row = dict(parsed, location_key=make_location_key(city, country), city=city, country=country or '')
+    params = tuple(row[col] for col in _upsert_columns)
+
+    conn = None
+    cursor = None
+    with QueryProfile('upsert_weather_latest', upsert_weather_latest_query, params) as profile:
+        try:
+            conn = get_db_connection(WRITE)
+            profile.connection_acquired()
+            ensure_weather_latest_table(conn)
+            cursor = conn.cursor()
+            cursor.execute(upsert_weather_latest_query, params)
+            conn.commit()
+            profile.set_result(rowcount=cursor.rowcount)
+            logger.info(f"Updated latest weather for {city}")
+        except Exception as e:
+            logger.error(f"Failed to update latest weather for {city}: {e}")
+            if conn:
+                conn.rollback()
+        finally:
+            if cursor:
+                cursor.close()
+            if conn:
+                close_connection(conn)
+
+def index_weather_by_location(weather_df):
+    """
+    Builds a location_key -> values dict, dropping missing values so callers can default them.
+    Rows are also indexed by city alone for subscribers without a country.
+    """
+    index = {}
+    if weather_df is None or weather_df.empty:
+        return index
+    for row in weather_df.to_dict('records'):
+        values = {k: v for k, v in row.items() if v is not None and v == v}  # v == v drops NaN
+        index[row['location_key']] = values
+        index.setdefault(make_location_key(row['city']), values)
+    return index
+
+def lookup_weather(weather_index, city, country=None):
+    """
+    Returns the latest values for a subscriber's city, or an empty dict.
+    """
+    return weather_index.get(make_location_key(city, country)) or weather_index.get(make_location_key(city)) or {}
@@ -0,0 +1,334 @@
+# scripts/utils/asset_mirror.py
+
+import os
+import sys
+import io
+import re
+import posixpath
+import sqlite3
+import hashlib
+import argparse
+import mimetypes
+import threading
+from datetime import datetime
+from urllib.parse import unquote
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+from scripts.utils import http_client # noqa: E402
+
+try:
+    from PIL import Image
+except ImportError:  # Variants are skipped without Pillow; originals are still mirrored
+    Image = None
+
+# Initialize logger
+logger = get_logger('asset_mirror')
+
+# Mirrored images live here and are served from ASSET_BASE_URL (e.g. https://cdn.example.com/assets).
+# Without ASSET_BASE_URL rendered emails keep the original third-party URLs.
+ASSET_DIR = os.getenv('ASSET_DIR', os.path.join(project_root, 'data', 'assets'))
+ASSET_BASE_URL = os.getenv('ASSET_BASE_URL', '').rstrip('/')
+# Variants are generated at this multiple of the rendered size so they stay sharp on high-DPI screens
+VARIANT_SCALE = float(os.getenv('ASSET_VARIANT_SCALE', 2))
+JPEG_QUALITY = int(os.getenv('ASSET_JPEG_QUALITY', 82))
+CACHE_MAX_AGE = 365 * 24 * 3600
+# Only image files are served; the manifest next to them is not
+SERVED_DIRS = ('objects', 'variants')
+
+create_tables = '''
+CREATE TABLE IF NOT EXISTS assets (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    path TEXT NOT NULL,
+    content_type TEXT,
+    fetched_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS variants (
+    digest TEXT NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (digest, width, height)
+);
+'''
+
+_img_tag = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+# The lookbehind keeps data-src=, data-width= and the like from matching
+_src_attr = re.compile(r'''(?<![\w-])src=(?:"([^"]*)"|'([^']*)'|([^\s>"']+))''', re.IGNORECASE)
+_width_attr = re.compile(r'''(?<![\w-])width=["']?(\d+)''', re.IGNORECASE)
+_height_attr = re.compile(r'''(?<![\w-])height=["']?(\d+)''', re.IGNORECASE)
+_style_attr = re.compile(r'''(?<![\w-])style=(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+_width_style = re.compile(r'(?<![\w-])width\s*:\s*(\d+)px', re.IGNORECASE)
+_height_style = re.compile(r'(?<![\w-])height\s*:\s*(\d+)px', re.IGNORECASE)
+
+# _lock guards the URL map, the failed set and the per-URL locks; downloads only hold their URL's lock
+_lock = threading.Lock()
+_url_locks = {}
+_failed = set()
+_url_map = None
+
+def _connect():
+    os.makedirs(ASSET_DIR, exist_ok=True)
+    conn = sqlite3.connect(os.path.join(ASSET_DIR, 'manifest.db'))
+    conn.executescript(create_tables)
+    return conn
+
+def _extension(content_type, url):
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    ext = mimetypes.guess_extension(content_type) if content_type else None
+    if not ext:
+        ext = os.path.splitext(url.split('?')[0])[1].lower() or '.bin'
+    return '.jpg' if ext in ('.jpe', '.jpeg') else ext
+
+def _write(relative_path, body):
+    path = os.path.join(ASSET_DIR, relative_path)
+    if not os.path.exists(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+def mirror(url, conn=None):
+    """
+    Downloads an image into the content-addressed store (objects/<aa>/<sha256><ext>)
+    and records it in the manifest. Already mirrored URLs are not fetched again.
+    Returns (digest, relative path).
+    """
+    own_conn = conn is None
+    conn = conn or _connect()
+    try:
+        row = conn.execute('SELECT digest, path FROM assets WHERE url = ?', (url,)).fetchone()
+        if row:
+            return row
+        response = http_client.get(url, use_cache=False)
+        response.raise_for_status()
+        body = response.content
+        content_type = response.headers.get('Content-Type', '')
+        if not content_type.startswith('image/'):
+            raise ValueError(f"{url} is not an image ({content_type or 'no content type'})")
+        digest = hashlib.sha256(body).hexdigest()
+        relative_path = f"objects/{digest[:2]}/{digest}{_extension(content_type, url)}"
+        _write(relative_path, body)
+        conn.execute('INSERT OR REPLACE INTO assets (url, digest, path, content_type, fetched_at) VALUES (?, ?, ?, ?, ?)',
+                     (url, digest, relative_path, content_type, datetime.now().isoformat(timespec='seconds')))
+        conn.commit()
+        logger.info(f"Mirrored {url} ({len(body) / 1024:.1f} KB) as {relative_path}")
+        return digest, relative_path
+    finally:
+        if own_conn:
+            conn.close()
+
+def _encode_variant(source_path, width, height):
+    """
+    Resized and recompressed bytes for a width x height slot, or None when the
+    original should be served as is (no Pillow, animations, vectors, or no saving).
+    """
+    if Image is None:
+        return None
+    with Image.open(source_path) as image:
+        if getattr(image, 'n_frames', 1) > 1:
+            return None
+        source_format = image.format
+        box = (max(1, round(width * VARIANT_SCALE)), max(1, round(height * VARIANT_SCALE)))
+        image.thumbnail(box, Image.LANCZOS)
+        buffer = io.BytesIO()
+        if source_format == 'JPEG' or (image.mode == 'RGB' and source_format != 'PNG'):
+            image.convert('RGB').save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True, progressive=True)
+        else:
+            image.save(buffer, 'PNG', optimize=True)
+    body = buffer.getvalue()
+    return body if body and len(body) < os.path.getsize(source_path) else None
+
+def variant(digest, relative_path, width, height, conn):
+    """
+    Relative path of the variant for the rendered size, created on first request.
+    Falls back to the original when no smaller variant can be made.
+    """
+    row = conn.execute('SELECT path FROM variants WHERE digest = ? AND width = ? AND height = ?',
+                       (digest, width, height)).fetchone()
+    if row:
+        return row[0]
+    try:
+        body = _encode_variant(os.path.join(ASSET_DIR, relative_path), width, height)
+    except Exception as e:
+        logger.warning(f"Could not create a {width}x{height} variant of {relative_path}: {e}")
+        body = None
+    if body is None:
+        variant_path = relative_path
+    else:
+        ext = '.jpg' if body[:2] == b'\xff\xd8' else '.png'
+        variant_path = f"variants/{digest[:2]}/{digest}_{width}x{height}{ext}"
+        _write(variant_path, body)
+        logger.info(f"Created {variant_path} ({len(body) / 1024:.1f} KB)")
+    conn.execute('INSERT OR REPLACE INTO variants (digest, width, height, path) VALUES (?, ?, ?, ?)',
+                 (digest, width, height, variant_path))
+    conn.commit()
+    return variant_path
+
+def _load_url_map(conn):
+    """
+    {(url, width, height): relative path} for every variant in the manifest, plus
+    {(url, None, None): original path}.
+    """
+    url_map = {}
+    for url, path in conn.execute('SELECT url, path FROM assets'):
+        url_map[(url, None, None)] = path
+    for url, width, height, path in conn.execute(
+        'SELECT a.url, v.width, v.height, v.path FROM variants v JOIN assets a ON a.digest = v.digest'
+    ):
+        url_map[(url, width, height)] = path
+    return url_map
+
+def asset_url(url, width=None, height=None, mirror_missing=True):
+    """
+    Our own URL for a third-party image at the given rendered size. Unknown images are
+    mirrored on first use; anything that fails keeps its original URL for the rest of the run.
+    """
+    global _url_map
+    if not ASSET_BASE_URL or not url or not url.startswith(('http://', 'https://')) or url.startswith(ASSET_BASE_URL):
+        return url
+    key = (url, width, height)
+    with _lock:
+        if _url_map is None:
+            conn = _connect()
+            try:
+                _url_map = _load_url_map(conn)
+            finally:
+                conn.close()
+        path = _url_map.get(key)
+        if path is not None or not mirror_missing or url in _failed:
+            return f"{ASSET_BASE_URL}/{path}" if path else url
+        url_lock = _url_locks.setdefault(url, threading.Lock())
+
+    with url_lock:
+        # Another render may have mirrored it while this one waited
+        with _lock:
+            path = _url_map.get(key)
+            failed = url in _failed
+        if path is None and not failed:
+            conn = _connect()
+            try:
+                digest, original_path = mirror(url, conn)
+                path = variant(digest, original_path, width, height, conn) if width and height else original_path
+                with _lock:
+                    _url_map[key] = path
+            except Exception as e:
+                logger.warning(f"Could not mirror {url}, keeping the original URL: {e}")
+                with _lock:
+                    _failed.add(url)
+            finally:
+                conn.close()
+    return f"{ASSET_BASE_URL}/{path}" if path else url
+
+def _dimension(tag, style, style_re, attr_re):
+    # A px size in the inline style wins, as it does in the browser; otherwise the HTML attribute
+    match = (style_re.search(style) if style else None) or attr_re.search(tag)
+    return int(match.group(1)) if match else None
+
+def _rewrite_tag(match):
+    tag = match.group(0)
+    src = _src_attr.search(tag)
+    if not src:
+        return tag
+    url = next(group for group in src.groups() if group is not None)
+    style = _style_attr.search(tag)
+    style = next((group for group in style.groups() if group is not None), '') if style else ''
+    width = _dimension(tag, style, _width_style, _width_attr)
+    height = _dimension(tag, style, _height_style, _height_attr)
+    new_url = asset_url(url, width, height)
+    if new_url == url:
+        return tag
+    return f'{tag[:src.start()]}src="{new_url}"{tag[src.end():]}'
+
+def rewrite_html(html):
+    """
+    Points every <img> in rendered HTML at the mirrored variant for its width and height,
+    read from the inline style or the width/height attributes.
+    Returns the HTML unchanged when ASSET_BASE_URL is not set.
+    """
+    if not ASSET_BASE_URL:
+        return html
+    return _img_tag.sub(_rewrite_tag, html)
+
+def warm(template_path):
+    """
+    Mirrors every literal image URL in a template so the first render does no downloads.
+    """
+    with open(template_path, 'r', encoding='utf-8') as f:
+        rewrite_html(f.read())
+
+class AssetRequestHandler(SimpleHTTPRequestHandler):
+    """
+    Serves the asset store for development. Files are content-addressed, so they are
+    marked immutable; the digest doubles as the ETag and If-None-Match gets a 304.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=ASSET_DIR, **kwargs)
+
+    def send_head(self):
+        path = self.path.split('?')[0]
+        if path.startswith('/assets/'):
+            self.path = path = path[len('/assets'):]
+        if posixpath.normpath(unquote(path)).lstrip('/').split('/')[0] not in SERVED_DIRS:
+            self.send_error(404)
+            return None
+        etag = f'"{os.path.splitext(os.path.basename(self.path))[0]}"'
+        if self.headers.get('If-None-Match') == etag and os.path.isfile(self.translate_path(self.path)):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', f'public, max-age={CACHE_MAX_AGE}, immutable')
+            self.end_headers()
+            return None
+        self._etag = etag if os.path.isfile(self.translate_path(self.path)) else None
+        return super().send_head()
+
+    def list_directory(self, path):
+        self.send_error(404)
+        return None
+
+    def end_headers(self):
+        etag = getattr(self, '_etag', None)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', f'public, max-age={CACHE_MAX_AGE}, immutable')
+            self._etag = None
+        super().end_headers()
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+def serve(port):
+    server = ThreadingHTTPServer(('localhost', port), AssetRequestHandler)
+    logger.info(f"Serving {ASSET_DIR} at http://localhost:{port}/assets/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Mirror template images and serve them for development")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    warm_parser = subparsers.add_parser('warm', help="mirror every image URL found in a template")
+    warm_parser.add_argument('template', nargs='?', default=os.path.join(project_root, 'templates', 'template.html'))
+    serve_parser = subparsers.add_parser('serve', help="serve the asset store with cache headers")
+    serve_parser.add_argument('--port', type=int, default=8001)
+    args = parser.parse_args()
+
+    if args.command == 'warm':
+        if not ASSET_BASE_URL:
+            parser.error("set ASSET_BASE_URL first, e.g. ASSET_BASE_URL=http://localhost:8001/assets")
+        warm(args.template)
+    else:
+        serve(args.port)
+
+if __name__ == "__main__":
+    main()
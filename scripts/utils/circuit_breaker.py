@@ -0,0 +1,216 @@
+# scripts/utils/circuit_breaker.py
+
+import os
+import re
+import atexit
+import sys
+import json
+import threading
+import time
+from collections import deque
+import requests
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+
+# Initialize logger
+logger = get_logger('circuit_breaker')
+
+# Breaker settings, shared by every provider
+BREAKER_WINDOW = int(os.getenv('BREAKER_WINDOW', 20))
+BREAKER_MIN_CALLS = int(os.getenv('BREAKER_MIN_CALLS', 5))
+BREAKER_HEALTH_THRESHOLD = float(os.getenv('BREAKER_HEALTH_THRESHOLD', 0.5))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', 3))
+BREAKER_OPEN_SECONDS = float(os.getenv('BREAKER_OPEN_SECONDS', 60))
+BREAKER_MAX_OPEN_SECONDS = float(os.getenv('BREAKER_MAX_OPEN_SECONDS', 900))
+BREAKER_SLOW_CALL_SECONDS = float(os.getenv('BREAKER_SLOW_CALL_SECONDS', 10))
+# Breaker state is saved here when a breaker opens or closes and at exit, so a provider that
+# failed in the last cron run is still open (or probed once) in the next one instead of starting closed
+BREAKER_STATE_DIR = os.getenv('BREAKER_STATE_DIR', os.path.join(project_root, 'data', 'circuit_breakers'))
+
+_unsafe_chars = re.compile(r'[^\w.-]')
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised when a call is refused because the provider's breaker is open and
+    there is no earlier response to fall back to. Fetchers that already catch
+    RequestException handle it like any other failed request.
+    """
+
+class CircuitBreaker:
+    """
+    Tracks one provider's recent calls and stops sending it traffic while it is unhealthy.
+
+    Health is the mean score of the last BREAKER_WINDOW calls: 1 for a success,
+    0.5 for a success slower than BREAKER_SLOW_CALL_SECONDS, 0 for a failure.
+    The breaker opens when health drops below BREAKER_HEALTH_THRESHOLD or after
+    BREAKER_FAILURE_THRESHOLD consecutive failures. Once the open period passes,
+    one probe call is let through: success closes the breaker, failure reopens it
+    for twice as long (up to BREAKER_MAX_OPEN_SECONDS).
+    State is loaded from BREAKER_STATE_DIR and saved there on every state change
+    and at exit (see save_breakers).
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.state = CLOSED
+        self.scores = deque(maxlen=BREAKER_WINDOW)
+        self.consecutive_failures = 0
+        self.open_seconds = BREAKER_OPEN_SECONDS
+        self.opened_at = None
+        self.probe_in_flight = False
+        self.dirty = False
+        self.lock = threading.Lock()
+        self._load()
+
+    @property
+    def path(self):
+        return os.path.join(BREAKER_STATE_DIR, f"{_unsafe_chars.sub('_', self.name)}.json")
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read saved circuit state for {self.name}: {e}")
+            return
+        # A probe left half-open by an earlier process never reported back
+        self.state = OPEN if saved.get('state') in (OPEN, HALF_OPEN) else CLOSED
+        self.scores.extend(saved.get('scores', []))
+        self.consecutive_failures = saved.get('consecutive_failures', 0)
+        self.open_seconds = saved.get('open_seconds', BREAKER_OPEN_SECONDS)
+        self.opened_at = saved.get('opened_at') if self.state == OPEN else None
+        if self.state == OPEN and self.opened_at is None:
+            self.state = CLOSED
+        if self.state == OPEN:
+            logger.info(f"Circuit for {self.name} is still open from an earlier run")
+
+    def _save(self):
+        # Called with self.lock held
+        state = {'state': self.state, 'scores': list(self.scores), 'consecutive_failures': self.consecutive_failures,
+                 'open_seconds': self.open_seconds, 'opened_at': self.opened_at}
+        try:
+            os.makedirs(BREAKER_STATE_DIR, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            logger.warning(f"Could not save circuit state for {self.name}: {e}")
+
+    @property
+    def health(self):
+        return sum(self.scores) / len(self.scores) if self.scores else 1.0
+
+    def allow(self):
+        """
+        True if a call may go out now. In half-open state only one probe is allowed at a time.
+        """
+        with self.lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() - self.opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                logger.info(f"Circuit for {self.name} half-open, sending a probe")
+            if self.state == HALF_OPEN and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self, duration=0.0):
+        with self.lock:
+            self.scores.append(0.5 if duration >= BREAKER_SLOW_CALL_SECONDS else 1.0)
+            self.consecutive_failures = 0
+            if self.state != CLOSED:
+                logger.info(f"Circuit for {self.name} closed after a successful probe")
+                self.state = CLOSED
+                self.scores.clear()
+                self.open_seconds = BREAKER_OPEN_SECONDS
+                self._save()
+            else:
+                self.dirty = True
+            self.probe_in_flight = False
+
+    def record_failure(self, reason=None):
+        with self.lock:
+            self.scores.append(0.0)
+            self.consecutive_failures += 1
+            if self.state == HALF_OPEN:
+                self.open_seconds = min(BREAKER_MAX_OPEN_SECONDS, self.open_seconds * 2)
+                self._open(f"probe failed: {reason}")
+            elif self.state == CLOSED and (
+                self.consecutive_failures >= BREAKER_FAILURE_THRESHOLD
+                or (len(self.scores) >= BREAKER_MIN_CALLS and self.health < BREAKER_HEALTH_THRESHOLD)
+            ):
+                self._open(reason)
+            else:
+                self.dirty = True
+            self.probe_in_flight = False
+
+    def release_probe(self):
+        """
+        Lets the next call probe again when a probe ended without recording a result
+        (an exception other than a request error).
+        """
+        with self.lock:
+            self.probe_in_flight = False
+
+    def _open(self, reason):
+        self.state = OPEN
+        self.opened_at = time.time()
+        logger.warning(f"Circuit for {self.name} opened for {self.open_seconds:.0f}s "
+                       f"(health {self.health:.2f}, {self.consecutive_failures} consecutive failures): {reason}")
+        self._save()
+
+    def snapshot(self):
+        return {'name': self.name, 'state': self.state, 'health': round(self.health, 2),
+                'calls': len(self.scores), 'consecutive_failures': self.consecutive_failures}
+
+_breakers = {}
+_registry_lock = threading.Lock()
+
+def get_breaker(name):
+    """
+    The breaker for a provider, created on first use.
+    """
+    with _registry_lock:
+        if name not in _breakers:
+            _breakers[name] = CircuitBreaker(name)
+        return _breakers[name]
+
+def save_breakers():
+    """
+    Saves every breaker with calls recorded since its last save; registered to run at exit.
+    """
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        with breaker.lock:
+            if breaker.dirty:
+                breaker._save()
+
+atexit.register(save_breakers)
+
+def breaker_states():
+    with _registry_lock:
+        return [breaker.snapshot() for breaker in _breakers.values()]
+
+def log_breaker_states():
+    """
+    Logs one line per provider seen in this run.
+    """
+    states = breaker_states()
+    if states:
+        logger.info("Provider health:\n" + '\n'.join(
+            f"{s['name']:<40} {s['state']:<10} health {s['health']:.2f} over {s['calls']} calls" for s in states
+        ))
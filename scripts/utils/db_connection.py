@@ -1,5 +1,6 @@
 import sys
 import os
+import threading
 from mysql.connector import Error, pooling
 from dotenv import load_dotenv
 
@@ -24,22 +25,56 @@ DB_CONFIG = {
     "database": os.getenv("MYSQL_DB")
 }
 
-# Initialize the connection pool
-try:
-    connection_pool = pooling.MySQLConnectionPool(
-        pool_name="mypool",
-        pool_size=5,
-        pool_reset_session=True,
-        **DB_CONFIG
-    )
-    logger.info("Connection pool created successfully")
-except Error as e:
-    logger.error(f"Error creating connection pool: {e}")
-    raise
+# Reader configuration, falling back to the writer settings so a single
+# database keeps working until a replica is configured
+READER_DB_CONFIG = {
+    "host": os.getenv("MYSQL_READER_HOST", DB_CONFIG["host"]),
+    "port": int(os.getenv("MYSQL_READER_PORT", DB_CONFIG["port"])),
+    "user": os.getenv("MYSQL_READER_USER", DB_CONFIG["user"]),
+    "password": os.getenv("MYSQL_READER_PASSWORD", DB_CONFIG["password"]),
+    "database": os.getenv("MYSQL_READER_DB", DB_CONFIG["database"])
+}
+
+READ = 'read'
+WRITE = 'write'
+
+POOL_SETTINGS = {
+    READ: {"pool_name": "reader_pool", "pool_size": int(os.getenv("MYSQL_READER_POOL_SIZE", 5)), "config": READER_DB_CONFIG},
+    WRITE: {"pool_name": "writer_pool", "pool_size": int(os.getenv("MYSQL_WRITER_POOL_SIZE", 5)), "config": DB_CONFIG}
+}
+
+# The connection pools are created on first use, so importing this module
+# never requires a reachable database
+connection_pools = {}
+_pool_lock = threading.Lock()
 
-def get_db_connection():
+def get_connection_pool(role=WRITE):
     """
-    Get a connection from the pool.
+    Return the reader or writer pool, creating it on first call.
+    """
+    if role not in connection_pools:
+        with _pool_lock:
+            if role not in connection_pools:
+                settings = POOL_SETTINGS[role]
+                try:
+                    connection_pools[role] = pooling.MySQLConnectionPool(
+                        pool_name=settings["pool_name"],
+                        pool_size=settings["pool_size"],
+                        pool_reset_session=True,
+                        **settings["config"]
+                    )
+                    logger.info(f"Connection pool {settings['pool_name']} created successfully")
+                except Error as e:
+                    logger.error(f"Error creating connection pool {settings['pool_name']}: {e}")
+                    raise
+    return connection_pools[role]
+
+def get_db_connection(role=WRITE):
+    """
+    Get a connection from the reader or writer pool.
+
+    Args:
+        role (str, optional): READ for queries that only read, WRITE (the default) otherwise.
     
     Returns:
         mysql.connector.connection.MySQLConnection: A database connection object
@@ -48,11 +83,11 @@ def get_db_connection():
         Error: If unable to get a connection from the pool
     """
     try:
-        connection = connection_pool.get_connection()
-        logger.debug("Successfully acquired a connection from the pool")
+        connection = get_connection_pool(role).get_connection()
+        logger.debug(f"Successfully acquired a {role} connection from the pool")
         return connection
     except Error as e:
-        logger.error(f"Error getting connection from pool: {e}")
+        logger.error(f"Error getting {role} connection from pool: {e}")
         raise
 
 def close_connection(connection):
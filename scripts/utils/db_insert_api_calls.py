@@ -8,51 +8,101 @@ project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..
 sys.path.insert(0, project_root)
 
 from scripts.utils.logger_config import get_logger # noqa: E402
-from scripts.utils.db_connection import get_db_connection, close_connection  # noqa: E402
+from scripts.utils.db_connection import get_db_connection, close_connection, WRITE  # noqa: E402
+from scripts.utils.query_profiler import QueryProfile  # noqa: E402
 
 # Initialize logger for this script
 logger = get_logger(os.path.basename(__file__))
 
 def insert_api_response(script_path, payload, response, custom_params=None):
     conn = None
-    try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        
-        # Convert payload and response to JSON strings
-        payload_json = json.dumps(payload)
-        response_json = json.dumps(response)
-        
-        # Prepare the SQL query
-        if custom_params is not None:
-            query = """
-            INSERT INTO api_calls (script_path, custom_params, payload, response) 
-            VALUES (%s, %s, %s, %s)
-            """
-            params = (script_path, custom_params, payload_json, response_json)
-        else:
-            query = """
-            INSERT INTO api_calls (script_path, payload, response) 
-            VALUES (%s, %s, %s)
-            """
-            params = (script_path, payload_json, response_json)
-
-        # Execute the query
-        cursor.execute(query, params)
-
-        # Commit the transaction
-        conn.commit()
-
-        logger.info(f"Successfully inserted data for API: {script_path}")
-
-    except Error as e:
-        logger.error(f"Failed to insert data for API {script_path}. Error: {e}")
-        if conn:
-            conn.rollback()
-    finally:
-        if cursor:
-            cursor.close()
-        close_connection(conn)
+    cursor = None
+
+    # Convert payload and response to JSON strings
+    payload_json = json.dumps(payload)
+    response_json = json.dumps(response)
+
+    # Prepare the SQL query
+    if custom_params is not None:
+        query = """
+        INSERT INTO api_calls (script_path, custom_params, payload, response) 
+        VALUES (%s, %s, %s, %s)
+        """
+        params = (script_path, custom_params, payload_json, response_json)
+    else:
+        query = """
+        INSERT INTO api_calls (script_path, payload, response) 
+        VALUES (%s, %s, %s)
+        """
+        params = (script_path, payload_json, response_json)
+
+    with QueryProfile('insert_api_response', query, params) as profile:
+        try:
+            conn = get_db_connection(WRITE)
+            profile.connection_acquired()
+            cursor = conn.cursor()
+
+            # Execute the query
+            cursor.execute(query, params)
+
+            # Commit the transaction
+            conn.commit()
+            profile.set_result(rowcount=cursor.rowcount)
+
+            logger.info(f"Successfully inserted data for API: {script_path}")
+
+        except Error as e:
+            logger.error(f"Failed to insert data for API {script_path}. Error: {e}")
+            if conn:
+                conn.rollback()
+        finally:
+            if cursor:
+                cursor.close()
+            close_connection(conn)
+
+def insert_api_responses(rows, conn=None):
+    """
+    Inserts many (script_path, payload, response, custom_params) rows with a single executemany.
+    Uses the given connection without committing it, or its own pooled connection otherwise.
+    """
+    if not rows:
+        return
+    owns_connection = conn is None
+    cursor = None
+
+    query = """
+    INSERT INTO api_calls (script_path, custom_params, payload, response)
+    VALUES (%s, %s, %s, %s)
+    """
+    params = [
+        (script_path, custom_params, json.dumps(payload), json.dumps(response))
+        for script_path, payload, response, custom_params in rows
+    ]
+
+    with QueryProfile('insert_api_responses', query, params) as profile:
+        try:
+            if owns_connection:
+                conn = get_db_connection(WRITE)
+            profile.connection_acquired()
+            cursor = conn.cursor()
+            cursor.executemany(query, params)
+
+            if owns_connection:
+                conn.commit()
+            profile.set_result(rowcount=cursor.rowcount)
+            logger.info(f"Successfully inserted {len(rows)} API responses")
+
+        except Error as e:
+            logger.error(f"Failed to insert {len(rows)} API responses. Error: {e}")
+            if owns_connection and conn:
+                conn.rollback()
+            if not owns_connection:
+                raise
+        finally:
+            if cursor:
+                cursor.close()
+            if owns_connection:
+                close_connection(conn)
 
 # Example usage
 if __name__ == "__main__":
@@ -0,0 +1,154 @@
+# scripts/utils/fetch_orchestrator.py
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+
+# Initialize logger
+logger = get_logger('fetch_orchestrator')
+
+# Default limits, overridable per call
+DEFAULT_MAX_WORKERS = int(os.getenv('FETCH_MAX_WORKERS', 8))
+DEFAULT_JOB_TIMEOUT = float(os.getenv('FETCH_JOB_TIMEOUT', 60))
+DEFAULT_DEADLINE = float(os.getenv('FETCH_DEADLINE', 180))
+
+class FetchJob:
+    """
+    One unit of fetch work: a callable plus the provider it talks to.
+    """
+
+    def __init__(self, name, func, args=(), kwargs=None, provider=None, timeout=None):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs or {}
+        self.provider = provider or name
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f"FetchJob({self.name!r}, provider={self.provider!r})"
+
+def run_jobs(jobs, deadline=DEFAULT_DEADLINE, job_timeout=DEFAULT_JOB_TIMEOUT,
+             max_workers=DEFAULT_MAX_WORKERS, provider_limits=None):
+    """
+    Runs fetch jobs concurrently and returns one result dict per job.
+
+    Each job gets its own timeout, counted from when it starts, and the whole batch
+    stops waiting at the global deadline. At most max_workers jobs run at once, and
+    provider_limits caps how many of the same provider do. Jobs wait in submission
+    order and are only handed to a thread once their provider has a free slot, so a
+    backlog for one provider never holds up another. A job past its timeout gives
+    its slot back; its thread is abandoned (its own HTTP timeouts end it). Jobs that
+    have not started by the deadline are reported as skipped.
+    """
+    if not jobs:
+        return []
+    names = [job.name for job in jobs]
+    if len(set(names)) != len(names):
+        raise ValueError("Fetch job names must be unique")
+
+    provider_limits = provider_limits or {}
+    limits = {job.provider: max(1, provider_limits.get(job.provider, max_workers)) for job in jobs}
+    running = {provider: 0 for provider in limits}
+
+    started = {}
+    results = {job.name: {'name': job.name, 'provider': job.provider, 'status': 'pending',
+                          'duration': None, 'result': None, 'error': None} for job in jobs}
+    batch_start = time.monotonic()
+    batch_deadline = batch_start + deadline
+
+    # Concurrency is limited by dispatch below; the pool only needs room for abandoned jobs
+    executor = ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix='fetch')
+    waiting = list(jobs)
+    futures = {}
+    pending = set()
+
+    def dispatch():
+        for job in list(waiting):
+            if len(pending) >= max_workers:
+                break
+            if running[job.provider] < limits[job.provider]:
+                waiting.remove(job)
+                running[job.provider] += 1
+                started[job.name] = time.monotonic()
+                future = executor.submit(job.func, *job.args, **job.kwargs)
+                futures[future] = job
+                pending.add(future)
+
+    def finish(future):
+        pending.discard(future)
+        running[futures[future].provider] -= 1
+
+    try:
+        dispatch()
+        while pending:
+            now = time.monotonic()
+
+            # Expire running jobs past their own timeout and give their slots to waiting jobs
+            for future in list(pending):
+                job = futures[future]
+                timeout = job.timeout or job_timeout
+                if not future.done() and now - started[job.name] >= timeout:
+                    finish(future)
+                    results[job.name].update(status='timeout', duration=now - started[job.name],
+                                             error=f"Timed out after {timeout:.0f}s")
+            dispatch()
+
+            if not pending:
+                break
+            if now >= batch_deadline:
+                for future in pending:
+                    job = futures[future]
+                    results[job.name].update(status='timeout', duration=now - started[job.name],
+                                             error="Global deadline reached")
+                break
+
+            # Sleep until the next completion, job expiry or the deadline
+            next_wake = batch_deadline
+            for future in pending:
+                job = futures[future]
+                next_wake = min(next_wake, started[job.name] + (job.timeout or job_timeout))
+            done, _ = wait(pending, timeout=max(0.05, next_wake - now), return_when=FIRST_COMPLETED)
+
+            for future in done:
+                job = futures[future]
+                finish(future)
+                duration = time.monotonic() - started[job.name]
+                try:
+                    results[job.name].update(status='ok', duration=duration, result=future.result())
+                except Exception as e:
+                    results[job.name].update(status='error', duration=duration, error=str(e))
+                    logger.error(f"Fetch job {job.name} failed: {e}")
+            dispatch()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    for job in waiting:
+        results[job.name].update(status='skipped', error="Global deadline reached before start")
+
+    ordered = [results[name] for name in names]
+    log_summary(ordered, time.monotonic() - batch_start)
+    return ordered
+
+def log_summary(results, wall_time):
+    """
+    Logs one line per job plus the wall time against the sequential cost.
+    """
+    lines = [f"{'job':<50} {'provider':<20} {'status':<8} {'seconds':>8}"]
+    for r in results:
+        duration = f"{r['duration']:.2f}" if r['duration'] is not None else '-'
+        lines.append(f"{r['name'][:50]:<50} {r['provider'][:20]:<20} {r['status']:<8} {duration:>8}")
+    sequential = sum(r['duration'] or 0 for r in results)
+    counts = {}
+    for r in results:
+        counts[r['status']] = counts.get(r['status'], 0) + 1
+    lines.append(f"Wall time {wall_time:.2f}s vs {sequential:.2f}s sequential; " +
+                 ', '.join(f"{status}: {count}" for status, count in sorted(counts.items())))
+    logger.info("Fetch summary:\n" + '\n'.join(lines))
@@ -0,0 +1,40 @@
+# scripts/utils/geo_clustering.py
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+
+def haversine_matrix(latitudes, longitudes):
+    """
+    Pairwise great-circle distances in km between all points.
+    """
+    lat = np.radians(np.asarray(latitudes, dtype=float))
+    lon = np.radians(np.asarray(longitudes, dtype=float))
+    dlat = lat[:, np.newaxis] - lat[np.newaxis, :]
+    dlon = lon[:, np.newaxis] - lon[np.newaxis, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, np.newaxis] * np.cos(lat)[np.newaxis, :] * np.sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+def cluster_points(latitudes, longitudes, radius_km):
+    """
+    Groups points so every member lies within radius_km of its cluster's representative.
+
+    Representatives are picked greedily, densest point first, so a metro area
+    snaps to its most central subscriber city rather than to an outlying suburb.
+    Returns a list of (representative_index, member_indices).
+    """
+    count = len(latitudes)
+    if count == 0:
+        return []
+    within = haversine_matrix(latitudes, longitudes) <= radius_km
+    unassigned = np.ones(count, dtype=bool)
+    clusters = []
+    while unassigned.any():
+        # Neighbours still unassigned, for every unassigned candidate
+        density = (within & unassigned[np.newaxis, :]).sum(axis=1)
+        density[~unassigned] = -1
+        representative = int(np.argmax(density))
+        members = np.flatnonzero(within[representative] & unassigned)
+        unassigned[members] = False
+        clusters.append((representative, members.tolist()))
+    return clusters
@@ -0,0 +1,219 @@
+# scripts/utils/http_cache.py
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import threading
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+
+# Initialize logger
+logger = get_logger('http_cache')
+
+# Cache settings
+CACHE_DIR = os.getenv('HTTP_CACHE_DIR', os.path.join(project_root, 'data', 'http_cache'))
+CACHE_MAX_BYTES = int(os.getenv('HTTP_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# Eviction frees space down to this fraction of the bound, so it runs once per ~10% of writes, not per write
+CACHE_EVICT_TARGET = float(os.getenv('HTTP_CACHE_EVICT_TARGET', 0.9))
+CACHE_DISABLED = os.getenv('HTTP_CACHE_DISABLED', '0').lower() in ('1', 'true', 'yes')
+
+# Query parameters that carry credentials and must never reach the cache key or disk
+SECRET_PARAMS = {'apikey', 'api_key', 'key', 'token', 'access_key', 'appid'}
+
+DAY = 24 * 60 * 60
+
+# Freshness per endpoint, first matching URL prefix wins. Endpoints not listed are not cached.
+# Dictionary responses are kept in scripts/db/dictionary_cache instead.
+ENDPOINT_TTLS = [
+    ('https://api.tomorrow.io/v4/weather/forecast', 60 * 60),
+    ('https://api.freecurrencyapi.com/v1/historical', 365 * DAY),  # Past rates never change
+    ('https://api.freecurrencyapi.com/v1/latest', 60 * 60),
+    ('https://newsdata.io/api/', 15 * 60),
+    ('https://newsapi.org/v2/', 15 * 60),
+    ('https://gnews.io/api/', 15 * 60),
+    ('http://api.mediastack.com/v1/', 15 * 60),
+    ('https://api.currentsapi.services/v1/', 15 * 60),
+]
+
+_evict_lock = threading.Lock()
+# Running estimate of the cache size: one directory scan per process, then bytes written are added.
+# Overwrites make it err high, which only triggers an earlier (correcting) scan.
+_size_estimate = None
+
+def ttl_for(url):
+    """
+    Returns the configured freshness in seconds for a URL, or None if it is not cacheable.
+    """
+    for prefix, ttl in ENDPOINT_TTLS:
+        if url.startswith(prefix):
+            return ttl
+    return None
+
+def strip_secrets(params):
+    """
+    Drops credential parameters so keys never end up in cache entries.
+    """
+    return {k: v for k, v in (params or {}).items() if k.lower() not in SECRET_PARAMS}
+
+def cache_key(method, url, params=None):
+    """
+    Stable key for a request, independent of parameter order and API keys.
+    """
+    normalized = sorted(
+        (k, [str(i) for i in v] if isinstance(v, (list, tuple)) else str(v))
+        for k, v in strip_secrets(params).items() if v is not None
+    )
+    raw = json.dumps([method.upper(), url, normalized], separators=(',', ':'))
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+def _paths(key):
+    return os.path.join(CACHE_DIR, f"{key}.meta.json"), os.path.join(CACHE_DIR, f"{key}.body.gz")
+
+def _write_atomic(path, data, mode='wb'):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, mode) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+class CacheEntry:
+    """
+    A stored response: metadata plus the raw body bytes.
+    """
+
+    def __init__(self, key, meta, body):
+        self.key = key
+        self.meta = meta
+        self.body = body
+
+    @property
+    def age(self):
+        return time.time() - self.meta['stored_at']
+
+    def is_fresh(self, ttl):
+        return ttl is not None and self.age < ttl
+
+    def validators(self):
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.meta['headers'].get('ETag'):
+            headers['If-None-Match'] = self.meta['headers']['ETag']
+        if self.meta['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = self.meta['headers']['Last-Modified']
+        return headers
+
+def load(key):
+    """
+    Returns the CacheEntry for a key, or None. A hit refreshes its LRU timestamp.
+    """
+    meta_path, body_path = _paths(key)
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        with gzip.open(body_path, 'rb') as f:
+            body = f.read()
+        os.utime(meta_path)
+        return CacheEntry(key, meta, body)
+    except (OSError, ValueError):
+        return None
+
+def store(key, url, params, response):
+    """
+    Saves a 200 response under key and enforces the size bound.
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    meta = {
+        'url': url,
+        'params': strip_secrets(params),
+        'status': response.status_code,
+        'stored_at': time.time(),
+        'headers': {h: response.headers[h] for h in ('Content-Type', 'ETag', 'Last-Modified') if h in response.headers},
+        'encoding': response.encoding
+    }
+    meta_path, body_path = _paths(key)
+    body = gzip.compress(response.content)
+    meta_json = json.dumps(meta)
+    try:
+        _write_atomic(body_path, body)
+        _write_atomic(meta_path, meta_json, mode='w')
+    except OSError as e:
+        logger.warning(f"Could not write cache entry for {url}: {e}")
+        return
+    _record_write(len(body) + len(meta_json))
+
+def _record_write(size):
+    """
+    Adds a write to the size estimate and only evicts when the estimate passes the bound.
+    """
+    global _size_estimate
+    with _evict_lock:
+        if _size_estimate is None:
+            _size_estimate = _scan()[1]
+        _size_estimate += size
+        over = _size_estimate > CACHE_MAX_BYTES
+    if over:
+        evict()
+
+def touch(entry):
+    """
+    Marks a revalidated (304) entry as fresh again.
+    """
+    entry.meta['stored_at'] = time.time()
+    meta_path, _ = _paths(entry.key)
+    try:
+        _write_atomic(meta_path, json.dumps(entry.meta), mode='w')
+    except OSError as e:
+        logger.warning(f"Could not refresh cache entry {entry.key}: {e}")
+
+def _scan():
+    """
+    ({key: (size, last_used)}, total bytes) for every entry on disk.
+    """
+    entries = {}
+    total = 0
+    try:
+        names = os.listdir(CACHE_DIR)
+    except OSError:
+        return entries, 0
+    for name in names:
+        if name.endswith('.tmp'):
+            continue
+        key = name.split('.', 1)[0]
+        try:
+            stat = os.stat(os.path.join(CACHE_DIR, name))
+        except OSError:
+            continue
+        size, last_used = entries.get(key, (0, 0))
+        last_used = max(last_used, stat.st_mtime) if name.endswith('.meta.json') else last_used
+        entries[key] = (size + stat.st_size, last_used)
+        total += stat.st_size
+    return entries, total
+
+def evict(max_bytes=None):
+    """
+    Deletes least recently used entries once the cache exceeds max_bytes,
+    down to CACHE_EVICT_TARGET of it.
+    """
+    global _size_estimate
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    with _evict_lock:
+        entries, total = _scan()
+        if total > max_bytes:
+            max_bytes = int(max_bytes * CACHE_EVICT_TARGET)
+            for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+                for path in _paths(key):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                if total <= max_bytes:
+                    break
+            logger.info(f"Evicted HTTP cache entries down to {total / 1024 / 1024:.1f} MB")
+        _size_estimate = total
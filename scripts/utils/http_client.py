@@ -0,0 +1,248 @@
+# scripts/utils/http_client.py
+
+import os
+import sys
+import random
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED, TimeoutError as FutureTimeout
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib.parse import urlsplit
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+from scripts.utils import http_cache # noqa: E402
+from scripts.utils.circuit_breaker import get_breaker, CircuitOpenError, HALF_OPEN # noqa: E402
+
+# Initialize logger
+logger = get_logger('http_client')
+
+# HTTP settings
+CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 5))
+READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 30))
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT)
+MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', 3))
+BACKOFF_BASE = float(os.getenv('HTTP_BACKOFF_BASE', 0.5))
+BACKOFF_MAX = float(os.getenv('HTTP_BACKOFF_MAX', 30))
+POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+HEDGE_WORKERS = int(os.getenv('HTTP_HEDGE_WORKERS', 16))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+DEFAULT_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'User-Agent': 'luca-newsletter/1.0'
+}
+
+_session = None
+_session_lock = threading.Lock()
+_hedge_executor = None
+
+def get_session():
+    """
+    Returns the shared session. Its adapters keep a keep-alive connection pool
+    per host, so repeated calls to the same provider reuse connections.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_MAXSIZE, pool_maxsize=POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update(DEFAULT_HEADERS)
+                _session = session
+    return _session
+
+def backoff_delay(attempt):
+    """
+    Full-jitter exponential backoff: uniform between 0 and base * 2^attempt, capped.
+    """
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt)))
+
+def retry_after_delay(response):
+    """
+    Seconds requested by a Retry-After header, if it holds a number.
+    """
+    value = response.headers.get('Retry-After')
+    try:
+        return min(BACKOFF_MAX, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return None
+
+def request(method, url, params=None, timeout=None, max_retries=None, **kwargs):
+    """
+    Sends a request through the shared session with default timeouts, retrying
+    connection errors, timeouts and 429/5xx responses with jittered backoff.
+
+    Returns the final response; callers still decide whether to raise_for_status().
+    """
+    timeout = timeout or DEFAULT_TIMEOUT
+    max_retries = MAX_RETRIES if max_retries is None else max_retries
+    session = get_session()
+
+    for attempt in range(max_retries + 1):
+        try:
+            response = session.request(method, url, params=params, timeout=timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff_delay(attempt)
+            logger.warning(f"{method} {url} failed ({e.__class__.__name__}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            continue
+
+        if response.status_code in RETRY_STATUSES and attempt < max_retries:
+            delay = retry_after_delay(response)
+            if delay is None:
+                delay = backoff_delay(attempt)
+            logger.warning(f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s")
+            response.close()
+            time.sleep(delay)
+            continue
+        return response
+
+def response_from_cache(entry):
+    """
+    Rebuilds a requests.Response from a cache entry; `from_cache` is set on it.
+    """
+    response = requests.Response()
+    response.status_code = entry.meta['status']
+    response._content = entry.body
+    response.headers = CaseInsensitiveDict(entry.meta['headers'])
+    response.url = entry.meta['url']
+    response.encoding = entry.meta.get('encoding')
+    response.from_cache = True
+    response.stale = False
+    return response
+
+def stale_response(entry, url, reason):
+    """
+    Last known good response for a failing provider, with `stale` set so callers can tell.
+    """
+    logger.warning(f"Serving stale response for {url} (age {entry.age / 60:.0f} min): {reason}")
+    response = response_from_cache(entry)
+    response.stale = True
+    return response
+
+def get(url, params=None, cache_ttl=None, use_cache=True, provider=None, **kwargs):
+    """
+    GET through the on-disk cache when the endpoint has a TTL (see http_cache.ENDPOINT_TTLS)
+    or cache_ttl is given. Fresh entries are served without a request; stale ones are
+    revalidated with ETag/Last-Modified and reused on 304.
+
+    Calls go through the provider's circuit breaker (provider defaults to the URL's host).
+    While it is open, or when the call fails, the last cached response is returned
+    with `stale` set; without one, the error is raised (CircuitOpenError when open).
+    """
+    ttl = cache_ttl if cache_ttl is not None else http_cache.ttl_for(url)
+    caching = use_cache and ttl is not None and not http_cache.CACHE_DISABLED
+
+    key = entry = None
+    if caching:
+        key = http_cache.cache_key('GET', url, params)
+        entry = http_cache.load(key)
+        if entry and entry.is_fresh(ttl):
+            logger.debug(f"Cache hit for {url} (age {entry.age:.0f}s)")
+            return response_from_cache(entry)
+
+    breaker = get_breaker(provider or urlsplit(url).netloc)
+    if not breaker.allow():
+        if entry:
+            return stale_response(entry, url, f"circuit for {breaker.name} is open")
+        raise CircuitOpenError(f"Circuit for {breaker.name} is open")
+    probing = breaker.state == HALF_OPEN
+    if probing:
+        # A probe should answer quickly or not at all
+        kwargs['max_retries'] = 0
+    try:
+        return _send(url, params, breaker, entry, key, caching, kwargs)
+    finally:
+        if probing:
+            # A probe that raised something other than a request error records nothing;
+            # without this the breaker would refuse every later call
+            breaker.release_probe()
+
+def _send(url, params, breaker, entry, key, caching, kwargs):
+    # The request half of get(): records the outcome on the breaker and updates the cache
+    headers = dict(kwargs.pop('headers', None) or {})
+    if entry:
+        headers.update(entry.validators())
+    started = time.monotonic()
+    try:
+        response = request('GET', url, params=params, headers=headers, **kwargs)
+    except requests.exceptions.RequestException as e:
+        breaker.record_failure(e.__class__.__name__)
+        if entry:
+            return stale_response(entry, url, str(e))
+        raise
+
+    if response.status_code in RETRY_STATUSES:
+        breaker.record_failure(f"HTTP {response.status_code}")
+        if entry:
+            response.close()
+            return stale_response(entry, url, f"HTTP {response.status_code}")
+    else:
+        breaker.record_success(time.monotonic() - started)
+
+    if response.status_code == 304 and entry:
+        logger.debug(f"Revalidated cached response for {url}")
+        http_cache.touch(entry)
+        return response_from_cache(entry)
+    if response.status_code == 200 and caching:
+        http_cache.store(key, url, params, response)
+    response.from_cache = False
+    response.stale = False
+    return response
+
+def _get_hedge_executor():
+    global _hedge_executor
+    if _hedge_executor is None:
+        with _session_lock:
+            if _hedge_executor is None:
+                _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix='hedge')
+    return _hedge_executor
+
+def _close_response(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+def hedged_get(url, params=None, hedge_after=None, **kwargs):
+    """
+    GET that sends a second, identical request when the first has not answered
+    within hedge_after seconds, and returns whichever succeeds first.
+
+    Only worth it for idempotent reads from providers with long-tail latency;
+    each hedge costs one extra request against the provider's quota.
+    """
+    if not hedge_after or hedge_after <= 0:
+        return get(url, params=params, **kwargs)
+
+    executor = _get_hedge_executor()
+    primary = executor.submit(get, url, params, **kwargs)
+    try:
+        return primary.result(timeout=hedge_after)
+    except FutureTimeout:
+        pass
+
+    logger.info(f"No response from {url} after {hedge_after:.1f}s, sending hedged request")
+    hedge = executor.submit(get, url, params, **kwargs)
+    pending = {primary, hedge}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                # The loser is left to finish in the background; release its connection when it does
+                for other in pending:
+                    other.add_done_callback(_close_response)
+                if future is hedge:
+                    logger.info(f"Hedged request to {url} answered first")
+                return future.result()
+            error = future.exception()
+    raise error
@@ -0,0 +1,137 @@
+# scripts/utils/interest_ranking.py
+
+import os
+import sys
+import re
+import zlib
+import numpy as np
+from scipy import sparse
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+from scripts.db.article_store import normalize_language, parse_interests # noqa: E402
+
+# Initialize logger
+logger = get_logger('interest_ranking')
+
+# Hashed feature space: no vocabulary to build or store, collisions are rare at this size
+HASH_FEATURES = 2 ** int(os.getenv('RANKING_HASH_BITS', 18))
+# Title words count this many times against one for description words
+TITLE_WEIGHT = 2
+# Pairs scoring below this share too little vocabulary to be worth showing
+MIN_SCORE = float(os.getenv('RANKING_MIN_SCORE', 0.05))
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'have', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'this', 'to', 'was', 'were', 'will', 'with',
+    'o', 'os', 'um', 'uma', 'de', 'da', 'do', 'das', 'dos', 'e', 'em', 'no', 'na', 'nos', 'nas', 'para', 'por', 'com'
+}
+
+_token_re = re.compile(r'\w+', re.UNICODE)
+
+def tokenize(text):
+    """
+    Lowercased words without stop words, plus adjacent-word bigrams.
+    """
+    words = [w for w in _token_re.findall((text or '').casefold()) if w not in STOP_WORDS and not w.isdigit()]
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+def _feature(token):
+    return zlib.crc32(token.encode('utf-8')) % HASH_FEATURES
+
+def hashed_counts(documents):
+    """
+    Sparse term-count matrix (documents x HASH_FEATURES) for lists of tokens.
+    """
+    rows, cols = [], []
+    for row, tokens in enumerate(documents):
+        rows.extend([row] * len(tokens))
+        cols.extend(_feature(token) for token in tokens)
+    data = np.ones(len(cols), dtype=np.float32)
+    counts = sparse.csr_matrix((data, (rows, cols)), shape=(len(documents), HASH_FEATURES), dtype=np.float32)
+    counts.sum_duplicates()
+    return counts
+
+def tfidf(counts, idf):
+    """
+    Sublinear tf times idf, each row L2-normalized so a dot product is a cosine similarity.
+    """
+    weighted = counts.copy()
+    weighted.data = 1.0 + np.log(weighted.data)
+    weighted = weighted.multiply(idf).tocsr()
+    norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms).dot(weighted).tocsr()
+
+def language_mask(subscriber_languages, article_languages):
+    """
+    Boolean subscribers x articles matrix: True where the article's language is one the
+    subscriber reads. Articles with no known language are allowed for everyone.
+    """
+    codes = sorted({code for langs in subscriber_languages for code in langs} | {lang for lang in article_languages if lang})
+    column = {code: i for i, code in enumerate(codes)}
+    reads = np.zeros((len(subscriber_languages), len(codes)), dtype=bool)
+    for row, langs in enumerate(subscriber_languages):
+        reads[row, [column[code] for code in langs]] = True
+    written = np.zeros((len(article_languages), len(codes)), dtype=bool)
+    for row, lang in enumerate(article_languages):
+        if lang:
+            written[row, column[lang]] = True
+    mask = (reads.astype(np.uint8) @ written.T.astype(np.uint8)) > 0
+    mask[:, [not lang for lang in article_languages]] = True
+    # Subscribers without a language preference see everything
+    mask[[not langs for langs in subscriber_languages], :] = True
+    return mask
+
+def rank_articles(subscribers, articles, k=3, min_score=MIN_SCORE):
+    """
+    Scores every subscriber against every article in one sparse matrix product and
+    returns {subscriber_id: [article dicts with a 'score']} holding each subscriber's top k.
+
+    subscribers: iterable of dicts with id, interests and languages (comma-separated strings).
+    articles: dicts with id, title, description and language (see article_store.recent_articles).
+    """
+    subscribers = list(subscribers)
+    if not subscribers or not articles:
+        return {}
+
+    article_tokens = [tokenize(a['title']) * TITLE_WEIGHT + tokenize(a.get('description')) for a in articles]
+    interest_tokens = [tokenize(' '.join(parse_interests(s.get('interests')))) for s in subscribers]
+
+    article_counts = hashed_counts(article_tokens)
+    document_frequency = np.bincount(article_counts.indices, minlength=HASH_FEATURES)
+    idf = np.log((1 + len(articles)) / (1 + document_frequency)).astype(np.float32) + 1.0
+
+    article_vectors = tfidf(article_counts, idf)
+    subscriber_vectors = tfidf(hashed_counts(interest_tokens), idf)
+
+    # subscribers x articles cosine similarities
+    scores = (subscriber_vectors @ article_vectors.T).toarray()
+
+    subscriber_languages = [
+        sorted({normalize_language(lang) for lang in str(s.get('languages') or '').split(',') if normalize_language(lang)})
+        for s in subscribers
+    ]
+    article_languages = [normalize_language(a.get('language')) for a in articles]
+    scores[~language_mask(subscriber_languages, article_languages)] = 0.0
+
+    # Top k per row without sorting whole rows
+    k = min(k, len(articles))
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    top_scores = np.take_along_axis(scores, top, axis=1)
+    order = np.argsort(-top_scores, axis=1)
+    top = np.take_along_axis(top, order, axis=1)
+    top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+    ranked = {}
+    for row, subscriber in enumerate(subscribers):
+        ranked[subscriber['id']] = [
+            dict(articles[col], score=float(score))
+            for col, score in zip(top[row], top_scores[row]) if score >= min_score
+        ]
+    matched = sum(1 for picks in ranked.values() if picks)
+    logger.info(f"Ranked {len(articles)} articles for {len(subscribers)} subscribers; {matched} have matches")
+    return ranked
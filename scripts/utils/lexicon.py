@@ -0,0 +1,202 @@
+# scripts/utils/lexicon.py
+
+import os
+import sys
+import re
+import csv
+import json
+import math
+import hashlib
+from datetime import date
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+
+# Initialize logger
+logger = get_logger('lexicon')
+
+# Any one-word-per-line English wordlist (e.g. SCOWL or /usr/share/dict/words)
+WORDLIST_PATH = os.getenv('LEXICON_WORDLIST', os.path.join(project_root, 'data', 'lexicon', 'words.txt'))
+FILTER_PATH = os.getenv('LEXICON_FILTER', os.path.join(project_root, 'data', 'lexicon', 'lexicon.bloom'))
+FALSE_POSITIVE_RATE = float(os.getenv('LEXICON_FALSE_POSITIVE_RATE', 0.001))
+REPORT_DIR = os.path.join(project_root, 'data', 'reports')
+
+# Classification results; only PLAUSIBLE words are sent to the dictionary API
+PLAUSIBLE = 'plausible'
+EMPTY = 'empty'
+MULTI_WORD = 'multi_word'
+INVALID_CHARACTERS = 'invalid_characters'
+PROPER_NOUN = 'proper_noun'
+UNKNOWN = 'unknown'
+
+_word_re = re.compile(r"[^\W\d_]+(?:['-][^\W\d_]+)*")
+
+# Inflection endings tried when the exact form is missing: (suffix, replacement)
+SUFFIXES = [
+    ('ies', 'y'), ('ied', 'y'), ('ing', ''), ('ing', 'e'), ('ed', ''), ('ed', 'e'),
+    ('es', ''), ('s', ''), ('ly', ''), ('er', ''), ('est', ''),
+]
+
+class BloomFilter:
+    """
+    Fixed-size set membership test with no false negatives and a tunable false positive rate.
+    A few hundred thousand words fit in well under a megabyte.
+    """
+
+    def __init__(self, size_bits, hash_count, bits=None):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.bits = bits if bits is not None else bytearray((size_bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity, false_positive_rate=FALSE_POSITIVE_RATE):
+        capacity = max(1, capacity)
+        size_bits = math.ceil(-capacity * math.log(false_positive_rate) / (math.log(2) ** 2))
+        hash_count = max(1, round(size_bits / capacity * math.log(2)))
+        return cls(size_bits, hash_count)
+
+    def _positions(self, key):
+        # Double hashing: two 64-bit halves of one digest give all k positions
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {'path': os.path.abspath(path), 'size': stat.st_size, 'mtime': int(stat.st_mtime)}
+
+def build_filter(wordlist_path=WORDLIST_PATH):
+    """
+    Builds the filter from a wordlist. Lowercase entries are stored as "w:<word>";
+    entries that only ever appear capitalized are stored as "p:<word>" (proper nouns).
+    """
+    lowercase, capitalized = set(), set()
+    with open(wordlist_path, 'r', encoding='utf-8', errors='ignore') as f:
+        for line in f:
+            word = line.strip()
+            if not word or word.startswith('#'):
+                continue
+            if word[0].isupper():
+                capitalized.add(word.casefold())
+            else:
+                lowercase.add(word.casefold())
+    proper_only = capitalized - lowercase
+    bloom = BloomFilter.for_capacity(len(lowercase) + len(proper_only))
+    for word in lowercase:
+        bloom.add(f"w:{word}")
+    for word in proper_only:
+        bloom.add(f"p:{word}")
+    logger.info(f"Built lexicon filter from {wordlist_path}: {len(lowercase)} words, "
+                f"{len(proper_only)} proper nouns, {len(bloom.bits) / 1024:.0f} KB")
+    return bloom
+
+def save_filter(bloom, signature, path=FILTER_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    header = json.dumps({'size_bits': bloom.size_bits, 'hash_count': bloom.hash_count, 'source': signature})
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(header.encode('utf-8') + b'\n')
+        f.write(bloom.bits)
+    os.replace(tmp_path, path)
+
+def load_filter(wordlist_path=WORDLIST_PATH, path=FILTER_PATH):
+    """
+    The lexicon filter, rebuilt only when the wordlist changed. Returns None when
+    there is no wordlist, in which case callers should not filter at all.
+    """
+    if not os.path.exists(wordlist_path):
+        logger.warning(f"No wordlist at {wordlist_path}; words will not be pre-filtered")
+        return None
+    signature = _source_signature(wordlist_path)
+    if os.path.exists(path):
+        try:
+            with open(path, 'rb') as f:
+                header = json.loads(f.readline())
+                bits = bytearray(f.read())
+            if header['source'] == signature:
+                return BloomFilter(header['size_bits'], header['hash_count'], bits)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Could not read lexicon filter {path}, rebuilding: {e}")
+    bloom = build_filter(wordlist_path)
+    save_filter(bloom, signature, path)
+    return bloom
+
+def base_forms(word):
+    """
+    The word itself plus candidate stems with common inflections removed
+    (running -> run, studies -> study, walked -> walk).
+    """
+    forms = [word]
+    for suffix, replacement in SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            stem = word[:-len(suffix)] + replacement
+            forms.append(stem)
+            # Doubled final consonant: running -> runn -> run
+            if not replacement and len(stem) > 2 and stem[-1] == stem[-2]:
+                forms.append(stem[:-1])
+    return forms
+
+def classify(word, bloom):
+    """
+    Returns one of PLAUSIBLE, EMPTY, MULTI_WORD, INVALID_CHARACTERS, PROPER_NOUN or UNKNOWN.
+    """
+    text = (word or '').strip()
+    if not text:
+        return EMPTY
+    if len(text.split()) > 1:
+        return MULTI_WORD
+    if not _word_re.fullmatch(text):
+        return INVALID_CHARACTERS
+    folded = text.casefold()
+    if any(f"w:{form}" in bloom for form in base_forms(folded)):
+        return PLAUSIBLE
+    if f"p:{folded}" in bloom:
+        return PROPER_NOUN
+    return UNKNOWN
+
+def filter_words(words, bloom=None, report=True):
+    """
+    Splits (word_id, word) pairs into (plausible, rejected), where rejected holds
+    (word_id, word, reason). Without a wordlist every word is treated as plausible.
+    """
+    bloom = bloom if bloom is not None else load_filter()
+    if bloom is None:
+        return list(words), []
+    plausible, rejected = [], []
+    for word_id, word in words:
+        reason = classify(word, bloom)
+        if reason == PLAUSIBLE:
+            plausible.append((word_id, word))
+        else:
+            rejected.append((word_id, word, reason))
+    if rejected and report:
+        write_rejection_report(rejected)
+    logger.info(f"Lexicon pre-filter: {len(plausible)} plausible, {len(rejected)} rejected")
+    return plausible, rejected
+
+def write_rejection_report(rejected, report_dir=REPORT_DIR):
+    """
+    Writes rejected words to a dated CSV and logs the count per reason. Returns the file path.
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    path = os.path.join(report_dir, f"rejected_words_{date.today().isoformat()}.csv")
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['id', 'word', 'reason'])
+        writer.writerows(rejected)
+    counts = {}
+    for _, _, reason in rejected:
+        counts[reason] = counts.get(reason, 0) + 1
+    logger.info(f"Rejected {len(rejected)} words ({', '.join(f'{r}: {c}' for r, c in sorted(counts.items()))}); report at {path}")
+    return path
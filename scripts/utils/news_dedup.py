@@ -0,0 +1,151 @@
+# scripts/utils/news_dedup.py
+
+import re
+import hashlib
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+# Query parameters that only track the click and never change the article
+TRACKING_PARAMS = {'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ref', 'ref_src', 'cmpid', 'ito', 'ns_mchannel', 'ns_source', 'ocid', 'smid'}
+
+# Titles and descriptions within this many differing simhash bits are the same story
+SIMHASH_BITS = 64
+SIMHASH_MAX_DISTANCE = 3
+
+# Band layout for candidate lookup: with at most 3 differing bits, at least one
+# of 4 bands must match exactly (pigeonhole), so only same-band articles are compared
+SIMHASH_BANDS = 4
+_BAND_WIDTH = SIMHASH_BITS // SIMHASH_BANDS
+_BAND_MASK = (1 << _BAND_WIDTH) - 1
+
+_word_re = re.compile(r'\w+', re.UNICODE)
+
+# Where each provider keeps its article list, and the field names it uses
+PROVIDER_FORMATS = {
+    'newsdata': {'list': 'results', 'url': 'link', 'published': 'pubDate', 'source': 'source_id'},
+    'newsapi': {'list': 'articles', 'url': 'url', 'published': 'publishedAt', 'source': 'source'},
+    'gnews': {'list': 'articles', 'url': 'url', 'published': 'publishedAt', 'source': 'source'},
+    'mediastack': {'list': 'data', 'url': 'url', 'published': 'published_at', 'source': 'source'},
+    'currents': {'list': 'news', 'url': 'url', 'published': 'published', 'source': 'author'},
+}
+
+def canonical_url(url):
+    """
+    Normalizes a URL so the same article linked by different providers compares equal:
+    lowercase host without www., no fragment, no tracking parameters, sorted query, no trailing slash.
+    """
+    if not url:
+        return None
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith('utm_') and k.lower() not in TRACKING_PARAMS
+    )
+    path = parts.path.rstrip('/') or '/'
+    # Scheme is dropped on purpose: http and https links to a story are the same story
+    return f"{host}{path}?{urlencode(query)}" if query else f"{host}{path}"
+
+def tokenize(text):
+    return _word_re.findall((text or '').casefold())
+
+def simhash(text):
+    """
+    64-bit simhash over word unigrams and bigrams.
+    """
+    words = tokenize(text)
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+    weights = [0] * SIMHASH_BITS
+    for feature in features:
+        value = int.from_bytes(hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    fingerprint = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+def hamming_distance(a, b):
+    return bin(a ^ b).count('1')
+
+def normalize_articles(provider, data):
+    """
+    Maps one provider's raw response to a list of article dicts with a common shape.
+    """
+    fmt = PROVIDER_FORMATS.get(provider)
+    if not fmt or not isinstance(data, dict):
+        return []
+    articles = []
+    for item in data.get(fmt['list']) or []:
+        source = item.get(fmt['source'])
+        if isinstance(source, dict):
+            source = source.get('name')
+        language = item.get('language')
+        articles.append({
+            'title': (item.get('title') or '').strip(),
+            'description': (item.get('description') or '').strip(),
+            'url': item.get(fmt['url']),
+            'image_url': item.get('image_url') or item.get('urlToImage') or item.get('image'),
+            'published_at': item.get(fmt['published']),
+            'source': source,
+            'language': language[0] if isinstance(language, list) and language else language,
+            'providers': [provider]
+        })
+    return articles
+
+def merge_articles(news_data):
+    """
+    Merges the raw responses of all providers ({provider: response}) into one list,
+    dropping articles whose canonical URL was already seen or whose title and
+    description are a near duplicate of a kept article. Duplicates add their
+    provider to the kept article's `providers`.
+    """
+    kept = []
+    by_url = {}
+    bands = [{} for _ in range(SIMHASH_BANDS)]
+    total = 0
+
+    for provider, data in news_data.items():
+        for article in normalize_articles(provider, data):
+            total += 1
+            url = canonical_url(article['url'])
+            if url and url in by_url:
+                _add_provider(by_url[url], provider)
+                continue
+
+            fingerprint = simhash(f"{article['title']} {article['description']}")
+            duplicate = None
+            if fingerprint:
+                for band, index in enumerate(bands):
+                    for candidate in index.get(fingerprint >> band * _BAND_WIDTH & _BAND_MASK, ()):
+                        if hamming_distance(fingerprint, candidate['simhash']) <= SIMHASH_MAX_DISTANCE:
+                            duplicate = candidate
+                            break
+                    if duplicate:
+                        break
+            if duplicate:
+                _add_provider(duplicate, provider)
+                if url:
+                    by_url[url] = duplicate
+                continue
+
+            article['canonical_url'] = url
+            article['simhash'] = fingerprint
+            kept.append(article)
+            if url:
+                by_url[url] = article
+            if fingerprint:
+                for band, index in enumerate(bands):
+                    index.setdefault(fingerprint >> band * _BAND_WIDTH & _BAND_MASK, []).append(article)
+
+    return kept, total - len(kept)
+
+def _add_provider(article, provider):
+    if provider not in article['providers']:
+        article['providers'].append(provider)
@@ -0,0 +1,161 @@
+# scripts/utils/query_profiler.py
+
+import os
+import sys
+import threading
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+
+# Initialize logger
+logger = get_logger('query_profiler')
+
+# Profiling settings
+SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', 500))
+EXPLAIN_SLOW_QUERIES = os.getenv('DB_EXPLAIN_SLOW_QUERIES', '0').lower() in ('1', 'true', 'yes')
+MAX_LOGGED_STATEMENT = 1000
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+def approximate_size(value):
+    """
+    Rough byte size of a result set or parameter list, without serializing it.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8', errors='ignore'))
+    if isinstance(value, dict):
+        return sum(approximate_size(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(approximate_size(v) for v in value)
+    return 8
+
+class QueryProfile:
+    """
+    Context manager timing one database call.
+
+    The call site is the function that called the instrumented helper, so
+    execute_query is reported per fetch_* function rather than as one bucket.
+    """
+
+    def __init__(self, name, statement=None, params=None):
+        caller = sys._getframe(2).f_code.co_name
+        self.call_site = f"{name} <- {caller}"
+        self.statement = statement
+        self.params = params
+        self.rows = 0
+        self.bytes = 0
+        self.acquire_ms = 0.0
+        self.elapsed_ms = 0.0
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def connection_acquired(self):
+        """Mark the moment a pooled connection was obtained."""
+        self.acquire_ms = (time.perf_counter() - self._start) * 1000
+
+    def set_result(self, rows=None, rowcount=None):
+        """Record the rows fetched or, for writes, the affected row count."""
+        if rows is not None:
+            self.rows = len(rows)
+            self.bytes = approximate_size(rows)
+        elif rowcount is not None:
+            self.rows = max(rowcount, 0)
+            self.bytes = approximate_size(self.params)
+
+    def __exit__(self, exc_type, exc, tb):
+        self.elapsed_ms = (time.perf_counter() - self._start) * 1000
+        record_query(self)
+        if self.elapsed_ms >= SLOW_QUERY_MS:
+            log_slow_query(self)
+        return False
+
+def record_query(profile):
+    with _stats_lock:
+        stats = _stats.setdefault(profile.call_site, {
+            'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'acquire_ms': 0.0, 'rows': 0, 'bytes': 0
+        })
+        stats['calls'] += 1
+        stats['total_ms'] += profile.elapsed_ms
+        stats['max_ms'] = max(stats['max_ms'], profile.elapsed_ms)
+        stats['acquire_ms'] += profile.acquire_ms
+        stats['rows'] += profile.rows
+        stats['bytes'] += profile.bytes
+
+def log_slow_query(profile):
+    statement = ' '.join((profile.statement or '').split())[:MAX_LOGGED_STATEMENT]
+    logger.warning(
+        f"Slow query at {profile.call_site}: {profile.elapsed_ms:.1f} ms "
+        f"(acquire {profile.acquire_ms:.1f} ms, {profile.rows} rows): {statement}"
+    )
+    if EXPLAIN_SLOW_QUERIES and statement.upper().startswith('SELECT'):
+        explain_query(profile.statement, profile.params)
+
+def explain_query(statement, params=None):
+    """
+    Logs the EXPLAIN plan of a statement on a separate pooled connection.
+    """
+    from scripts.utils.db_connection import get_db_connection, close_connection, READ
+
+    conn = None
+    try:
+        conn = get_db_connection(READ)
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(f"EXPLAIN {statement.strip().rstrip(';')}", params)
+        for row in cursor.fetchall():
+            logger.warning(f"EXPLAIN: {row}")
+    except Exception as e:
+        logger.error(f"Could not EXPLAIN slow query: {e}")
+    finally:
+        if conn:
+            close_connection(conn)
+
+def get_query_stats():
+    """
+    Returns a copy of the per-call-site statistics.
+    """
+    with _stats_lock:
+        return {site: dict(stats) for site, stats in _stats.items()}
+
+def reset_query_stats():
+    with _stats_lock:
+        _stats.clear()
+
+def format_query_summary(stats=None):
+    """
+    Formats the statistics as a fixed-width table, most expensive call site first.
+    """
+    stats = get_query_stats() if stats is None else stats
+    header = f"{'call site':<60} {'calls':>6} {'total ms':>10} {'avg ms':>8} {'max ms':>8} {'acquire ms':>10} {'rows':>8} {'KB':>8}"
+    lines = [header, '-' * len(header)]
+    totals = {'calls': 0, 'total_ms': 0.0, 'acquire_ms': 0.0, 'rows': 0, 'bytes': 0}
+    for site, s in sorted(stats.items(), key=lambda item: item[1]['total_ms'], reverse=True):
+        lines.append(
+            f"{site[:60]:<60} {s['calls']:>6} {s['total_ms']:>10.1f} {s['total_ms'] / s['calls']:>8.1f} "
+            f"{s['max_ms']:>8.1f} {s['acquire_ms']:>10.1f} {s['rows']:>8} {s['bytes'] / 1024:>8.1f}"
+        )
+        for key in totals:
+            totals[key] += s[key]
+    lines.append('-' * len(header))
+    lines.append(
+        f"{'total':<60} {totals['calls']:>6} {totals['total_ms']:>10.1f} {'':>8} {'':>8} "
+        f"{totals['acquire_ms']:>10.1f} {totals['rows']:>8} {totals['bytes'] / 1024:>8.1f}"
+    )
+    return '\n'.join(lines)
+
+def log_query_summary():
+    """
+    Logs the end-of-run summary table, if any query was profiled.
+    """
+    if get_query_stats():
+        logger.info("Database cost of this run:\n" + format_query_summary())
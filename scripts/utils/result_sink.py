@@ -0,0 +1,143 @@
+# scripts/utils/result_sink.py
+
+import os
+import sys
+import gzip
+import json
+import sqlite3
+import threading
+import zlib
+from datetime import datetime
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+
+# Initialize logger
+logger = get_logger('result_sink')
+
+# Fetched API results are appended to gzip JSONL segments instead of one pretty-printed file each
+SINK_DIR = os.getenv('FETCHED_RESULTS_DIR', os.path.join(project_root, 'data', 'fetched_results'))
+SEGMENT_MAX_BYTES = int(os.getenv('RESULT_SEGMENT_MAX_BYTES', 32 * 1024 * 1024))
+
+create_index_table = '''
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    result_key TEXT,
+    fetched_at TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    byte_offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_results_source_time ON results (source, fetched_at);
+CREATE INDEX IF NOT EXISTS idx_results_segment ON results (segment);
+'''
+
+_lock = threading.Lock()
+# One index connection per process, used under _lock, and the segment each day is writing to
+_conn = None
+_segments = {}
+
+def _index_path():
+    return os.path.join(SINK_DIR, 'index.db')
+
+def _connect_index():
+    os.makedirs(SINK_DIR, exist_ok=True)
+    conn = sqlite3.connect(_index_path(), check_same_thread=False)
+    conn.executescript(create_index_table)
+    return conn
+
+def _index():
+    global _conn
+    if _conn is None:
+        _conn = _connect_index()
+    return _conn
+
+def _current_segment(conn, day):
+    """
+    Latest segment for the day, or a new one once it passes SEGMENT_MAX_BYTES.
+    The index is only consulted on the first append of the day in this process.
+    """
+    prefix = f"results-{day}-"
+    segment = _segments.get(day)
+    if segment is None:
+        row = conn.execute(
+            'SELECT segment FROM results WHERE segment GLOB ? ORDER BY segment DESC LIMIT 1', (f"{prefix}*",)
+        ).fetchone()
+        segment = row[0] if row else f"{prefix}0001.jsonl.gz"
+    path = os.path.join(SINK_DIR, segment)
+    if os.path.exists(path) and os.path.getsize(path) >= SEGMENT_MAX_BYTES:
+        number = int(segment[len(prefix):].split('.', 1)[0]) + 1
+        segment = f"{prefix}{number:04d}.jsonl.gz"
+    _segments.clear()
+    _segments[day] = segment
+    return segment
+
+def append(source, data, key=None):
+    """
+    Appends one fetched result to the current segment and indexes it by source,
+    key and time. Each record is its own gzip member, so it can be read back
+    from its offset without decompressing the rest of the segment.
+    Returns (segment, offset).
+    """
+    fetched_at = datetime.now().isoformat(timespec='seconds')
+    line = json.dumps({'source': source, 'key': key, 'fetched_at': fetched_at, 'data': data},
+                      ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+    member = gzip.compress(line.encode('utf-8'))
+
+    with _lock:
+        conn = _index()
+        segment = _current_segment(conn, fetched_at[:10].replace('-', ''))
+        path = os.path.join(SINK_DIR, segment)
+        with open(path, 'ab') as f:
+            offset = f.tell()
+            f.write(member)
+        conn.execute(
+            'INSERT INTO results (source, result_key, fetched_at, segment, byte_offset, length) VALUES (?, ?, ?, ?, ?, ?)',
+            (source, key, fetched_at, segment, offset, len(member))
+        )
+        conn.commit()
+
+    logger.info(f"Appended {source} result{f' for {key}' if key else ''} to {segment} ({len(member)} bytes)")
+    return segment, offset
+
+def _read_member(segment, offset, length):
+    with open(os.path.join(SINK_DIR, segment), 'rb') as f:
+        f.seek(offset)
+        raw = f.read(length)
+    return json.loads(zlib.decompress(raw, 16 + zlib.MAX_WBITS))
+
+def find(source, key=None, since=None, until=None, limit=None):
+    """
+    Returns stored records ({source, key, fetched_at, data}) for a source, newest first.
+    since/until are ISO timestamps or dates.
+    """
+    clauses, params = ['source = ?'], [source]
+    if key is not None:
+        clauses.append('result_key = ?')
+        params.append(key)
+    if since:
+        clauses.append('fetched_at >= ?')
+        params.append(since)
+    if until:
+        clauses.append('fetched_at <= ?')
+        params.append(until)
+    query = f"SELECT segment, byte_offset, length FROM results WHERE {' AND '.join(clauses)} ORDER BY fetched_at DESC, id DESC"
+    if limit:
+        query += ' LIMIT ?'
+        params.append(limit)
+    if not os.path.exists(_index_path()):
+        return []
+    with _lock:
+        rows = _index().execute(query, params).fetchall()
+    return [_read_member(*row) for row in rows]
+
+def latest(source, key=None):
+    """
+    The most recent record for a source (and key), or None.
+    """
+    records = find(source, key=key, limit=1)
+    return records[0] if records else None
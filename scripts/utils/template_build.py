@@ -0,0 +1,245 @@
+# scripts/utils/template_build.py
+
+import os
+import re
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+from datetime import datetime
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+from scripts.utils.template_env import TEMPLATES_DIR, TEMPLATE_BUILD_DIR, BUILD_MANIFEST # noqa: E402
+
+# Initialize logger
+logger = get_logger('template_build')
+
+# Gmail clips messages whose HTML is larger than this
+GMAIL_CLIP_BYTES = 102 * 1024
+
+# Jinja syntax and raw-text elements are copied verbatim; <style> blocks are minified as CSS
+_html_token = re.compile(
+    r'(?P<jinja>\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\})'
+    r'|(?P<raw><(?P<raw_tag>pre|textarea|script)\b.*?</(?P=raw_tag)\s*>)'
+    r'|(?P<style_open><style\b[^>]*>)(?P<css>.*?)(?P<style_close></style\s*>)'
+    r'|(?P<comment><!--.*?-->)'
+    r'|(?P<tag></?[a-zA-Z][^>]*>)',
+    re.DOTALL | re.IGNORECASE,
+)
+_style_attr = re.compile(r'''(\sstyle=)(?:"([^"]*)"|'([^']*)')''', re.IGNORECASE)
+_quoted_or_space = re.compile(r'''("[^"]*"|'[^']*')|\s+''')
+_css_comment = re.compile(r'/\*.*?\*/', re.DOTALL)
+_css_rule = re.compile(r'([^{}]+)\{([^{}]*)\}')
+
+def _is_conditional_comment(comment):
+    # Outlook conditional comments ([if mso], <![endif]) are markup, not comments
+    return '[if' in comment or '[endif]' in comment
+
+def _collapse_whitespace(text):
+    # A newline is kept where there was one, so lines stay well below the SMTP limit
+    return re.sub(r'\s+', lambda m: '\n' if '\n' in m.group(0) else ' ', text)
+
+def parse_declarations(block):
+    """
+    (property, value) pairs of a declaration block, or None when it cannot be split safely.
+    """
+    if '{' in block or 'url(' in block.lower() or '\\' in block:
+        return None
+    declarations = []
+    for part in block.split(';'):
+        if not part.strip():
+            continue
+        if ':' not in part:
+            return None
+        prop, value = part.split(':', 1)
+        declarations.append((prop.strip().lower(), re.sub(r'\s*,\s*', ',', ' '.join(value.split()))))
+    return declarations
+
+def dedupe_declarations(declarations):
+    """
+    Keeps only the last declaration of each property, as the browser would.
+    Properties declared with !important are left alone.
+    """
+    important = {prop for prop, value in declarations if '!important' in value}
+    last = {prop: i for i, (prop, _) in enumerate(declarations)}
+    return [(prop, value) for i, (prop, value) in enumerate(declarations) if prop in important or last[prop] == i]
+
+def compact_declarations(declarations):
+    return ';'.join(f"{prop}:{value}" for prop, value in declarations)
+
+def compact_style_attribute(value, stats):
+    declarations = parse_declarations(value)
+    if declarations is None:
+        return ' '.join(value.split())
+    kept = dedupe_declarations(declarations)
+    stats['declarations_removed'] += len(declarations) - len(kept)
+    return compact_declarations(kept)
+
+def minify_css(css, stats):
+    """
+    Drops comments and whitespace, removes declarations repeated within a rule, and removes
+    declarations of an earlier rule that a later rule with the same selector overrides.
+    """
+    css = _css_comment.sub('', css)
+    rules = []
+    for match in _css_rule.finditer(css):
+        selector = ' '.join(match.group(1).split())
+        selector = re.sub(r'\s*([,>+~])\s*', r'\1', selector)
+        declarations = parse_declarations(match.group(2))
+        rules.append([selector, declarations, match.group(2)])
+    if not rules or '@' in css:
+        # At-rules (media queries) nest braces; only whitespace is safe to touch there
+        return re.sub(r'\s*([{};,])\s*', r'\1', ' '.join(css.split()))
+
+    for i, (selector, declarations, _) in enumerate(rules):
+        if declarations is None:
+            continue
+        kept = dedupe_declarations(declarations)
+        later = {prop for other_selector, other, _ in rules[i + 1:] if other_selector == selector and other
+                 for prop, _ in other}
+        kept = [(prop, value) for prop, value in kept if prop not in later or '!important' in value]
+        stats['declarations_removed'] += len(declarations) - len(kept)
+        rules[i][1] = kept
+
+    out = []
+    for selector, declarations, raw in rules:
+        if declarations is None:
+            out.append(f"{selector}{{{' '.join(raw.split())}}}")
+        elif declarations:
+            out.append(f"{selector}{{{compact_declarations(declarations)}}}")
+        else:
+            stats['rules_removed'] += 1
+    return ''.join(out)
+
+def _minify_tag(tag, stats):
+    def style(match):
+        value = match.group(2) if match.group(2) is not None else match.group(3)
+        stats['style_attributes'] += 1
+        stats['unique_styles'].add(value)
+        if '{{' in value or '{%' in value:
+            return match.group(0)
+        quote = '"' if match.group(2) is not None else "'"
+        return f"{match.group(1)}{quote}{compact_style_attribute(value, stats)}{quote}"
+    tag = _style_attr.sub(style, tag)
+    tag = _quoted_or_space.sub(lambda m: m.group(1) or ' ', tag)
+    return tag[:-2] + '>' if tag.endswith(' >') else tag
+
+def minify_html(source):
+    """
+    Email-safe minification of a Jinja HTML template: whitespace runs collapse to one
+    space (or one newline), ordinary comments are dropped, inline styles and the <style>
+    block are compacted. Jinja tags, conditional comments, comments that contain Jinja
+    and <pre>/<textarea>/<script> contents are left untouched.
+    Returns (minified source, stats).
+    """
+    stats = {'style_attributes': 0, 'unique_styles': set(), 'declarations_removed': 0,
+             'rules_removed': 0, 'comments_removed': 0}
+    out = []
+    pending_text = []
+    pos = 0
+
+    def flush_text():
+        if pending_text:
+            out.append(_collapse_whitespace(''.join(pending_text)))
+            pending_text.clear()
+
+    for match in _html_token.finditer(source):
+        pending_text.append(source[pos:match.start()])
+        pos = match.end()
+        if match.group('comment') is not None:
+            comment = match.group('comment')
+            if _is_conditional_comment(comment) or '{{' in comment or '{%' in comment:
+                flush_text()
+                out.append(comment)
+            else:
+                stats['comments_removed'] += 1
+            continue
+        flush_text()
+        if match.group('style_open') is not None:
+            out.append(_minify_tag(match.group('style_open'), stats))
+            out.append(minify_css(match.group('css'), stats))
+            out.append('</style>')
+        elif match.group('tag') is not None:
+            out.append(_minify_tag(match.group('tag'), stats))
+        else:
+            out.append(match.group(0))
+    pending_text.append(source[pos:])
+    flush_text()
+    minified = ''.join(out).strip() + '\n'
+    stats['unique_styles'] = len(stats['unique_styles'])
+    return minified, stats
+
+def _sizes(text):
+    body = text.encode('utf-8')
+    return len(body), len(gzip.compress(body))
+
+def build(name, templates_dir=TEMPLATES_DIR, build_dir=TEMPLATE_BUILD_DIR):
+    """
+    Writes the optimized template to build_dir and records it in the build manifest,
+    keyed by the source hash so template_env only serves it while the source is unchanged.
+    Returns the size report.
+    """
+    with open(os.path.join(templates_dir, name), 'r', encoding='utf-8') as f:
+        source = f.read()
+    minified, stats = minify_html(source)
+
+    built_path = os.path.join(build_dir, name)
+    os.makedirs(os.path.dirname(built_path), exist_ok=True)
+    with open(built_path, 'w', encoding='utf-8') as f:
+        f.write(minified)
+
+    original_bytes, original_gzip = _sizes(source)
+    built_bytes, built_gzip = _sizes(minified)
+    report = {
+        'source_sha256': hashlib.sha256(source.encode('utf-8')).hexdigest(),
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+        'original_bytes': original_bytes,
+        'built_bytes': built_bytes,
+        'original_gzip_bytes': original_gzip,
+        'built_gzip_bytes': built_gzip,
+        **stats,
+    }
+
+    manifest_path = os.path.join(build_dir, BUILD_MANIFEST)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    manifest[name] = report
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=4)
+    return report
+
+def format_report(name, report):
+    saved = report['original_bytes'] - report['built_bytes']
+    lines = [
+        f"{name}",
+        f"  size        {report['original_bytes']:>8,} -> {report['built_bytes']:>8,} bytes "
+        f"(-{saved / report['original_bytes']:.1%})",
+        f"  gzip        {report['original_gzip_bytes']:>8,} -> {report['built_gzip_bytes']:>8,} bytes",
+        f"  styles      {report['style_attributes']} style attributes, {report['unique_styles']} distinct, "
+        f"{report['declarations_removed']} duplicate declarations removed",
+        f"  css rules   {report['rules_removed']} overridden rules removed",
+        f"  comments    {report['comments_removed']} removed",
+    ]
+    if report['built_bytes'] > GMAIL_CLIP_BYTES:
+        lines.append(f"  warning     larger than Gmail's {GMAIL_CLIP_BYTES // 1024} KB clipping limit before content is added")
+    return '\n'.join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description="Build minified email templates with a size report")
+    parser.add_argument('names', nargs='*', default=['template.html'], help="templates to build (default: template.html)")
+    args = parser.parse_args()
+
+    for name in args.names:
+        report = build(name)
+        print(format_report(name, report))
+        logger.info(f"Built {name}: {report['original_bytes']} -> {report['built_bytes']} bytes")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# scripts/utils/template_env.py
+
+import os
+import sys
+import json
+import hashlib
+import threading
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+
+# Initialize logger
+logger = get_logger('template_env')
+
+TEMPLATES_DIR = os.getenv('TEMPLATES_DIR', os.path.join(project_root, 'templates'))
+# Compiled template bytecode; Jinja stores a checksum of the source with each entry,
+# so an edited template is recompiled and a stale entry is never used
+TEMPLATE_CACHE_DIR = os.getenv('TEMPLATE_CACHE_DIR', os.path.join(project_root, 'data', 'template_cache'))
+
+# Minified templates written by template_build.py; used only while their source is unchanged
+TEMPLATE_BUILD_DIR = os.getenv('TEMPLATE_BUILD_DIR', os.path.join(project_root, 'data', 'template_build'))
+BUILD_MANIFEST = 'manifest.json'
+
+class BuiltTemplateLoader(FileSystemLoader):
+    """
+    Serves the built version of a template when the build manifest records the current
+    source's hash, and the source itself otherwise (not built yet, or edited since).
+    """
+
+    def __init__(self, searchpath, build_dir=TEMPLATE_BUILD_DIR):
+        super().__init__(searchpath)
+        self.build_dir = build_dir
+
+    def _manifest_mtime(self):
+        manifest_path = os.path.join(self.build_dir, BUILD_MANIFEST)
+        return os.path.getmtime(manifest_path) if os.path.exists(manifest_path) else None
+
+    def _built_entry(self, template):
+        manifest_path = os.path.join(self.build_dir, BUILD_MANIFEST)
+        if not os.path.exists(manifest_path):
+            return None
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get(template)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read template build manifest: {e}")
+            return None
+
+    def get_source(self, environment, template):
+        source, filename, source_uptodate = super().get_source(environment, template)
+        # The manifest is written after the built file, so a rebuild always changes its mtime
+        manifest_mtime = self._manifest_mtime()
+
+        def uptodate():
+            return source_uptodate() and self._manifest_mtime() == manifest_mtime
+
+        entry = self._built_entry(template)
+        if not entry or entry.get('source_sha256') != hashlib.sha256(source.encode('utf-8')).hexdigest():
+            if entry:
+                logger.info(f"Build of {template} is stale, using the source; rerun template_build.py")
+            return source, filename, uptodate
+        built_path = os.path.join(self.build_dir, template)
+        try:
+            with open(built_path, 'r', encoding='utf-8') as f:
+                return f.read(), built_path, uptodate
+        except OSError as e:
+            logger.warning(f"Could not read built {template}, using the source: {e}")
+            return source, filename, uptodate
+
+_env = None
+_env_lock = threading.Lock()
+
+def get_environment():
+    """
+    The Jinja environment shared by main.py, server.py and any worker process.
+    Bytecode goes to TEMPLATE_CACHE_DIR, so only the first process after an edit compiles.
+    """
+    global _env
+    if _env is None:
+        with _env_lock:
+            if _env is None:
+                os.makedirs(TEMPLATE_CACHE_DIR, exist_ok=True)
+                _env = Environment(
+                    loader=BuiltTemplateLoader(TEMPLATES_DIR),
+                    bytecode_cache=FileSystemBytecodeCache(TEMPLATE_CACHE_DIR, '%s.cache'),
+                    auto_reload=True,
+                )
+    return _env
+
+def get_template(name):
+    return get_environment().get_template(name)
+
+def from_string(source):
+    """
+    Like Environment.from_string, but compiled code goes through the bytecode cache,
+    keyed by the source hash. Only for sources cut from template files (see
+    variant_renderer), which are few and change only with the template; arbitrary
+    strings such as rendered pages would add a cache file each.
+    """
+    env = get_environment()
+    name = f"string-{hashlib.sha1(source.encode('utf-8')).hexdigest()}"
+    bcc = env.bytecode_cache
+    bucket = bcc.get_bucket(env, name, None, source)
+    if bucket.code is None:
+        bucket.code = env.compile(source, name)
+        bcc.set_bucket(bucket)
+    return env.template_class.from_code(env, bucket.code, env.make_globals(None))
+
+def precompile(names=None):
+    """
+    Fills the bytecode cache ahead of time, e.g. in a deploy step. Returns the template names compiled.
+    """
+    env = get_environment()
+    names = names or env.list_templates(filter_func=lambda name: name.endswith('.html'))
+    for name in names:
+        env.get_template(name)
+    logger.info(f"Precompiled {len(names)} templates into {TEMPLATE_CACHE_DIR}")
+    return names
+
+if __name__ == "__main__":
+    precompile(sys.argv[1:] or None)
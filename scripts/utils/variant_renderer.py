@@ -0,0 +1,232 @@
+# scripts/utils/variant_renderer.py
+
+import os
+import re
+import sys
+import threading
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.logger_config import get_logger # noqa: E402
+from scripts.utils.template_env import get_environment, from_string # noqa: E402
+
+# Initialize logger
+logger = get_logger('variant_renderer')
+
+_tag = re.compile(r'\{%(-?)\s*(\w+)(.*?)\s*(-?)%\}', re.DOTALL)
+_token = re.compile(r'\{\{(.*?)\}\}|\{%(.*?)%\}|\{#.*?#\}', re.DOTALL)
+_language_condition = re.compile(r'''^(['"])([\w-]+)\1\s+(not\s+in|in)\s+languages$''')
+_path = re.compile(r'^[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*$')
+
+# Tags that open a block closed by the matching end tag
+BLOCK_TAGS = {'if', 'for', 'with', 'filter', 'macro', 'call', 'block', 'autoescape'}
+
+class UnsupportedTemplate(ValueError):
+    """
+    Raised when a template uses syntax the fragment compiler does not handle;
+    the renderer then falls back to rendering the specialized template with Jinja.
+    """
+
+def _opens_block(name, args):
+    # {% set x %}...{% endset %} is a block, {% set x = 1 %} is not
+    return name in BLOCK_TAGS or (name == 'set' and '=' not in args)
+
+def language_key(languages):
+    return tuple(sorted({lang.strip().lower() for lang in languages or [] if lang and lang.strip()}))
+
+def specialize(source, languages):
+    """
+    Phase one: resolves every {% if '<code>' in languages %} block for one language
+    combination, keeping the taken branch and dropping the tags. Everything else is left
+    for Jinja, so the result renders exactly like the original for these languages.
+    """
+    languages = set(languages)
+    out = []
+    stack = []  # per open block: [is_language_if, branch_taken, any_branch_taken]
+    pos = 0
+
+    def emitting():
+        return all(frame[1] for frame in stack if frame[0])
+
+    for match in _tag.finditer(source):
+        if emitting():
+            out.append(source[pos:match.start()])
+        pos = match.end()
+        name, args = match.group(2), match.group(3).strip()
+        if match.group(1) or match.group(4):
+            raise UnsupportedTemplate("whitespace control markers are not supported")
+        if name == 'raw':
+            raise UnsupportedTemplate("raw blocks are not supported")
+
+        condition = _language_condition.match(args) if name in ('if', 'elif') else None
+        if name == 'if' and condition:
+            taken = (condition.group(2) in languages) == (condition.group(3) == 'in')
+            stack.append([True, taken, taken])
+            continue
+        if stack and stack[-1][0] and name in ('elif', 'else', 'endif'):
+            frame = stack[-1]
+            if name == 'endif':
+                stack.pop()
+            elif name == 'else':
+                frame[1] = not frame[2]
+                frame[2] = True
+            elif condition:
+                taken = not frame[2] and (condition.group(2) in languages) == (condition.group(3) == 'in')
+                frame[1] = taken
+                frame[2] = frame[2] or taken
+            else:
+                raise UnsupportedTemplate(f"elif mixing languages with other conditions: {args}")
+            continue
+
+        if _opens_block(name, args):
+            stack.append([False, True, True])
+        elif name.startswith('end') and stack:
+            stack.pop()
+        if emitting():
+            out.append(match.group(0))
+    if emitting():
+        out.append(source[pos:])
+    return ''.join(out)
+
+# Jinja resolves a.b as an attribute first, so dict keys that shadow dict methods keep the slow path
+_dict_attributes = frozenset(dir(dict))
+
+def _path_getter(expression):
+    env = get_environment()
+    head, *attributes = expression.split('.')
+    fast = not any(attribute in _dict_attributes for attribute in attributes)
+
+    def render(context):
+        value = context[head] if head in context else env.undefined(name=head)
+        for attribute in attributes:
+            if fast and type(value) is dict and attribute in value:
+                value = value[attribute]
+            else:
+                value = env.getattr(value, attribute)
+        return str(value)
+    return render
+
+def _expression_getter(expression):
+    compiled = get_environment().compile_expression(expression, undefined_to_none=False)
+    return lambda context: str(compiled(**context))
+
+def _block_getter(block_source):
+    template = from_string(block_source)
+
+    def render(context):
+        # Skips Template.render's per-call setup; the context is already a private copy
+        try:
+            return ''.join(template.root_render_func(template.new_context(context, shared=True)))
+        except Exception:
+            return template.environment.handle_exception()
+    return render
+
+def compile_fragments(source):
+    """
+    Phase one, continued: splits a specialized template into a flat list of literal
+    strings (adjacent ones joined) and callables for the dynamic parts: a field lookup
+    per {{ path }}, a compiled expression per other {{ ... }}, and a small compiled
+    template per top-level {% if %} / {% for %} block.
+    """
+    fragments = []
+    literal = []
+    depth = 0
+    block_start = None
+    pos = 0
+
+    def flush():
+        if literal:
+            fragments.append(''.join(literal))
+            literal.clear()
+
+    for match in _token.finditer(source):
+        if depth == 0:
+            literal.append(source[pos:match.start()])
+        pos = match.end()
+        expression, statement = match.group(1), match.group(2)
+        if statement is not None:
+            parts = statement.strip().split(None, 1)
+            name = parts[0] if parts else ''
+            args = parts[1] if len(parts) > 1 else ''
+            if _opens_block(name, args):
+                if depth == 0:
+                    block_start = match.start()
+                depth += 1
+            elif name.startswith('end'):
+                depth -= 1
+                if depth == 0:
+                    flush()
+                    fragments.append(_block_getter(source[block_start:match.end()]))
+            elif depth == 0:
+                # A top-level {% set %} (or similar) would change the context for later fragments
+                raise UnsupportedTemplate(f"top-level {{% {name} %}} is not supported")
+        elif expression is not None and depth == 0:
+            expression = expression.strip()
+            flush()
+            fragments.append(_path_getter(expression) if _path.match(expression) else _expression_getter(expression))
+    if depth != 0:
+        raise UnsupportedTemplate("unbalanced block tags")
+    literal.append(source[pos:])
+    flush()
+    return fragments
+
+class VariantRenderer:
+    """
+    Renders one template through per-language-combination fragment lists.
+    The first render for a combination compiles it; later renders only fill in the
+    dynamic fragments and join. Has the same render(context) call as a Jinja template.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.variants = {}
+        self.lock = threading.Lock()
+        self.source = None
+        self.uptodate = None
+
+    def _refresh(self):
+        # Compiled variants are dropped when the template (or its build) changes
+        if self.uptodate is not None and self.uptodate():
+            return
+        env = get_environment()
+        source, _, self.uptodate = env.loader.get_source(env, self.name)
+        if source != self.source:
+            self.source = source
+            self.variants.clear()
+
+    def fragments(self, languages):
+        key = language_key(languages)
+        with self.lock:
+            self._refresh()
+            if key not in self.variants:
+                source = self.source
+                if not get_environment().keep_trailing_newline and source.endswith('\n'):
+                    # Jinja drops a single trailing newline by default
+                    source = source[:-2] if source.endswith('\r\n') else source[:-1]
+                try:
+                    fragments = compile_fragments(specialize(source, key))
+                except UnsupportedTemplate as e:
+                    logger.info(f"Rendering {self.name} {list(key)} with Jinja: {e}")
+                    fragments = [get_environment().get_template(self.name).render]
+                self.variants[key] = fragments
+                logger.info(f"Compiled {self.name} for languages {list(key)}: {len(fragments)} fragments, "
+                            f"{sum(1 for f in fragments if isinstance(f, str))} static")
+            return self.variants[key]
+
+    def render(self, context=None, **kwargs):
+        context = {**get_environment().globals, **(context or {}), **kwargs}
+        return ''.join([f if isinstance(f, str) else f(context) for f in self.fragments(context.get('languages'))])
+
+_renderers = {}
+_renderers_lock = threading.Lock()
+
+def get_renderer(name):
+    """
+    The shared renderer for a template name, so every caller reuses compiled variants.
+    """
+    with _renderers_lock:
+        if name not in _renderers:
+            _renderers[name] = VariantRenderer(name)
+        return _renderers[name]
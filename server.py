@@ -2,12 +2,14 @@ import os
 import sys
 import time
 import webbrowser
-from flask import Flask, render_template_string
+from flask import Flask, send_from_directory, abort
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from threading import Thread
-from scripts.utils.content_loader import load_content, render_template  # Import the necessary functions from content_loader
+from scripts.utils.content_loader import load_content, render_template, compile_template  # Import the necessary functions from content_loader
 from scripts.utils.logger_config import get_logger  # Your logger config
+from scripts.utils import asset_mirror
+from scripts.utils import template_env
 
 # Initialize logger
 logger = get_logger('server')
@@ -18,22 +20,49 @@ app = Flask(__name__)
 content_file_path = os.path.join(os.getcwd(), 'data', 'content_feeder', 'content.json')
 template_file_path = os.path.join(os.getcwd(), 'templates', 'template.html')
 
+# Last rendered preview and the (mtime, size) of the files it was rendered from
+_preview = (None, None)
+
+def file_signature(*paths):
+    return tuple((stat.st_mtime_ns, stat.st_size) for stat in map(os.stat, paths))
+
 # Serve the page by rendering the template with content data
 @app.route('/')
 def serve_newsletter():
+    global _preview
     try:
+        # The page is only rendered again when the content or the template changes
+        signature = file_signature(content_file_path, template_file_path)
+        if _preview[0] == signature:
+            return _preview[1]
+
         # Load the content from the JSON file
         content = load_content(content_file_path)
         
         # Render the HTML template using the loaded content
         rendered_html = render_template(template_file_path, content)
 
-        # Serve the rendered HTML as a response
-        return render_template_string(rendered_html)
+        # Resolve the remaining Jinja tags in memory; rendered pages stay out of the bytecode cache
+        html = asset_mirror.rewrite_html(template_env.get_environment().from_string(rendered_html).render())
+        _preview = (signature, html)
+        return html
     except Exception as e:
         logger.error(f"Error rendering template: {e}")
         return "An error occurred while rendering the newsletter."
 
+# Serve mirrored images; run with ASSET_BASE_URL=http://localhost:5000/assets to preview them
+@app.route('/assets/<path:filename>')
+def serve_asset(filename):
+    # Only the image directories are served, never the manifest next to them
+    directory, _, name = filename.partition('/')
+    if directory not in asset_mirror.SERVED_DIRS or not name:
+        abort(404)
+    # Asset files are content-addressed, so they never change once written
+    response = send_from_directory(os.path.join(asset_mirror.ASSET_DIR, directory), name,
+                                   max_age=asset_mirror.CACHE_MAX_AGE, etag=True, conditional=True)
+    response.headers['Cache-Control'] = f'public, max-age={asset_mirror.CACHE_MAX_AGE}, immutable'
+    return response
+
 # Watchdog event handler to track file changes
 class ReloadHandler(FileSystemEventHandler):
     def __init__(self, app):
@@ -43,9 +72,11 @@ class ReloadHandler(FileSystemEventHandler):
         try:
             # Reload the template and content if either file changes
             if event.src_path == content_file_path or event.src_path == template_file_path:
-                with app.app_context():
-                    logger.info(f'{event.src_path} modified, reloading page...')
-                    self.app.jinja_env.cache.clear()  # Clear the template cache to reflect changes
+                # Compiled templates are keyed by source hash and mtime, so the next request picks up the change;
+                # recompiling here keeps that work off the request
+                logger.info(f'{event.src_path} modified, reloading page...')
+                if event.src_path == template_file_path:
+                    compile_template(template_file_path)
         except Exception as e:
             logger.error(f"Error while reloading due to file changes: {e}")
 
@@ -0,0 +1,63 @@
+# tests/test_fetch_orchestrator.py
+
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from scripts.utils.fetch_orchestrator import FetchJob, run_jobs # noqa: E402
+
+def sleeper(seconds, finished, name):
+    time.sleep(seconds)
+    finished[name] = time.monotonic()
+    return name
+
+def test_provider_backlog_does_not_delay_other_providers():
+    finished = {}
+    jobs = [FetchJob(f"weather_{i}", sleeper, args=(0.2, finished, f"weather_{i}"), provider='weather_api')
+            for i in range(10)]
+    jobs.append(FetchJob('exchange_rates', sleeper, args=(0, finished, 'exchange_rates')))
+
+    start = time.monotonic()
+    results = run_jobs(jobs, deadline=5, job_timeout=5, max_workers=8, provider_limits={'weather_api': 3})
+
+    assert all(r['status'] == 'ok' for r in results)
+    # Queued weather jobs hold no workers, so the exchange job starts right away
+    assert finished['exchange_rates'] - start < 0.15
+
+def test_provider_limit_is_respected():
+    active = {'now': 0, 'max': 0}
+
+    def tracked():
+        active['now'] += 1
+        active['max'] = max(active['max'], active['now'])
+        time.sleep(0.05)
+        active['now'] -= 1
+
+    jobs = [FetchJob(f"job_{i}", tracked, provider='p') for i in range(6)]
+    results = run_jobs(jobs, deadline=5, job_timeout=5, max_workers=8, provider_limits={'p': 2})
+
+    assert all(r['status'] == 'ok' for r in results)
+    assert active['max'] <= 2
+
+def test_timed_out_job_releases_its_provider_slot():
+    finished = {}
+    jobs = [
+        FetchJob('slow', sleeper, args=(1, finished, 'slow'), provider='p', timeout=0.1),
+        FetchJob('fast', sleeper, args=(0, finished, 'fast'), provider='p'),
+    ]
+
+    start = time.monotonic()
+    results = run_jobs(jobs, deadline=5, job_timeout=5, provider_limits={'p': 1})
+
+    assert [r['status'] for r in results] == ['timeout', 'ok']
+    assert time.monotonic() - start < 0.5
+
+def test_jobs_not_started_by_the_deadline_are_skipped():
+    jobs = [FetchJob(f"job_{i}", time.sleep, args=(0.3,), provider='p') for i in range(3)]
+    results = run_jobs(jobs, deadline=0.2, job_timeout=5, provider_limits={'p': 1})
+
+    assert [r['status'] for r in results] == ['timeout', 'skipped', 'skipped']